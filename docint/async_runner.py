@@ -0,0 +1,71 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .util import get_doc_name
+
+
+class AsyncRunner:
+    """Runs the pipeline of a Vision on many docs concurrently with asyncio.
+
+    Each doc goes through the components in order, but up to max_docs docs are
+    in flight at a time, so the waiting of I/O bound components overlaps
+    across docs. A component can define an `async def acall(self, doc)`
+    variant which is awaited on the event loop, other components (and docker
+    pipes) run in a thread pool executor. concurrency limits the number of
+    docs a component processes at a time, {name: limit}. Components keep the
+    state of the doc they process on self, so the default limit is 1 for a
+    component without acall and max_workers for one with acall; raise the limit
+    only for components that are safe to run on many docs at once.
+    """
+
+    def __init__(self, viz, max_docs=8, concurrency=None, max_workers=4):
+        self.viz = viz
+        self.max_docs = max_docs
+        self.concurrency = concurrency if concurrency else {}
+        self.max_workers = max_workers
+
+    def is_async(self, name, proc):
+        return hasattr(proc, "acall") and name not in self.viz.docker_pipes
+
+    def get_default_limit(self, name, proc):
+        return self.max_workers if self.is_async(name, proc) else 1
+
+    async def run_doc(self, path, semaphores, executor):
+        loop = asyncio.get_running_loop()
+        doc = await loop.run_in_executor(executor, self.viz.read_doc, path)
+        for name, proc in self.viz.pipeline:
+            async with semaphores[name]:
+                if self.is_async(name, proc):
+                    doc.add_pipe(name)
+                    doc = await proc.acall(doc)
+                else:
+                    doc = await loop.run_in_executor(executor, self.viz.exec_task, name, doc, proc)
+        return doc
+
+    async def pipe_all(self, paths):
+        """Async generator of the processed docs, in the order they finish."""
+        paths = (Path(p) for p in paths if get_doc_name(p) not in self.viz.ignore_docs)
+        if self.viz.read_cache:
+            paths = (p for p in paths if self.viz.doc_needs_processing(p))
+
+        semaphores = {
+            name: asyncio.Semaphore(self.concurrency.get(name, self.get_default_limit(name, proc)))
+            for name, proc in self.viz.pipeline
+        }
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = set()
+            while True:
+                while len(running) < self.max_docs:
+                    path = next(paths, None)
+                    if path is None:
+                        break
+                    running.add(asyncio.ensure_future(self.run_doc(path, semaphores, executor)))
+
+                if not running:
+                    break
+
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
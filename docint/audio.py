@@ -1,5 +1,7 @@
 import gzip
+import hashlib
 import mimetypes
+import re
 import subprocess
 from pathlib import Path
 from typing import Any, List, Tuple
@@ -105,7 +107,79 @@ class Audio(File):
             audio_intervals.append(self.audio_seg[prev_start : s * 1000])
             prev_start = e * 1000
         audio_intervals.append(self.audio_seg[prev_start : len(self.audio_seg)])
-        return sum(audio_intervals)
+
+        # join the raw data once, adding the segments copies at every step
+        raw_data = b"".join(seg.raw_data for seg in audio_intervals)
+        return self.audio_seg._spawn(raw_data)
+
+    def get_trim_filter(self):
+        """ffmpeg audio filter that drops the rm_intervals and closes the gaps."""
+        if not self.rm_intervals:
+            return None
+        betweens = "+".join(f"between(t,{s},{e})" for (s, e) in self.rm_intervals)
+        return f"aselect='not({betweens})',asetpts=N/SR/TB"
+
+    def get_trim_key(self):
+        intervals_str = ",".join(f"{s}-{e}" for (s, e) in self.rm_intervals)
+        return hashlib.sha256(intervals_str.encode("utf-8")).hexdigest()[:8]
+
+    def get_export_cmd(
+        self,
+        output,
+        format=None,
+        frame_rate=None,
+        rm_intervals=True,
+        start_secs=None,
+        end_secs=None,
+    ):
+        """ffmpeg command that writes the audio to output (a path or pipe:1),
+        start_secs and end_secs are on the timeline after the rm_intervals are
+        dropped."""
+        cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-y", "-i", str(self.file_path), "-vn"]
+
+        trim_filter = self.get_trim_filter() if rm_intervals else None
+        if trim_filter:
+            cmd += ["-af", trim_filter]
+
+        if start_secs is not None:
+            cmd += ["-ss", str(start_secs)]
+        if end_secs is not None:
+            cmd += ["-t", str(end_secs - (start_secs if start_secs else 0))]
+        if frame_rate:
+            cmd += ["-ar", str(frame_rate)]
+
+        cmd += ["-f", format if format else self.format, str(output)]
+        return cmd
+
+    def export(self, output_path, format=None, frame_rate=None, rm_intervals=True):
+        """Export the audio to output_path, ffmpeg streams the audio through the
+        trim filter so the audio is never held in memory."""
+        cmd = self.get_export_cmd(output_path, format, frame_rate, rm_intervals)
+        subprocess.check_call(cmd)
+        return Path(output_path)
+
+    def detect_silences(self, noise_db=-35, min_silence_secs=0.5):
+        """Silences of the trimmed audio as [(start_secs, end_secs)], found by the
+        ffmpeg silencedetect filter as the audio is streamed."""
+        silence_filter = f"silencedetect=noise={noise_db}dB:d={min_silence_secs}"
+        audio_filters = [f for f in (self.get_trim_filter(), silence_filter) if f]
+        cmd = ["ffmpeg", "-nostdin", "-hide_banner", "-nostats", "-i", str(self.file_path)]
+        cmd += ["-vn", "-af", ",".join(audio_filters), "-f", "null", "-"]
+
+        proc = subprocess.run(cmd, stderr=subprocess.PIPE, text=True, check=True)
+        start_secs = re.findall(r"silence_start: (-?[\d.]+)", proc.stderr)
+        end_secs = re.findall(r"silence_end: (-?[\d.]+)", proc.stderr)
+        return [(max(float(s), 0.0), float(e)) for (s, e) in zip(start_secs, end_secs)]
+
+    def iter_bytes(self, format=None, frame_rate=None, rm_intervals=True, chunk_size=1 << 20):
+        """Yield the exported audio in chunks of chunk_size bytes."""
+        cmd = self.get_export_cmd("pipe:1", format, frame_rate, rm_intervals)
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
+            while chunk := proc.stdout.read(chunk_size):
+                yield chunk
+
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
 
     def get_bytes(self, format=None, frame_rate=None, rm_intervals=True):
         if not self.audio_seg:
@@ -151,11 +225,21 @@ class Audio(File):
     def split(self, start_secs, end_secs, input_dir):
         # ffmpeg -i source.m4v -ss       0 -t  593.3 -c copy part1.m4v
 
-        split_file = input_dir / f"{self.file_stem}+{start_secs}-{end_secs}{self.file_suffix}"
+        # a trimmed split has different content, the rm_intervals are in its name
+        trim_stub = f".rm-{self.get_trim_key()}" if self.rm_intervals else ""
+        split_stem = f"{self.file_stem}+{start_secs}-{end_secs}{trim_stub}"
+        split_file = input_dir / f"{split_stem}{self.file_suffix}"
         if split_file.exists():
             print(f"File exists, using that {split_file}")
             return Audio.build(split_file)
 
+        if self.rm_intervals:
+            # secs are on the trimmed timeline, the audio is re-encoded by the filter
+            cmd = self.get_export_cmd(split_file, start_secs=start_secs, end_secs=end_secs)
+            print(cmd)
+            subprocess.check_call(cmd)
+            return Audio.build(split_file)
+
         cmd = [
             "ffmpeg",
             "-i",
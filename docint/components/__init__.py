@@ -1,6 +1,10 @@
-from .add_filename import AddFileName
-from .crop_video import CropVideo
-from .detect_scene import DetectScene
-from .extract_text import ExtractText
-from .remove_intervals import RemoveIntervals
-from .transcribe_audio import TranscribeAudio
+# Modules of the components, a component module is imported by Pipeline only
+# when the component is added to a pipeline.
+ComponentModules = {
+    "AddFileName": "docint.components.add_filename",
+    "CropVideo": "docint.components.crop_video",
+    "DetectScene": "docint.components.detect_scene",
+    "ExtractText": "docint.components.extract_text",
+    "RemoveIntervals": "docint.components.remove_intervals",
+    "TranscribeAudio": "docint.components.transcribe_audio",
+}
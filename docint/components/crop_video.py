@@ -1,44 +1,50 @@
 import json
 import subprocess
 from pathlib import Path
+from typing import Dict, List
 
 from ..ppln import Component, Pipeline
 
 
-# TODO this bounding box should be a shape
-def crop_video(video, bounding_box, crop_video_file):
-    # ffmpeg -i output.mp4 -filter:v "crop=1280:35:0:658" output-crop.mp4
-    print(bounding_box)
+def get_crop_filter(bounding_box, video_size):
     [x0, y0, x1, y1] = bounding_box
 
-    (video_width, video_height) = video.size
+    (video_width, video_height) = video_size
 
     c_w, c_h = int((x1 - x0) * video_width), int((y1 - y0) * video_height)
     c_x0, c_y0 = int(x0 * video_width), int(y0 * video_height)
+    return f"crop={c_w}:{c_h}:{c_x0}:{c_y0}"
+
+
+def get_tee_cmd(video, outputs):
+    """ffmpeg command that decodes the video once and writes every output, outputs
+    is a list of (video_filter, output_file, keep_audio). The decoded frames are
+    split across the filters of the outputs in a single filter graph."""
+    out_labels = [f"o{idx}" for idx in range(len(outputs))]
+    if len(outputs) == 1:
+        filter_parts = [f"[0:v]{outputs[0][0]}[{out_labels[0]}]"]
+    else:
+        in_labels = [f"v{idx}" for idx in range(len(outputs))]
+        split_part = f"[0:v]split={len(outputs)}" + "".join(f"[{lb}]" for lb in in_labels)
+        filter_parts = [split_part] + [
+            f"[{in_lb}]{vf}[{out_lb}]"
+            for (in_lb, out_lb, (vf, _, _)) in zip(in_labels, out_labels, outputs)
+        ]
+
+    cmd = ["ffmpeg", "-y", "-i", str(video.file_path), "-filter_complex", ";".join(filter_parts)]
+    for out_label, (_, output_file, keep_audio) in zip(out_labels, outputs):
+        cmd += ["-map", f"[{out_label}]"]
+        cmd += ["-map", "0:a?"] if keep_audio else ["-an"]
+        cmd += [str(output_file)]
+    return cmd
+
 
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        str(video.file_path),
-        "-filter:v",
-        f"crop={c_w}:{c_h}:{c_x0}:{c_y0}",
-        str(crop_video_file),
-    ]
-
-    # cmd = [
-    #     "ffmpeg",
-    #     "-y",
-    #     "-i",
-    #     str(video.file_path),
-    #     "-ss",
-    #     str(10),
-    #     "-to",
-    #     str(40),
-    #     "-vf",
-    #     f'crop={c_w}:{c_h}:{c_x0}:{c_y0}',
-    #     str(crop_video_file),
-    # ]
+# TODO this bounding box should be a shape
+def crop_video(video, bounding_box, crop_video_file):
+    # ffmpeg -i output.mp4 -filter:v "crop=1280:35:0:658" output-crop.mp4
+    print(bounding_box)
+    crop_filter = get_crop_filter(bounding_box, video.size)
+    cmd = get_tee_cmd(video, [(crop_filter, crop_video_file, True)])
 
     print(" ".join(cmd))
     subprocess.check_call(cmd, stderr=subprocess.DEVNULL)
@@ -50,7 +56,7 @@ def convert_bbox(bbox, image_size):
 
 
 @Pipeline.register_component(
-    assigns="crop_file_path",
+    assigns=["crop_file_path", "crop_file_paths", "scene_proxy_path"],
     depends=[],
     requires=[],
 )
@@ -58,18 +64,55 @@ class CropVideo(Component):
     class Config:
         bbox = [float]
         name_stub = str
+        crops: Dict[str, List[float]] = {}  # more {name_stub: bbox}, cropped in the same decode
+        scene_proxy_width: int = 0  # > 0 also writes a downscaled video for DetectScene
 
     def __call__(self, video, cfg):
         print(f"Processing {video.file_name}")
 
         json_path = Path("output") / f"{video.file_name}.crop_file_path.json"
-        crop_file_path = Path("output") / f"{video.file_name}.crop_{cfg.name_stub}.mp4"
 
-        if json_path.exists() and crop_file_path.exists():
-            video.crop_file_path = json.loads(json_path.read_text())
+        crop_file_paths = {}
+        for name_stub in [cfg.name_stub] + list(cfg.crops):
+            crop_file_paths[name_stub] = Path("output") / f"{video.file_name}.crop_{name_stub}.mp4"
+
+        scene_proxy_path = None
+        if cfg.scene_proxy_width:
+            scene_proxy_path = Path("output") / f"{video.file_name}.scene_proxy.mp4"
+
+        out_paths = list(crop_file_paths.values()) + (
+            [scene_proxy_path] if scene_proxy_path else []
+        )
+        if json_path.exists() and all(p.exists() for p in out_paths):
+            crop_json = json.loads(json_path.read_text())
+            if isinstance(crop_json, str):
+                crop_json = {"crop_file_path": crop_json}
+            video.crop_file_path = crop_json["crop_file_path"]
+            video.crop_file_paths = crop_json.get("crop_file_paths", {})
+            video.scene_proxy_path = crop_json.get("scene_proxy_path", None)
             return video
 
-        crop_video(video, cfg.bbox, crop_file_path)
-        video.crop_file_path = str(crop_file_path)
-        json_path.write_text(json.dumps(str(crop_file_path)))
+        # all the crops and the scene proxy are written from a single decode
+        bboxes = {cfg.name_stub: cfg.bbox, **cfg.crops}
+        outputs = [
+            (get_crop_filter(bboxes[name_stub], video.size), crop_file_path, True)
+            for (name_stub, crop_file_path) in crop_file_paths.items()
+        ]
+        if scene_proxy_path:
+            outputs.append((f"scale={cfg.scene_proxy_width}:-2", scene_proxy_path, False))
+
+        cmd = get_tee_cmd(video, outputs)
+        print(" ".join(cmd))
+        subprocess.check_call(cmd, stderr=subprocess.DEVNULL)
+
+        video.crop_file_path = str(crop_file_paths[cfg.name_stub])
+        video.crop_file_paths = {n: str(p) for (n, p) in crop_file_paths.items()}
+        video.scene_proxy_path = str(scene_proxy_path) if scene_proxy_path else None
+
+        crop_json = {
+            "crop_file_path": video.crop_file_path,
+            "crop_file_paths": video.crop_file_paths,
+            "scene_proxy_path": video.scene_proxy_path,
+        }
+        json_path.write_text(json.dumps(crop_json))
         return video
@@ -7,7 +7,9 @@ from ..ppln import Component, Pipeline
 def get_scene_intervals(video, detector, threshold, merge_last_scene, min_scene_len):
     from scenedetect import AdaptiveDetector, ContentDetector, SceneManager, open_video
 
-    video = open_video(str(video.file_path))
+    # the downscaled proxy written by CropVideo has the same timeline
+    video_path = getattr(video, "scene_proxy_path", None) or video.file_path
+    video = open_video(str(video_path))
     scene_manager = SceneManager()
 
     if min_scene_len[-1] == "s":
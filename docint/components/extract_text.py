@@ -1,4 +1,5 @@
 import json
+import os
 from collections import Counter
 from itertools import groupby
 from operator import itemgetter
@@ -21,6 +22,13 @@ def get_time_str(time_secs):
     return f"{hr:02d}:{mn:02d}:{ss:02d}"
 
 
+def iter_time_idxs(start_ss, end_ss, gap):
+    time_idx = start_ss
+    while time_idx < end_ss:
+        yield time_idx
+        time_idx += gap
+
+
 def get_avg_color(cropped_img):
     color_img = cropped_img.crop([10, 0, 20, 10])
     color_counts = color_img.getcolors(100)
@@ -45,94 +53,185 @@ def get_interval_texts(video, bbox, gap, is_ticker):
             result.append((time_range, k))
         return result
 
-    import pytesseract
-
-    time_idx, duration = 0, video.duration
     interval_texts = []
+    text_reader = FrameTextReader()
 
-    while time_idx < duration:
-        frame_img = video.get_frame(time_idx)
+    frame_reader = video.frame_reader()
+    time_idxs = iter_time_idxs(0, video.duration, gap)
+    for time_idx, frame_img in frame_reader.iter_frames(time_idxs):
         cropped_img = frame_img.crop(bbox)
-        try:
-            osd = pytesseract.image_to_osd(
-                cropped_img, config="-c min_characters_to_try=5", output_type="dict"
-            )
-        except pytesseract.pytesseract.TesseractError as e:  # noqa
-            osd = {"script": "UNKNOWN", "script_conf": 0.0}
-
-        config_str = ""
-        # config_str = '--psm 7'
-        if osd["script"] in ("Devanagari", "Arabic", "Hangul"):
-            cropped_text = pytesseract.image_to_string(cropped_img, config=config_str, lang="hin")
-        else:
-            cropped_text = pytesseract.image_to_string(cropped_img, config=config_str)
-
-        cropped_text = cropped_text.strip("\n -_~|'\"—.‘“").replace("\n", " ").replace("‘", "")
+        script, cropped_text = text_reader.read_text(cropped_img, default_lang="eng")
 
         time_str = get_time_str(time_idx)
         avg_color = get_avg_color(cropped_img)
 
         if is_valid_text(cropped_text):
-            print(f'{time_str}: {cropped_text} {osd["script"]} {osd["script_conf"]} {avg_color}')
+            print(f"{time_str}: {cropped_text} {script} {avg_color}")
             interval_texts.append((time_idx, cropped_text))
         else:
-            print(
-                f'{time_str}: INVALID >{cropped_text}< {osd["script"]} {osd["script_conf"]} {avg_color}'
-            )
+            print(f"{time_str}: INVALID >{cropped_text}< {script} {avg_color}")
 
-        time_idx += gap
+    frame_reader.close()
+    print(text_reader.ocr_summary())
     interval_texts = remove_duplicates(interval_texts)
     return interval_texts
 
 
-def get_frame_text(frame_img, bbox):
-    import pytesseract
+def clean_text(text):
+    return text.strip("\n -_~|'\"—.‘“").replace("\n", " ").replace("‘", "")
 
-    cropped_img = frame_img.crop(bbox)
-    try:
-        osd = pytesseract.image_to_osd(
-            cropped_img, config="-c min_characters_to_try=5", output_type="dict"
-        )
-    except pytesseract.pytesseract.TesseractError as e:  # noqa
-        osd = {"script": "UNKNOWN", "script_conf": 0.0}
 
-    config_str = ""
-    # config_str = '--psm 7'
+class TesseractOCR:
+    """Tesseract kept loaded in the process with tesserocr, one api per
+    language, when it is installed. Otherwise it falls back to pytesseract,
+    which launches a tesseract process for every call."""
+
+    def __init__(self):
+        try:
+            import tesserocr
+        except ImportError:
+            tesserocr = None
+        self.tesserocr = tesserocr
+        self.apis = {}
+
+    def get_api(self, lang, psm=None):
+        if (lang, psm) not in self.apis:
+            kwargs = {"lang": lang} if psm is None else {"lang": lang, "psm": psm}
+            api = self.tesserocr.PyTessBaseAPI(**kwargs)
+            if psm == self.tesserocr.PSM.OSD_ONLY:
+                api.SetVariable("min_characters_to_try", "5")
+            self.apis[(lang, psm)] = api
+        return self.apis[(lang, psm)]
+
+    def get_script(self, img):
+        if self.tesserocr:
+            api = self.get_api("osd", self.tesserocr.PSM.OSD_ONLY)
+            api.SetImage(img)
+            osd = api.DetectOrientationScript()
+            return osd["script_name"] if osd else "UNKNOWN"
+
+        import pytesseract
+
+        try:
+            osd = pytesseract.image_to_osd(
+                img, config="-c min_characters_to_try=5", output_type="dict"
+            )
+        except pytesseract.pytesseract.TesseractError as e:  # noqa
+            return "UNKNOWN"
+        return osd["script"]
+
+    def get_text(self, img, lang="eng"):
+        if self.tesserocr:
+            api = self.get_api(lang)
+            api.SetImage(img)
+            return api.GetUTF8Text()
+
+        import pytesseract
+
+        return pytesseract.image_to_string(img, config="", lang=lang)
+
+    def close(self):
+        for api in self.apis.values():
+            api.End()
+        self.apis.clear()
+
+
+# phash distance of the cropped bbox below which the text of a frame is reused
+ChangeCutoff = 2
+
+ScriptLangs = {
+    "Latin": "eng",
+    "Cyrillic": "eng",
+    "Devanagari": "hin",
+    "Arabic": "hin",
+    "Hangul": "hin",
+}
+
+
+class FrameTextReader:
+    """OCRs the bbox of frames in a video.
+
+    The perceptual hash of the cropped image is compared with the hash of the
+    last OCRed crop, if it has not changed by more than change_cutoff the
+    script and the text of the last crop are reused and tesseract is not
+    called. A crop that has changed is OCRed again, with the script detected
+    by OSD on it, as the new text can be in a different script. Call reset()
+    for a new scene.
+    """
+
+    def __init__(self, ocr=None, change_cutoff=ChangeCutoff):
+        self.ocr = ocr if ocr is not None else TesseractOCR()
+        self.change_cutoff = change_cutoff
+        self.text_hash, self.text_key, self.text_result = None, None, None
+        self.num_frames, self.num_osd, self.num_ocr = 0, 0, 0
+
+    def reset(self):
+        self.text_hash, self.text_key, self.text_result = None, None, None
+
+    def read_text(self, cropped_img, default_lang=None):
+        """Returns (script, text) of the cropped image, text is None if the
+        script has no language and no default_lang is given."""
+        import imagehash
+
+        self.num_frames += 1
+        img_hash = imagehash.phash(cropped_img)
+        if (
+            self.text_hash is not None
+            and self.text_key == default_lang
+            and (img_hash - self.text_hash) <= self.change_cutoff
+        ):
+            return self.text_result
+
+        self.num_osd += 1
+        script = self.ocr.get_script(cropped_img)
+        lang = ScriptLangs.get(script, default_lang)
+        if lang is None:
+            text = None
+        else:
+            self.num_ocr += 1
+            text = clean_text(self.ocr.get_text(cropped_img, lang))
+
+        self.text_hash, self.text_key, self.text_result = img_hash, default_lang, (script, text)
+        return self.text_result
+
+    def get_frame_text(self, frame_img, bbox):
+        _, cropped_text = self.read_text(frame_img.crop(bbox))
+        return cropped_text if cropped_text and len(cropped_text) > 10 else None
 
-    if osd["script"] in ("Latin", "Cyrillic"):
-        cropped_text = pytesseract.image_to_string(cropped_img, config=config_str)
-        cropped_text = cropped_text.strip("\n -_~|'\"—.‘“").replace("\n", " ").replace("‘", "")
-        if len(cropped_text) > 10:
-            return cropped_text
-    elif osd["script"] in ("Devanagari", "Arabic", "Hangul"):
-        cropped_text = pytesseract.image_to_string(cropped_img, config=config_str, lang="hin")
-        cropped_text = cropped_text.strip("\n -_~|'\"—.‘“").replace("\n", " ").replace("‘", "")
-        if len(cropped_text) > 10:
-            return cropped_text
-    return None
+    def ocr_summary(self):
+        return get_ocr_summary(self.num_frames, self.num_ocr)
+
+
+def get_ocr_summary(num_frames, num_ocr):
+    reduction = 1.0 - (num_ocr / num_frames) if num_frames else 0.0
+    return f"OCR calls: {num_ocr}/{num_frames} frames, reduction: {reduction:.1%}"
 
 
 ImagehashCutoff = 3
 
 
 def match_image_hash(frame_img, hash_bbox, match_hash):
+    if match_hash is None:
+        return True
+
     import imagehash
 
     return match_hash - imagehash.colorhash(frame_img.crop(hash_bbox)) > ImagehashCutoff
 
 
-def get_scene_text_two_pass(video, start_ss, end_ss, bbox, gap, hash_bbox, match_hash):
+def get_scene_text_two_pass(
+    frame_reader, start_ss, end_ss, bbox, gap, hash_bbox=None, match_hash=None, text_reader=None
+):
+    """frame_reader is a FrameReader of the video, the frames of Phase I are
+    in its cache when Phase II reads the frames around them."""
+    text_reader = text_reader if text_reader is not None else FrameTextReader()
+    text_reader.reset()
+
     gap1 = 10 * gap
     gap2 = gap
 
     assert gap1 > gap2, f"incorrect values of gaps {gap1} {gap2}"
 
-    def iter_pass1(start_ss, end_ss, gap1):
-        t_idx = start_ss
-        while t_idx < end_ss:
-            yield t_idx
-            t_idx += gap1
-
     def iter_pass2(start_ss, end_ss, gap1, gap2, first_pass_timeidxs):
         t_idx = start_ss
         for f_idx in first_pass_timeidxs:
@@ -144,13 +243,12 @@ def get_scene_text_two_pass(video, start_ss, end_ss, bbox, gap, hash_bbox, match
                 t_idx += gap2
 
     second_pass_timeidxs, time_idx_texts = [], {}
-    for time_idx in iter_pass1(start_ss, end_ss, gap1):
-        frame_img = video.get_frame(time_idx)
-
+    pass1_timeidxs = iter_time_idxs(start_ss, end_ss, gap1)
+    for time_idx, frame_img in frame_reader.iter_frames(pass1_timeidxs):
         if not match_image_hash(frame_img, hash_bbox, match_hash):
             continue
 
-        frame_text = get_frame_text(frame_img, bbox)
+        frame_text = text_reader.get_frame_text(frame_img, bbox)
         if frame_text:
             print(f"\t{get_time_str(time_idx)}: {frame_text}")
             second_pass_timeidxs.append(time_idx)
@@ -168,8 +266,8 @@ def get_scene_text_two_pass(video, start_ss, end_ss, bbox, gap, hash_bbox, match
         # print(f'\t{time_idx}')
         frame_text = time_idx_texts.get(time_idx, None)
         if not frame_text:
-            frame_img = video.get_frame(time_idx)
-            frame_text = get_frame_text(frame_img, bbox)
+            frame_img = frame_reader.get_frame(time_idx)
+            frame_text = text_reader.get_frame_text(frame_img, bbox)
 
         if frame_text:
             print(f"\t{get_time_str(time_idx)}: {frame_text}")
@@ -183,11 +281,11 @@ def get_scene_text_two_pass(video, start_ss, end_ss, bbox, gap, hash_bbox, match
 def get_scene_text(video, start_ss, end_ss, bbox, gap):
     import pytesseract
 
-    time_idx = start_ss
     cropped_texts = []
 
-    while time_idx < end_ss:
-        frame_img = video.get_frame(time_idx)
+    frame_reader = video.frame_reader()
+    time_idxs = iter_time_idxs(start_ss, end_ss, gap)
+    for time_idx, frame_img in frame_reader.iter_frames(time_idxs):
         cropped_img = frame_img.crop(bbox)
         try:
             osd = pytesseract.image_to_osd(
@@ -204,11 +302,65 @@ def get_scene_text(video, start_ss, end_ss, bbox, gap):
             cropped_text = cropped_text.strip("\n -_~|'\"—.‘“").replace("\n", " ").replace("‘", "")
             if len(cropped_text) > 10:
                 cropped_texts.append(cropped_text)
-        time_idx += gap
 
+    frame_reader.close()
     return max(c := Counter(cropped_texts), key=c.get) if cropped_texts else "NO_NAME"
 
 
+# each worker process of the pool keeps its own FrameTextReader, so tesseract
+# stays loaded across the scenes processed by the worker.
+_worker_text_reader = None
+
+
+def init_scene_worker():
+    global _worker_text_reader
+    _worker_text_reader = FrameTextReader()
+
+
+def get_scenes_texts_worker(video_path, scenes, bbox, gap):
+    from ..video import Video
+
+    video = Video.build(video_path)
+    text_reader = _worker_text_reader
+    num_frames, num_ocr = text_reader.num_frames, text_reader.num_ocr
+
+    frame_reader = video.frame_reader()
+    scene_texts = [
+        get_scene_text_two_pass(frame_reader, s, e, bbox, gap, text_reader=text_reader)
+        for (s, e) in scenes
+    ]
+    frame_reader.close()
+    return scene_texts, text_reader.num_frames - num_frames, text_reader.num_ocr - num_ocr
+
+
+def get_scenes_texts(video, scenes, bbox, gap, num_workers):
+    """Text of each scene, contiguous chunks of scenes are processed by a pool of
+    num_workers processes, each worker decodes its chunk of the video."""
+    scenes = list(scenes)
+    if num_workers <= 1 or len(scenes) <= 1:
+        init_scene_worker()
+        scene_texts, num_frames, num_ocr = get_scenes_texts_worker(
+            video.file_path, scenes, bbox, gap
+        )
+        print(get_ocr_summary(num_frames, num_ocr))
+        return scene_texts
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    from more_itertools import divide
+
+    num_chunks = min(len(scenes), num_workers * 4)
+    chunks = [list(c) for c in divide(num_chunks, scenes)]
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=init_scene_worker) as executor:
+        futures = [
+            executor.submit(get_scenes_texts_worker, video.file_path, c, bbox, gap) for c in chunks
+        ]
+        results = [f.result() for f in futures]
+
+    print(get_ocr_summary(sum(r[1] for r in results), sum(r[2] for r in results)))
+    return [t for (scene_texts, _, _) in results for t in scene_texts]
+
+
 def convert_bbox(bbox, image_size):
     (w, h) = image_size
     return [round(bbox[0] * w), round(bbox[1] * h), round(bbox[2] * w), round(bbox[3] * h)]
@@ -222,6 +374,7 @@ def convert_bbox(bbox, image_size):
 class ExtractText(Component):
     class Config:
         text_configs = [Dict[str, Any]]
+        num_workers: int = 0  # 0 uses all the cpus
 
     # def __call__(self, video, cfg):
     #     print(f"Processing {video.file_name}")
@@ -241,12 +394,13 @@ class ExtractText(Component):
             return video
 
         video.scene_texts = {}
+        num_workers = cfg.num_workers if cfg.num_workers else os.cpu_count()
         for t_cfg in cfg.text_configs:
             bbox, gap = t_cfg["bbox"], t_cfg["gap"]
             img_bbox = convert_bbox(bbox, video.size)
             scene_texts, merged_scene_texts = [], []
-            for s, e in video.scene_list:
-                scene_text = get_scene_text_two_pass(video, s, e, img_bbox, gap)
+            texts = get_scenes_texts(video, video.scene_list, img_bbox, gap, num_workers)
+            for (s, e), scene_text in zip(video.scene_list, texts):
                 print(f"{get_time_str(s)}->{get_time_str(e)} {scene_text}")
                 scene_texts.append(((s, e), scene_text))
 
@@ -1,5 +1,8 @@
 import gzip
 import json
+import tempfile
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 
@@ -50,8 +53,10 @@ def upload_to_gcs(audio, bucket_name, cloud_dir_path, overwrite=False):
     if not audio.rm_intervals:
         input_blob.upload_from_filename(audio.file_path, content_type=audio.mime_type)
     else:
-        bytes = audio.get_bytes()
-        input_blob.upload_from_string(bytes, content_type=audio.mime_type)
+        # the trimmed audio is streamed to a temporary file, not built in memory
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            trimmed_path = audio.export(Path(tmp_dir) / audio.file_name)
+            input_blob.upload_from_filename(trimmed_path, content_type=audio.mime_type)
 
     return gcs_uri
 
@@ -124,6 +129,79 @@ def run_async_transcribe2(audio, bucket_name, cloud_dir_path):
     return words
 
 
+# a speech backend takes (audio, bucket_name, cloud_dir_path) and returns the
+# response of the long running recognize api as a dict
+SpeechBackends = {"gcp": run_async_transcribe}
+
+
+def get_ms(time_str):
+    return int(float(time_str[:-1]) * 1000)
+
+
+def get_join_secs(rm_intervals):
+    """Times on the trimmed timeline at which the rm_intervals were cut out."""
+    join_secs, removed_secs = [], 0
+    for s, e in rm_intervals:
+        join_secs.append(s - removed_secs)
+        removed_secs += e - s
+    return join_secs
+
+
+def get_chunk_times(duration, silences, chunk_secs):
+    """Split [0, duration] into chunks of at most chunk_secs, each chunk ends in
+    the middle of its last silence, or at chunk_secs if it has none."""
+    cut_secs = sorted((s + e) / 2 for (s, e) in silences)
+
+    chunk_times, start_sec = [], 0
+    while duration - start_sec > chunk_secs:
+        max_end_sec = start_sec + chunk_secs
+        cut_idx = bisect_right(cut_secs, max_end_sec) - 1
+        has_cut = cut_idx >= 0 and cut_secs[cut_idx] > start_sec
+        end_sec = cut_secs[cut_idx] if has_cut else max_end_sec
+        chunk_times.append((start_sec, end_sec))
+        start_sec = end_sec
+    chunk_times.append((start_sec, duration))
+    return chunk_times
+
+
+def offset_results(results, start_sec):
+    """Copy of the results with the times of the words shifted by start_sec."""
+    offset_ms = int(start_sec * 1000)
+
+    def offset_word(w):
+        start_ms, end_ms = get_ms(w["startTime"]) + offset_ms, get_ms(w["endTime"]) + offset_ms
+        return {**w, "startTime": f"{start_ms / 1000:.3f}s", "endTime": f"{end_ms / 1000:.3f}s"}
+
+    shifted_results = []
+    for result in results:
+        alts = [
+            {**a, "words": [offset_word(w) for w in a.get("words", [])]}
+            for a in result["alternatives"]
+        ]
+        shifted_results.append({**result, "alternatives": alts})
+    return shifted_results
+
+
+def transcribe_chunks(
+    audio, chunk_times, backend, bucket_name, cloud_dir_path, num_workers=4, split_dir=Path("input")
+):
+    """Transcribe the chunks of the audio concurrently, returns the results of all
+    the chunks with the times of the words on the timeline of the audio."""
+
+    def transcribe_chunk(chunk_time):
+        start_sec, end_sec = chunk_time
+        audio_chunk = audio.split(start_sec, end_sec, split_dir)
+        return backend(audio_chunk, bucket_name, cloud_dir_path)
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        response_dicts = list(executor.map(transcribe_chunk, chunk_times))
+
+    results = []
+    for (start_sec, _), response_dict in zip(chunk_times, response_dicts):
+        results += offset_results(response_dict.get("results", []), start_sec)
+    return results
+
+
 @Pipeline.register_component(
     assigns="words",
     depends=[],
@@ -136,16 +214,18 @@ class TranscribeAudio(Component):
         overwrite_cloud: bool = False
         compress_output: bool = False
         split_times: List[str] = []
+        backend: str = "gcp"
+        chunk_secs: float = 0  # 0 transcribes the audio in a single job
+        num_workers: int = 4
+        silence_db: float = -35
+        min_silence_secs: float = 0.5
 
     def build_words(self, results, audio, start_sec=0):
-        word_idx = 0
-
-        def get_ms(time_str):
-            return int(float(time_str[:-1]) * 1000)
+        word_idx, offset_ms = 0, int(start_sec * 1000)
 
         def build_word(chunk_idx, w):
             nonlocal word_idx
-            start_ms, end_ms = start_sec + get_ms(w["startTime"]), start_sec + get_ms(w["endTime"])
+            start_ms, end_ms = offset_ms + get_ms(w["startTime"]), offset_ms + get_ms(w["endTime"])
 
             w = AudioWord(
                 word_idx=word_idx,
@@ -167,7 +247,7 @@ class TranscribeAudio(Component):
 
     def __call__(self, audio, cfg):
         print(f"Processing {audio.file_name}")
-        from google.cloud import speech
+        backend = SpeechBackends[cfg.backend]
 
         json_path = Path("output") / f"{audio.file_name}.atr.json.gz"
         if json_path.exists():
@@ -176,16 +256,29 @@ class TranscribeAudio(Component):
             audio_words = self.build_words(response_dict["results"], audio)
         else:
             audio_words = []
-            if cfg.split_times:
+            if cfg.chunk_secs:
+                silences = audio.detect_silences(cfg.silence_db, cfg.min_silence_secs)
+                silences += [(s, s) for s in get_join_secs(audio.rm_intervals)]
+                chunk_times = get_chunk_times(audio.duration, silences, cfg.chunk_secs)
+                results = transcribe_chunks(
+                    audio,
+                    chunk_times,
+                    backend,
+                    cfg.bucket_name,
+                    cfg.cloud_dir_path,
+                    cfg.num_workers,
+                )
+                with gzip.open(json_path, "wb") as f:
+                    f.write(bytes(json.dumps({"results": results}), encoding="utf-8"))
+                audio_words = self.build_words(results, audio)
+            elif cfg.split_times:
                 split_secs = [get_seconds(t) for t in cfg.split_times]
 
                 split_secs = [0] + split_secs + [audio.duration]
 
                 for idx, (start_sec, end_sec) in enumerate(pairwise(split_secs)):
                     audio_slice = audio.split(start_sec, end_sec, Path("input"))
-                    response_dict = run_async_transcribe(
-                        audio_slice, cfg.bucket, cfg.cloud_dir_path
-                    )
+                    response_dict = backend(audio_slice, cfg.bucket_name, cfg.cloud_dir_path)
 
                     # Use a new json path for the split audio
                     json_path = Path("output") / f"{audio_slice.file_name}.atr.json.gz"
@@ -194,7 +287,7 @@ class TranscribeAudio(Component):
 
                     audio_words += self.build_words(response_dict["results"], audio, start_sec)
             else:
-                response_dict = run_async_transcribe(audio, cfg.bucket, cfg.cloud_dir_path)
+                response_dict = backend(audio, cfg.bucket_name, cfg.cloud_dir_path)
                 with gzip.open(json_path, "wb") as f:
                     f.write(bytes(json.dumps(response_dict), encoding="utf-8"))
                 audio_words = self.build_words(response_dict["results"], audio)
@@ -0,0 +1,169 @@
+import sys
+from pathlib import Path
+
+from .doc import Doc
+
+# Each table is a directory of parquet files, part-{chunk_idx:05d}.parquet,
+# every row has doc_name and page_idx keys, regions refer to the words table
+# with word_idxs, boxes are normalized page coordinates.
+
+BoxColumns = [("xmin", "float32"), ("ymin", "float32"), ("xmax", "float32"), ("ymax", "float32")]
+KeyColumns = [("doc_name", "string"), ("page_idx", "int32")]
+RegionColumns = [("word_idxs", "list_int32"), ("text", "string")] + BoxColumns
+
+TableColumns = {
+    "pages": KeyColumns + [("width", "float32"), ("height", "float32"), ("num_words", "int32")],
+    "words": KeyColumns
+    + [("word_idx", "int32"), ("text", "string"), ("orig_text", "string")]
+    + [("break_type", "int8")]
+    + BoxColumns,
+    "lines": KeyColumns + [("line_idx", "int32")] + RegionColumns,
+    "paras": KeyColumns + [("para_idx", "int32")] + RegionColumns,
+    "list_items": KeyColumns + [("item_idx", "int32"), ("marker", "string")] + RegionColumns,
+    "table_cells": KeyColumns
+    + [("table_idx", "int32"), ("is_header", "bool"), ("row_idx", "int32"), ("col_idx", "int32")]
+    + RegionColumns,
+}
+
+
+def get_schema(table_name):
+    import pyarrow as pa
+
+    arrow_types = {
+        "string": pa.string(),
+        "int8": pa.int8(),
+        "int32": pa.int32(),
+        "float32": pa.float32(),
+        "bool": pa.bool_(),
+        "list_int32": pa.list_(pa.int32()),
+    }
+    return pa.schema([(c, arrow_types[t]) for (c, t) in TableColumns[table_name]])
+
+
+def get_box_values(shape):
+    if shape is None:
+        return [None] * 4
+    box = shape.box
+    return [box.xmin, box.ymin, box.xmax, box.ymax]
+
+
+def get_region_values(region):
+    words = [w for w in region.words if w is not None] if region.words else []
+    shape = region.shape if words else None
+    text = " ".join(w.text for w in words)
+    return [[w.word_idx for w in words], text] + get_box_values(shape)
+
+
+class CorpusWriter:
+    """Streams docs into chunked parquet tables of words, lines, paras, list
+    items and table cells. Rows are buffered column wise and written to a new
+    part file once a table has chunk_rows rows, so memory does not grow with
+    the number of docs and readers can load only the columns they need."""
+
+    def __init__(self, corpus_dir, chunk_rows=100_000):
+        self.corpus_dir = Path(corpus_dir)
+        self.chunk_rows = chunk_rows
+
+        self.buffers = {name: [] for name in TableColumns}
+        self.num_chunks = {name: 0 for name in TableColumns}
+        self.num_rows = {name: 0 for name in TableColumns}
+
+    def add_row(self, table_name, values):
+        buffer = self.buffers[table_name]
+        buffer.append(values)
+        if len(buffer) >= self.chunk_rows:
+            self.flush(table_name)
+
+    def flush(self, table_name):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        buffer = self.buffers[table_name]
+        if not buffer:
+            return
+
+        schema = get_schema(table_name)
+        columns = [list(c) for c in zip(*buffer)]
+        arrow_table = pa.Table.from_arrays(
+            [pa.array(c, type=f.type) for (c, f) in zip(columns, schema)], schema=schema
+        )
+
+        table_dir = self.corpus_dir / table_name
+        table_dir.mkdir(parents=True, exist_ok=True)
+        part_path = table_dir / f"part-{self.num_chunks[table_name]:05d}.parquet"
+        pq.write_table(arrow_table, part_path, compression="zstd")
+
+        self.num_chunks[table_name] += 1
+        self.num_rows[table_name] += len(buffer)
+        self.buffers[table_name] = []
+
+    def add_doc(self, doc):
+        doc_name = doc.pdf_name
+        for page in doc.pages:
+            keys = [doc_name, page.page_idx]
+            self.add_row("pages", keys + [page.width, page.height, len(page.words)])
+
+            for word in page.words:
+                word_values = [word.word_idx, word.text, word.orig_text_, word.break_type]
+                self.add_row("words", keys + word_values + get_box_values(word.shape_))
+
+            for line_idx, line in enumerate(getattr(page, "lines", None) or []):
+                self.add_row("lines", keys + [line_idx] + get_region_values(line))
+
+            for para_idx, para in enumerate(getattr(page, "paras", None) or []):
+                self.add_row("paras", keys + [para_idx] + get_region_values(para))
+
+            for item_idx, item in enumerate(getattr(page, "list_items", None) or []):
+                marker = getattr(item, "marker", None)
+                marker_text = marker.num_text if marker is not None else None
+                item_values = [item_idx, marker_text] + get_region_values(item)
+                self.add_row("list_items", keys + item_values)
+
+            for table_idx, table in enumerate(getattr(page, "tables", None) or []):
+                header_cells = self.iter_cells(table.header_rows, True)
+                body_cells = self.iter_cells(table.body_rows, False)
+                for is_header, row_idx, col_idx, cell in list(header_cells) + list(body_cells):
+                    cell_values = [table_idx, is_header, row_idx, col_idx]
+                    self.add_row("table_cells", keys + cell_values + get_region_values(cell))
+
+    @staticmethod
+    def iter_cells(rows, is_header):
+        for row_idx, row in enumerate(rows):
+            for col_idx, cell in enumerate(row.cells):
+                yield is_header, row_idx, col_idx, cell
+
+    def close(self):
+        for table_name in TableColumns:
+            self.flush(table_name)
+
+
+def export_corpus(docs_dir, corpus_dir, glob="*.doc.json", chunk_rows=100_000):
+    """Export the docs in docs_dir to parquet tables in corpus_dir, one doc is
+    loaded at a time. Returns the number of rows written to each table."""
+    writer = CorpusWriter(corpus_dir, chunk_rows)
+    for doc_path in sorted(Path(docs_dir).glob(glob)):
+        writer.add_doc(Doc.from_disk(doc_path))
+    writer.close()
+    return writer.num_rows
+
+
+def read_corpus_table(corpus_dir, table_name, columns=None, filters=None):
+    """Read a table of the corpus as a pyarrow Table, only the columns
+    requested are read from the parquet files."""
+    import pyarrow.parquet as pq
+
+    schema = get_schema(table_name)
+    table_dir = Path(corpus_dir) / table_name
+    if not list(table_dir.glob("*.parquet")):
+        table = schema.empty_table()
+        return table.select(columns) if columns else table
+    return pq.read_table(table_dir, columns=columns, filters=filters, schema=schema)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python -m docint.corpus <docs_dir> <corpus_dir> [glob]")
+        sys.exit(1)
+
+    num_rows = export_corpus(*sys.argv[1:4])
+    print("\n".join(f"{name}: {rows}" for (name, rows) in num_rows.items()))
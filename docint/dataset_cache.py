@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+from more_itertools import consecutive_groups, pairwise
+
+
+def get_tokenizer_key(tokenizer_or_processor):
+    """Identity of a tokenizer (or a processor wrapping one), the cache is
+    invalidated when the tokenizer changes."""
+    tokenizer = getattr(tokenizer_or_processor, "tokenizer", tokenizer_or_processor)
+    name_or_path = getattr(tokenizer, "name_or_path", "")
+    return f"{type(tokenizer_or_processor).__name__}:{name_or_path}:{len(tokenizer)}"
+
+
+def hash_examples(*parts):
+    """Hash of json serializable parts, the content of the examples."""
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+    return hasher.hexdigest()[:16]
+
+
+def get_fold_ranges(num_examples, num_folds):
+    """Yield (train_ranges, test_range) of each fold, contiguous ranges of
+    example indices."""
+    assert (
+        num_examples >= num_folds and num_folds >= 1
+    ), f"num_examples: {num_examples} folds: {num_folds}"
+
+    if num_folds == 1:
+        yield [range(num_examples)], range(0)
+        return
+
+    fold_size = num_examples / num_folds
+    fold_idxs = [int(i * fold_size) for i in range(num_folds)] + [num_examples]
+    for start_idx, end_idx in pairwise(fold_idxs):
+        train_ranges = [r for r in (range(0, start_idx), range(end_idx, num_examples)) if r]
+        yield train_ranges, range(start_idx, end_idx)
+
+
+def select_ranges(dataset, idxs):
+    """Select idxs from dataset as contiguous slices, slices of a memory-mapped
+    dataset share its arrow table and don't build an indices mapping."""
+    from datasets import concatenate_datasets
+
+    if isinstance(idxs, range):
+        ranges = [idxs]
+    elif idxs and isinstance(idxs[0], range):
+        ranges = idxs
+    else:
+        ranges = [range(g[0], g[-1] + 1) for g in map(list, consecutive_groups(idxs))]
+
+    if not ranges:
+        return dataset.select([])
+
+    datasets = [dataset.select(r) for r in ranges]
+    return datasets[0] if len(datasets) == 1 else concatenate_datasets(datasets)
+
+
+class DatasetCache:
+    """Tokenized datasets saved on disk, keyed by the tokenizer, the hash of
+    the examples and the preprocessing settings (preprocess_key). Cached
+    datasets are loaded memory-mapped, so training runs and folds read the
+    same arrow files instead of re-tokenizing.
+
+    Only the max_per_name most recently used datasets of a name are kept, the
+    older {name}.{key} dirs are removed when a new dataset is saved."""
+
+    def __init__(self, cache_dir, max_per_name=3):
+        self.cache_dir = Path(cache_dir)
+        self.max_per_name = max_per_name
+
+    def get_path(self, name, tokenizer_key, examples_key, preprocess_key=None):
+        key = hash_examples(tokenizer_key, examples_key, preprocess_key)
+        return self.cache_dir / f"{name}.{key}"
+
+    def prune(self, name):
+        """Remove all but the max_per_name most recently used datasets of name."""
+        dataset_paths = [p for p in self.cache_dir.glob(f"{name}.*") if p.is_dir()]
+        dataset_paths.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        for old_path in dataset_paths[self.max_per_name :]:
+            print(f"Removing old cached dataset: {old_path}")
+            shutil.rmtree(old_path, ignore_errors=True)
+
+    def load_or_build(self, name, tokenizer_key, examples_key, build_dataset, preprocess_key=None):
+        """Load the dataset from the cache, or build it with build_dataset()
+        and save it to the cache."""
+        from datasets import load_from_disk
+
+        dataset_path = self.get_path(name, tokenizer_key, examples_key, preprocess_key)
+        if dataset_path.exists():
+            print(f"Loading cached dataset: {dataset_path}")
+            os.utime(dataset_path)  # mark it as recently used for prune
+            return load_from_disk(str(dataset_path))
+
+        dataset = build_dataset()
+
+        # save to a temporary dir first, so a partial dataset is never loaded
+        tmp_path = dataset_path.with_name(f"tmp.{dataset_path.name}")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        dataset.save_to_disk(str(tmp_path))
+        tmp_path.rename(dataset_path)
+        self.prune(name)
+        return load_from_disk(str(dataset_path))
@@ -0,0 +1,117 @@
+import os
+from pathlib import Path
+
+
+def get_rss_bytes():
+    """Resident memory of the process, None if it can't be read."""
+    statm_path = Path("/proc/self/statm")
+    if statm_path.exists():
+        resident_pages = int(statm_path.read_text().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+class StageMetrics:
+    __slots__ = ("name", "num_in", "num_out", "max_depth", "num_batches", "num_early_flushes")
+
+    def __init__(self, name):
+        self.name = name
+        self.num_in, self.num_out, self.max_depth = 0, 0, 0
+        self.num_batches, self.num_early_flushes = 0, 0
+
+    @property
+    def depth(self):
+        """Number of docs taken in by the stage that it has not yet yielded."""
+        return self.num_in - self.num_out
+
+    def to_dict(self):
+        return {s: getattr(self, s) for s in self.__slots__}
+
+    def __str__(self):
+        return (
+            f"{self.name}: in={self.num_in} out={self.num_out} max_depth={self.max_depth}"
+            f" batches={self.num_batches} early_flushes={self.num_early_flushes}"
+        )
+
+
+class FlowControl:
+    """Caps the number of docs alive in the stages of a pipe_all chain.
+
+    Stages with a pipe method, and docker pipes, pull in whole batches of docs,
+    FlowControl feeds them batches of at most max_in_flight docs (an int for
+    all stages or {name: limit}). If the resident memory of the process is
+    above memory_watermark_mb the batch being collected is flushed early.
+    The metrics track the docs in and out of each stage and the maximum
+    number of docs held by the stage.
+    """
+
+    def __init__(self, max_in_flight=None, memory_watermark_mb=None):
+        self.max_in_flight = max_in_flight
+        self.memory_watermark_mb = memory_watermark_mb
+        self.metrics = {}
+
+    def get_limit(self, name):
+        if isinstance(self.max_in_flight, dict):
+            return self.max_in_flight.get(name, None)
+        return self.max_in_flight
+
+    def is_above_watermark(self):
+        if not self.memory_watermark_mb:
+            return False
+        rss_bytes = get_rss_bytes()
+        return rss_bytes is not None and rss_bytes > self.memory_watermark_mb * 1024 * 1024
+
+    def get_metrics(self, name):
+        if name not in self.metrics:
+            self.metrics[name] = StageMetrics(name)
+        return self.metrics[name]
+
+    def count_in(self, name, docs):
+        stage_metrics = self.get_metrics(name)
+        for doc in docs:
+            stage_metrics.num_in += 1
+            stage_metrics.max_depth = max(stage_metrics.max_depth, stage_metrics.depth)
+            yield doc
+
+    def count_out(self, name, docs):
+        stage_metrics = self.get_metrics(name)
+        for doc in docs:
+            stage_metrics.num_out += 1
+            yield doc
+
+    def batches(self, name, docs):
+        """Split docs into batches for the stage, without a limit or a watermark
+        the docs are passed through as a single lazy batch."""
+        stage_metrics = self.get_metrics(name)
+        docs = self.count_in(name, docs)
+
+        limit = self.get_limit(name)
+        if not limit and not self.memory_watermark_mb:
+            stage_metrics.num_batches += 1
+            yield docs
+            return
+
+        batch = []
+        for doc in docs:
+            batch.append(doc)
+            is_full = bool(limit) and len(batch) >= limit
+            if not is_full and self.is_above_watermark():
+                stage_metrics.num_early_flushes += 1
+                is_full = True
+
+            if is_full:
+                stage_metrics.num_batches += 1
+                yield batch
+                batch = []
+
+        if batch:
+            stage_metrics.num_batches += 1
+            yield batch
+
+    def summary(self):
+        return "\n".join(str(m) for m in self.metrics.values())
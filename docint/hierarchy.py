@@ -18,18 +18,23 @@ Additional matching:
 """
 import itertools as it
 import logging
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict, namedtuple
+from dataclasses import astuple, dataclass
 from itertools import chain, groupby
 from operator import attrgetter
 from pathlib import Path
 
 from more_itertools import first
 
+from docint.log_service import lazy_str
 from docint.span import Span, SpanGroup
 from docint.util import is_readable, read_config_from_disk
 
 lgr = logging.getLogger(__name__)
 
+MatchCacheInfo = namedtuple("MatchCacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
 
 @dataclass
 class MatchOptions:
@@ -59,8 +64,6 @@ class HierarchyNode:
         for child in self.children:
             child.parent = self
 
-        self._debug = lgr.isEnabledFor(logging.DEBUG)
-        self._debug = True
         self._names = None
 
     @property
@@ -105,25 +108,23 @@ class HierarchyNode:
         # Ignoring options like word_boundary
         all_spans = []
         for name in self.get_all_names(match_options):
-            lgr.debug(f"\t\tMatching level:{self.level} >{name}<")
+            lgr.debug("\t\tMatching level:%s >%s<", self.level, name)
             spans = list(iter_spans(name, text))
             if spans:
                 all_spans.extend(spans)
-                if self._debug:
-                    lgr.debug(f"\t\tMatching level:{self.level} >{name}< [{len(spans)}]********")
-            # else:
-            #     if self._debug:
-            #         lgr.debug(f'\t\tMatching level:{self.level} >{name}<')
+                lgr.debug("\t\tMatching level:%s >%s< [%d]********", self.level, name, len(spans))
 
         if all_spans:
-            spans_str = ", ".join(s.span_str(text) for s in all_spans)
-
             before_len = len(all_spans)
             all_spans = Span.remove_subsumed(all_spans)
             if len(all_spans) != before_len:
                 lgr.debug("\t\t\t Subsuming Spans removed")
-            spans_str = ", ".join(s.span_str(text) for s in all_spans)
-            lgr.debug(f"\t<matched: node:{self.path_str} spans[{len(all_spans)}]: >{spans_str}<")
+
+            # spans_str is built only if the debug record is written
+            spans_str = lazy_str(lambda: ", ".join(s.span_str(text) for s in all_spans))
+            lgr.debug(
+                "\t<matched: node:%s spans[%d]: >%s<", self.path_str, len(all_spans), spans_str
+            )
         return all_spans
 
     def find_adjoin_span_groups(self, span, span_groups, text):
@@ -152,7 +153,7 @@ class HierarchyNode:
             return f'>{self.name}< {[len(span_groups)]} {"|".join(str(sg) for sg in span_groups)}'
             # print(fn'{text} [{len(span_groups)}]')
 
-        lgr.debug(f"\trec_find_match:{self.name}")
+        lgr.debug("\trec_find_match:%s", self.name)
 
         span_groups = []  # child span_groups
         for child in self.children:
@@ -162,9 +163,9 @@ class HierarchyNode:
         spans = self.match(text, match_options)  # self matches
 
         if spans and span_groups:
-            spans_str = ", ".join(f">{s.span_str(text)}<" for s in spans)
+            spans_str = lazy_str(lambda: ", ".join(f">{s.span_str(text)}<" for s in spans))
             lgr.debug(
-                f"\t#Handling span_groups[{len(span_groups)}] spans[{len(spans)}]: {spans_str}"
+                "\t#Handling span_groups[%d] spans[%d]: %s", len(span_groups), len(spans), spans_str
             )
 
             for span in spans:
@@ -183,13 +184,13 @@ class HierarchyNode:
                     lgr.debug("\t\t#Multiple merge_sgs")
                     hier_span = HierarchySpan.build(self, span)
                     [m_sg.add(hier_span) for m_sg in merge_sgs]
-                    lgr.debug(
-                        f"\t\t#Merged >{span.span_str(text)}< with {Hierarchy.to_str(merge_sgs)}"
-                    )
+                    if lgr.isEnabledFor(logging.DEBUG):
+                        span_str, sgs_str = span.span_str(text), Hierarchy.to_str(merge_sgs)
+                        lgr.debug("\t\t#Merged >%s< with %s", span_str, sgs_str)
                 else:
                     hier_span = HierarchySpan.build(self, span)
                     span_groups.append(HierarchySpanGroup.build(text, hier_span))
-                    lgr.debug(f"\t\t#Creating 1 span_group for >{span.span_str(text)}<")
+                    lgr.debug("\t\t#Creating 1 span_group for >%s<", lazy_str(span.span_str, text))
         elif spans:
             if not match_options.allow_overlap:
                 # if not Span.is_non_overlapping(spans):
@@ -198,7 +199,7 @@ class HierarchyNode:
                 assert Span.is_non_overlapping(spans), f"{text} {print_groups(spans)}"
             hier_spans = [HierarchySpan.build(self, span) for span in spans]
             span_groups = [HierarchySpanGroup.build(text, h) for h in hier_spans]
-            lgr.debug(f"\t#Creating {len(span_groups)} new span_groups")
+            lgr.debug("\t#Creating %d new span_groups", len(span_groups))
 
         return span_groups
 
@@ -420,7 +421,9 @@ class Hierarchy:
         "unifyAttribute",
     ]
 
-    def __init__(self, file_path, noparse_file_path=None, save_unmatched=False):
+    def __init__(
+        self, file_path, noparse_file_path=None, save_unmatched=False, match_cache_size=4096
+    ):
         self.file_path = Path(file_path)
         if not is_readable(self.file_path):
             raise ValueError(f"Path is not readable: {self.file_path}")
@@ -434,6 +437,13 @@ class Hierarchy:
         self.noparse_dict = self.read_noparse(noparse_file_path)
         self.save_unmatched = save_unmatched
 
+        # LRU cache of find_match results keyed by (text, match_options), the
+        # lock allows a single hierarchy to be shared by components/threads.
+        self.match_cache_size = match_cache_size
+        self._match_cache = OrderedDict()
+        self._match_cache_lock = threading.Lock()
+        self.cache_hits, self.cache_misses = 0, 0
+
         self.expand_names_dict = yml_dict.get("expand_names", {})
         if self.expand_names_dict:
             for old_sub_str, new_sub_str in self.expand_names_dict.items():
@@ -484,6 +494,22 @@ class Hierarchy:
             node._names = None
 
         self.visit_depth_first(expand_node_names)
+        self.clear_match_cache()
+
+    def clear_names_cache(self):
+        """Clear the names of every node, the tree has changed so the
+        cached matches are cleared as well."""
+        self.visit_depth_first(lambda node: node.clear_names_cache())
+        self.clear_match_cache()
+
+    def clear_match_cache(self):
+        with self._match_cache_lock:
+            self._match_cache.clear()
+
+    def cache_info(self):
+        with self._match_cache_lock:
+            currsize = len(self._match_cache)
+        return MatchCacheInfo(self.cache_hits, self.cache_misses, self.match_cache_size, currsize)
 
     def read_noparse(self, noparse_file_path):
         if not noparse_file_path:
@@ -509,9 +535,25 @@ class Hierarchy:
         return HierarchySpanGroup.select_non_overlapping(span_groups)
 
     def find_match(self, text, match_options):
+        """Find span_groups of the hierarchy nodes in text.
+
+        Results are memoized on (text, match_options), the same department and
+        post names recur across documents. The returned span_groups are shared
+        between callers and should not be modified.
+        """
         lgr.debug(f"find_match: {text}")
         # print(f"Hierarchy: {text}")
 
+        cache_key = (text, astuple(match_options))
+        if self.match_cache_size:
+            with self._match_cache_lock:
+                span_groups = self._match_cache.get(cache_key, None)
+                if span_groups is not None:
+                    self._match_cache.move_to_end(cache_key)
+                    self.cache_hits += 1
+                    return list(span_groups)
+                self.cache_misses += 1
+
         if self._match_options and self._match_options != match_options:
             lgr.debug("New match options, clearing names")
             self.visit_depth_first(lambda node: node.clear_names_cache())
@@ -524,7 +566,14 @@ class Hierarchy:
         # return HierarchySpanGroup.select_non_overlapping(span_groups)
         # print(f'Num span groups: {len(span_groups)}')
 
-        return HierarchySpanGroup.select(span_groups, match_options.select_strategy)
+        span_groups = HierarchySpanGroup.select(span_groups, match_options.select_strategy)
+
+        if self.match_cache_size:
+            with self._match_cache_lock:
+                self._match_cache[cache_key] = span_groups
+                if len(self._match_cache) > self.match_cache_size:
+                    self._match_cache.popitem(last=False)
+        return list(span_groups)
 
     @classmethod
     def to_str(self, span_groups, prefix=""):
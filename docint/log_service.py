@@ -0,0 +1,230 @@
+import atexit
+import contextvars
+import logging
+import queue
+import sys
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+
+# All docint loggers share one LogService. Records are formatted in the thread
+# that logs them and queued, a background thread writes them to the console
+# and routes them to the log file of the doc being processed. Loggers are at
+# INFO level unless a doc log is attached, so debug messages are not built when
+# they would not be written anywhere.
+#
+# Doc logs are attached in a context variable, so the thread (or asyncio task)
+# processing a doc routes to the doc's file even when other docs are in the
+# same component at once. Records logged from threads a component starts
+# itself are not in that context and only go to the console.
+
+LogDir = Path("logs")
+
+
+class lazy_str:
+    """Message argument that is built only if the record is formatted,
+    lgr.debug("spans: %s", lazy_str(lambda: ", ".join(spans)))."""
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func, *args):
+        self.func, self.args = func, args
+
+    def __str__(self):
+        return str(self.func(*self.args))
+
+
+class DocFileRouter(logging.Handler):
+    """Writes a record to the file in its doc_log_path, files are kept open
+    across records, at most max_open_files of them."""
+
+    def __init__(self, max_open_files=32):
+        super().__init__(logging.DEBUG)
+        self.max_open_files = max_open_files
+        self.log_files = OrderedDict()
+
+    def get_log_file(self, log_path, truncate):
+        log_file = self.log_files.pop(log_path, None)
+        if log_file is None or truncate:
+            if log_file is not None:
+                log_file.close()
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            log_file = open(log_path, "w" if truncate else "a", encoding="utf-8")
+
+        self.log_files[log_path] = log_file
+        while len(self.log_files) > self.max_open_files:
+            _, old_file = self.log_files.popitem(last=False)
+            old_file.close()
+        return log_file
+
+    def emit(self, record):
+        try:
+            truncate = getattr(record, "doc_log_truncate", False)
+            log_file = self.get_log_file(record.doc_log_path, truncate)
+            if not truncate:
+                log_file.write(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        for log_file in self.log_files.values():
+            log_file.flush()
+
+    def close(self):
+        for log_file in self.log_files.values():
+            log_file.close()
+        self.log_files.clear()
+        super().close()
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """Writes to the current sys.stdout, which is replaced when output is captured."""
+
+    def emit(self, record):
+        self.stream = sys.stdout
+        super().emit(record)
+
+    def flush(self):
+        self.stream = sys.stdout
+        super().flush()
+
+
+class DocQueueHandler(logging.Handler):
+    """Attached to the docint logger, tags records with the doc log path of their
+    logger (or its nearest ancestor) and queues them for the writer thread."""
+
+    def __init__(self, service):
+        super().__init__(logging.DEBUG)
+        self.service = service
+
+    def emit(self, record):
+        try:
+            record.msg = self.format(record)
+            record.args, record.exc_info, record.exc_text = None, None, None
+
+            doc_log_paths, name = self.service.doc_log_paths.get(), record.name
+            while name and name not in doc_log_paths:
+                name = name.rpartition(".")[0]
+            record.doc_log_path = doc_log_paths.get(name, None)
+            self.service.queue.put(record)
+        except Exception:
+            self.handleError(record)
+
+
+class LogService:
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+        # {logger name: log path} of the current context, replaced and never mutated
+        self.doc_log_paths = contextvars.ContextVar("doc_log_paths", default={})
+        self.num_doc_logs = Counter()
+        self.console_levels = {}
+        self.console_handler = ConsoleHandler(sys.stdout)
+        self.router = DocFileRouter()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.thread is not None:
+                return
+            logging.getLogger("docint").addHandler(DocQueueHandler(self))
+            self.thread = threading.Thread(target=self.run, name="docint-logs", daemon=True)
+            self.thread.start()
+            atexit.register(self.stop)
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            elif isinstance(item, threading.Event):
+                try:
+                    self.router.flush()
+                    self.console_handler.flush()
+                finally:
+                    item.set()
+                continue
+
+            if getattr(item, "doc_log_truncate", False):
+                self.router.handle(item)
+                continue
+
+            if item.levelno >= self.console_levels.get(item.name, logging.WARNING):
+                self.console_handler.handle(item)
+            if item.doc_log_path is not None:
+                self.router.handle(item)
+
+    def flush(self, timeout=10.0):
+        """Wait until the records queued so far are written."""
+        if self.thread is None:
+            return
+        written = threading.Event()
+        self.queue.put(written)
+        written.wait(timeout)
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join(timeout=10.0)
+        self.router.close()
+        self.thread = None
+
+    def update_level(self, lgr):
+        console_level = self.console_levels.get(lgr.name, logging.INFO)
+        has_doc_log = self.num_doc_logs[lgr.name] > 0
+        lgr.setLevel(logging.DEBUG if has_doc_log else console_level)
+
+    def get_logger(self, name, console_level=logging.INFO):
+        self.start()
+        lgr = logging.getLogger(name)
+        self.console_levels[name] = console_level
+        self.update_level(lgr)
+        return lgr
+
+    def add_doc_log(self, lgr, log_name):
+        log_path = LogDir / log_name
+        self.doc_log_paths.set({**self.doc_log_paths.get(), lgr.name: log_path})
+
+        # the file is truncated by the writer, after the records queued before
+        truncate_record = logging.LogRecord(lgr.name, logging.DEBUG, "", 0, "", None, None)
+        truncate_record.doc_log_path, truncate_record.doc_log_truncate = log_path, True
+        self.queue.put(truncate_record)
+
+        with self.lock:
+            self.num_doc_logs[lgr.name] += 1
+            self.update_level(lgr)
+        return log_path
+
+    def remove_doc_log(self, lgr):
+        doc_log_paths = dict(self.doc_log_paths.get())
+        if doc_log_paths.pop(lgr.name, None) is None:
+            return
+        self.doc_log_paths.set(doc_log_paths)
+
+        with self.lock:
+            self.num_doc_logs[lgr.name] -= 1
+            self.update_level(lgr)
+
+
+log_service = LogService()
+
+
+def get_logger(name, console_level=logging.INFO):
+    """Logger that writes records of console_level and above to stdout, and all
+    the records to the doc log added with add_doc_log."""
+    return log_service.get_logger(name, console_level)
+
+
+def add_doc_log(lgr, log_name):
+    """Route the records of lgr logged in the current thread or task to
+    logs/{log_name}, returns the log path."""
+    return log_service.add_doc_log(lgr, log_name)
+
+
+def remove_doc_log(lgr):
+    log_service.remove_doc_log(lgr)
+
+
+def flush_logs():
+    log_service.flush()
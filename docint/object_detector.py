@@ -0,0 +1,154 @@
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Runtimes in which the detection model can be run on CPU
+Runtimes = ("torch", "quantized", "onnx")
+
+
+def resize_to_model(image, size):
+    """Shrink image to the size the processor resizes to, resizing in PIL is
+    much cheaper than resizing the full page image in the processor."""
+    shortest_edge = size.get("shortest_edge", 800)
+    longest_edge = size.get("longest_edge", 1333)
+
+    (width, height) = image.size
+    scale = min(shortest_edge / min(width, height), longest_edge / max(width, height))
+    if scale >= 1.0:
+        return image
+
+    new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return image.resize(new_size, resample=2)  # Image.BILINEAR
+
+
+class OnnxDetrModel:
+    """Runs an exported DETR model with onnxruntime, the outputs have the
+    logits and pred_boxes used by the processor's post processing."""
+
+    def __init__(self, model, onnx_path):
+        import onnxruntime as ort
+
+        self.config = model.config
+        onnx_path = Path(onnx_path)
+        if not onnx_path.exists():
+            self.export(model, onnx_path)
+        self.session = ort.InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"])
+
+    @staticmethod
+    def export(model, onnx_path):
+        import torch
+
+        class DetrOutputs(torch.nn.Module):
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, pixel_values, pixel_mask):
+                outputs = self.model(pixel_values=pixel_values, pixel_mask=pixel_mask)
+                return outputs.logits, outputs.pred_boxes
+
+        onnx_path.parent.mkdir(parents=True, exist_ok=True)
+        torch.onnx.export(
+            DetrOutputs(model.eval()),
+            (torch.zeros(1, 3, 800, 800), torch.ones(1, 800, 800, dtype=torch.int64)),
+            str(onnx_path),
+            input_names=["pixel_values", "pixel_mask"],
+            output_names=["logits", "pred_boxes"],
+            dynamic_axes={
+                "pixel_values": {0: "batch", 2: "height", 3: "width"},
+                "pixel_mask": {0: "batch", 1: "height", 2: "width"},
+                "logits": {0: "batch"},
+                "pred_boxes": {0: "batch"},
+            },
+            opset_version=14,
+        )
+
+    def __call__(self, pixel_values, pixel_mask):
+        import torch
+
+        inputs = {"pixel_values": pixel_values.numpy(), "pixel_mask": pixel_mask.numpy()}
+        logits, pred_boxes = self.session.run(["logits", "pred_boxes"], inputs)
+        return SimpleNamespace(
+            logits=torch.from_numpy(logits), pred_boxes=torch.from_numpy(pred_boxes)
+        )
+
+
+class ObjectDetector:
+    """Batched inference of a DETR style detection model on page images.
+
+    Images are shrunk to the model's input resolution before processing and
+    are run in batches, the model can be dynamically quantized or exported
+    to onnxruntime for faster CPU inference.
+    """
+
+    def __init__(self, processor, model, runtime="torch", onnx_path=None):
+        if runtime not in Runtimes:
+            raise ValueError(f"Unknown runtime: {runtime}, should be one of {Runtimes}")
+
+        import torch
+
+        self.processor = processor
+        self.runtime = runtime
+        self.id2label = model.config.id2label
+
+        model.eval()
+        if runtime == "quantized":
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        elif runtime == "onnx":
+            model = OnnxDetrModel(model, onnx_path)
+        self.model = model
+
+        self.num_images, self.inference_time = 0, 0.0
+
+    @property
+    def images_per_sec(self):
+        return self.num_images / self.inference_time if self.inference_time else 0.0
+
+    def detect(self, images, threshold, batch_size=4):
+        """Yield (image_size, results) for images, the result boxes are in the
+        coordinates of the resized image of image_size (width, height). Images
+        can be a generator, only a batch of images is held in memory at a time."""
+        import torch
+        from more_itertools import chunked
+
+        size = self.processor.size if isinstance(self.processor.size, dict) else {}
+
+        for batch_images in chunked(images, batch_size):
+            start = time.perf_counter()
+            batch_images = [resize_to_model(img.convert("RGB"), size) for img in batch_images]
+            encoding = self.processor(images=batch_images, return_tensors="pt")
+            with torch.no_grad():
+                outputs = self.model(
+                    pixel_values=encoding["pixel_values"], pixel_mask=encoding["pixel_mask"]
+                )
+
+            target_sizes = [img.size[::-1] for img in batch_images]
+            results = self.processor.post_process_object_detection(
+                outputs, threshold=threshold, target_sizes=target_sizes
+            )
+            self.num_images += len(batch_images)
+            self.inference_time += time.perf_counter() - start
+
+            image_sizes = [img.size for img in batch_images]
+            del batch_images, encoding
+            yield from zip(image_sizes, results)
+
+
+def get_onnx_path(model_path):
+    return Path(".model") / "onnx" / f"{Path(model_path).name}.onnx"
+
+
+def load_table_detector(model_path, runtime="torch"):
+    from transformers import DetrForObjectDetection, DetrImageProcessor
+
+    processor = DetrImageProcessor.from_pretrained(model_path)
+    model = DetrForObjectDetection.from_pretrained(model_path)
+    return ObjectDetector(processor, model, runtime, get_onnx_path(model_path))
+
+
+def load_table_recognizer(model_path, runtime="torch"):
+    from transformers import DetrImageProcessor, TableTransformerForObjectDetection
+
+    processor = DetrImageProcessor()
+    model = TableTransformerForObjectDetection.from_pretrained(model_path)
+    return ObjectDetector(processor, model, runtime, get_onnx_path(model_path))
@@ -2,7 +2,6 @@ import math
 from base64 import b64encode  # noqa
 from pathlib import Path
 
-from PIL import Image
 from pydantic import BaseModel
 
 from .shape import Box, Coord, rotate_image_coord
@@ -16,6 +15,8 @@ class ImageContext:
         self.transformations = []
 
     def __enter__(self):
+        from PIL import Image
+
         image_path = Path(self.page_image.get_image_path())
         if image_path.exists():
             self.image = Image.open(image_path)
@@ -268,6 +269,8 @@ class PageImage(BaseModel):
         self.image_width, self.image_height = new_size
 
     def to_pil_image(self, image_size=None):
+        from PIL import Image
+
         pil_image = Image.open(self.get_image_path())
 
         if image_size:
@@ -146,6 +146,15 @@ class PDF(ABC):
     def __getitem__(self, idx):
         return self.pages[idx]
 
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def __iter__(self):
         return iter(self.pages)
 
@@ -189,14 +189,29 @@ class Image(pdf.Image):
 
 
 class Line:
-    def __init__(self, rect):
+    """Bounds of a path object on the page, thin paths are ruling lines."""
+
+    def __init__(self, rect, stroke_width=0.0):
         self._rect = rect
+        self.stroke_width = stroke_width
 
-    def is_vertical(self):
-        pass
+    @property
+    def bounding_box(self):
+        return self._rect
 
-    def is_horizontal(self):
-        pass
+    @property
+    def width(self):
+        return self._rect[2] - self._rect[0]
+
+    @property
+    def height(self):
+        return self._rect[3] - self._rect[1]
+
+    def is_vertical(self, thickness=3.0):
+        return self.width <= max(thickness, self.stroke_width) < self.height
+
+    def is_horizontal(self, thickness=3.0):
+        return self.height <= max(thickness, self.stroke_width) < self.width
 
 
 class Page(pdf.Page):
@@ -229,49 +244,24 @@ class Page(pdf.Page):
         return lib_textpage.get_text_range()
 
     def build_lines(self, lib_page):
-        def get_bounds(pdf_path):
+        def get_line(pdf_path):
             l, b, r, t = (  # noqa
                 ctypes.c_float(),
                 ctypes.c_float(),
                 ctypes.c_float(),
                 ctypes.c_float(),
             )  # noqa
-            success = pdfium.FPDFPageObj_GetBounds(pdf_path.raw, l, b, r, t)  # noqa
+            pdfium.FPDFPageObj_GetBounds(pdf_path.raw, l, b, r, t)  # noqa
 
             stroke_width = ctypes.c_float()
             pdfium.FPDFPageObj_GetStrokeWidth(pdf_path.raw, stroke_width)
 
-            num_segs = pdfium.FPDFPath_CountSegments(pdf_path.raw)
-
-            fillmode, stroke = ctypes.c_int(), ctypes.c_int()
-            draw_mode = pdfium.FPDFPath_GetDrawMode(pdf_path.raw, fillmode, stroke)
-
-            print(
-                f"{l.value:.2f},{b.value:.2f} {r.value:.2f},{t.value:.2f} w: {stroke_width.value} segs: {num_segs} mode: {draw_mode} stroke: {stroke}"
-            )
-
-            for seg_idx in range(num_segs):
-                seg_handle = pdfium.FPDFPath_GetPathSegment(pdf_path.raw, seg_idx)
-
-                seg_x, seg_y = ctypes.c_float(), ctypes.c_float()
-                pdfium.FPDFPathSegment_GetPoint(seg_handle, seg_x, seg_y)
-
-                seg_type = pdfium.FPDFPathSegment_GetType(seg_handle)
-                close_flag = pdfium.FPDFPathSegment_GetClose(seg_handle)
-
-                print(
-                    f"\t {seg_idx}: x:{seg_x.value:.2f} y:{seg_y.value:.2f} t:{seg_type} c:{close_flag}"
-                )
-            print()
-
-            return [l.value, b.value, r.value, t.value]
+            bottom, top = self.height - b.value, self.height - t.value
+            return Line((l.value, top, r.value, bottom), stroke_width.value)
 
         pdf_path_type = pdfium.FPDF_PAGEOBJ_PATH
         pdf_paths = [o for o in lib_page.get_objects() if o.type == pdf_path_type]
-
-        bounds = [get_bounds(p) for p in pdf_paths]
-        lines = [Line(b) for b in bounds]
-        return lines
+        return [get_line(p) for p in pdf_paths]
 
     def build_words(self, lib_textpage):
         def get_char(char_idx):
@@ -460,6 +450,11 @@ class PDF(pdf.PDF):
     def del_page(self, page_idx):
         self.lib_pdf.del_page(page_idx)
 
+    def close(self):
+        for page in self._pages:
+            page.lib_page.close()
+        self.lib_pdf.close()
+
     def save(self, new_path):
         import builtins
 
@@ -0,0 +1,89 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def to_field_set(fields):
+    return {fields} if isinstance(fields, str) else set(fields)
+
+
+class PipeGraph:
+    """DAG of the pipeline components, built from the fields each component
+    assigns and requires.
+
+    A component depends on an earlier component if it reads a field the
+    earlier component assigns, assigns a field the earlier component reads or
+    both assign the same field. Components that declare neither assigns nor
+    requires may touch any field, so they depend on all earlier components and
+    all later components depend on them, this keeps the list order for
+    pipelines without declarations.
+    """
+
+    def __init__(self, pipe_fields):
+        """pipe_fields is a list of (name, assigns, requires) in pipeline order."""
+        self.names = [name for (name, _, _) in pipe_fields]
+        self.assigns = {name: to_field_set(a) for (name, a, _) in pipe_fields}
+        self.requires = {name: to_field_set(r) for (name, _, r) in pipe_fields}
+
+        self.preds = {name: set() for name in self.names}
+        for idx, name in enumerate(self.names):
+            for prev_name in self.names[:idx]:
+                if self.is_dependent(prev_name, name):
+                    self.preds[name].add(prev_name)
+
+    def is_declared(self, name):
+        return bool(self.assigns[name] or self.requires[name])
+
+    def is_dependent(self, prev_name, name):
+        if not (self.is_declared(prev_name) and self.is_declared(name)):
+            return True
+
+        prev_assigns, prev_requires = self.assigns[prev_name], self.requires[prev_name]
+        assigns, requires = self.assigns[name], self.requires[name]
+        return bool(prev_assigns & requires or prev_requires & assigns or prev_assigns & assigns)
+
+    def get_needed(self, targets=None):
+        """Return the components needed for targets, a target is a component
+        name or a field assigned by a component, all components if None."""
+        if targets is None:
+            return set(self.names)
+
+        stack = []
+        for target in [targets] if isinstance(targets, str) else targets:
+            if target in self.preds:
+                stack.append(target)
+                continue
+
+            producers = [n for n in self.names if target in self.assigns[n]]
+            if not producers:
+                raise ValueError(f"Unknown target: {target}, not a component or an assigned field")
+            stack.extend(producers)
+
+        needed = set()
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.preds[name])
+        return needed
+
+    def run(self, doc, run_pipe, targets=None, max_workers=4):
+        """Run the needed components on doc, run_pipe(name, doc) is called
+        as soon as all the predecessors of a component are done, components
+        that are ready at the same time run concurrently on the same doc."""
+        needed = self.get_needed(targets)
+        pending = [n for n in self.names if n in needed]
+        done, running = set(), {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending or running:
+                ready = [n for n in pending if self.preds[n] <= done]
+                for name in ready:
+                    pending.remove(name)
+                    running[executor.submit(run_pipe, name, doc)] = name
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    if future.result() is not doc:
+                        raise ValueError(f"Component {name} should modify the doc in place")
+                    done.add(name)
+        return doc
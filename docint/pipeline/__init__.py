@@ -1,58 +1,52 @@
-# isort: skip_file
-from .body_marker import FindBodyMarker
-from .do_nothing import DoNothing
-
-from .gcv_recognizer import CloudVisionRecognizer
-from .gcv_recognizer2 import CloudVisionRecognizer2
-
-from .tess_recognizer import TesseractRecognizer
-
-from .html_gen import HtmlGenerator
-from .svg_gen import SVGGenerator
-from .list_finder import ListFinder
-from .nonum_list_finder import NonumberListFinder
-from .num_marker import NumMarker
-
-
-# from .sents_fixer import DictionarySentenceFixer
-# from .infer_layoutlm import InferLayoutLM
-from .page_orienter import OrientPage
-from .pdf_reader import PDFReader
-from .pdf_cid_reader import PDFCIDReader
-from .pdf_cid_info import PDFCIDInfoReader
-from .pdftable_finder import PDFTableFinder
-from .region_differ import RegionDiffer
-from .rotation_detector import RotationDetector
-from .table_builder_edges import TableBuilderOnEdges
-
-# from .table_builder import TableBuilder
-from .table_edge_finder import TableEdgeFinder
-from .table_finder import TableFinder
-from .wordfreq_writer import WordfreqWriter
-from .words_arranger import WordsArranger
-from .para_fixer import ParaFixer
-from .height_calc import HeightCalculator
-from .learn_layoutlmv2 import LearnLayout
-from .do_nothing_pipe import DoNothingPipe
-from .infer_layoutlmv2 import InferLayoutLMv2
-from .skew_detector_num_marker import SkewDetectorNumMarker
-from .skew_detector_wand import SkewDetectorWand
-from .script_normalizer import ScriptNormalizer
-from .page_image_builder_raster import PageImageBuilderRaster
-from .page_image_builder_embedded import PageImageBuilderEmbedded
-from .table_edge_finder_wand import TableEdgeFinderWand
-
-from .list_finder2 import ListFinder2
-from .line_finder import LineFinder
-
-from .meta_writer import MetaWriter
-from .table_detector import TableDetector
-from .table_recognizer import TableRecognizer
-from .learn_ner import LearnNER
-from .table_builder_edges2 import TableBuilderOnEdges2
-from .org_meta_writer import OrgMetaWriter
-from .page_rotator import RotatePage
-from .ascii_converter import AsciiConverter
-from .doc_translator_a4b import DocTranslatorAI4Bharat
-from .doc_translator_hf import DocTranslator
-from .docx_gen import DocxGenerator
+# Modules of the factories, a factory module is imported by Vision only when
+# the factory is added to a pipeline, so importing docint does not import the
+# pipeline components (and the libraries they depend on).
+FactoryModules = {
+    "body_marker": "docint.pipeline.body_marker",
+    "do_nothing": "docint.pipeline.do_nothing",
+    "gcv_recognizer": "docint.pipeline.gcv_recognizer",
+    "gcv_recognizer2": "docint.pipeline.gcv_recognizer2",
+    "tess_recognizer": "docint.pipeline.tess_recognizer",
+    "html_generator": "docint.pipeline.html_gen",
+    "svg_generator": "docint.pipeline.svg_gen",
+    "list_finder": "docint.pipeline.list_finder",
+    "nonum_list_finder": "docint.pipeline.nonum_list_finder",
+    "num_marker": "docint.pipeline.num_marker",
+    "orient_pages": "docint.pipeline.page_orienter",
+    "pdf_reader": "docint.pipeline.pdf_reader",
+    "pdf_cid_reader": "docint.pipeline.pdf_cid_reader",
+    "pdf_cid_info": "docint.pipeline.pdf_cid_info",
+    "pdftable_finder": "docint.pipeline.pdftable_finder",
+    "region_differ": "docint.pipeline.region_differ",
+    "rotation_detector": "docint.pipeline.rotation_detector",
+    "table_builder_on_edges": "docint.pipeline.table_builder_edges",
+    "table_edge_finder": "docint.pipeline.table_edge_finder",
+    "table_finder": "docint.pipeline.table_finder",
+    "wordfreq_writer": "docint.pipeline.wordfreq_writer",
+    "words_arranger": "docint.pipeline.words_arranger",
+    "para_fixer": "docint.pipeline.para_fixer",
+    "height_calc": "docint.pipeline.height_calc",
+    "learn_layoutlmv2": "docint.pipeline.learn_layoutlmv2",
+    "do_nothing_pipe": "docint.pipeline.do_nothing_pipe",
+    "infer_layoutlmv2": "docint.pipeline.infer_layoutlmv2",
+    "skew_detector_num_marker": "docint.pipeline.skew_detector_num_marker",
+    "skew_detector_wand": "docint.pipeline.skew_detector_wand",
+    "script_normalizer": "docint.pipeline.script_normalizer",
+    "page_image_builder_raster": "docint.pipeline.page_image_builder_raster",
+    "page_image_builder_embedded": "docint.pipeline.page_image_builder_embedded",
+    "table_edge_finder_wand": "docint.pipeline.table_edge_finder_wand",
+    "list_finder2": "docint.pipeline.list_finder2",
+    "line_finder": "docint.pipeline.line_finder",
+    "meta_writer": "docint.pipeline.meta_writer",
+    "table_detector": "docint.pipeline.table_detector",
+    "table_recognizer": "docint.pipeline.table_recognizer",
+    "table_page_filter": "docint.pipeline.table_page_filter",
+    "learn_ner": "docint.pipeline.learn_ner",
+    "table_builder_on_edges2": "docint.pipeline.table_builder_edges2",
+    "org_meta_writer": "docint.pipeline.org_meta_writer",
+    "page_rotator": "docint.pipeline.page_rotator",
+    "ascii_converter": "docint.pipeline.ascii_converter",
+    "doc_translator_a4b": "docint.pipeline.doc_translator_a4b",
+    "doc_translator_hf": "docint.pipeline.doc_translator_hf",
+    "docx_generator": "docint.pipeline.docx_gen",
+}
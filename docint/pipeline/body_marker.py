@@ -2,6 +2,7 @@ import logging
 import sys
 from pathlib import Path
 
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..para import Para
 from ..util import load_config
 from ..vision import Vision
@@ -24,26 +25,13 @@ class FindBodyMarker:
         self.conf_dir = Path(conf_dir)
         self.conf_stub = conf_stub
 
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
-
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-
-        self.file_handler = None
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
+        add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
 
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def __call__(self, doc):
         self.add_log_handler(doc)
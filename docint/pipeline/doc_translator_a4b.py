@@ -4,6 +4,7 @@ from pathlib import Path
 
 from more_itertools import flatten
 
+from ..translation_memory import TranslationMemory
 from ..util import get_full_path, get_model_path, is_readable_nonempty, is_repo_path
 from ..vision import Vision
 
@@ -45,6 +46,7 @@ BatchSize = 100
         "model_dir": "/import/models",
         "model_name": "ai4bharat:IndicTrans2-en/ct2_int8_model",
         "translations_file": "doc_translations.json",
+        "memory_file": "doc_translations.db",
         "translations_todo_file": "doc_translations_todo.json",
         "output_dir": "output",
         "write_output": False,
@@ -60,6 +62,7 @@ class DocTranslatorAI4Bharat:
         model_dir,
         model_name,
         translations_file,
+        memory_file,
         translations_todo_file,
         output_dir,
         write_output,
@@ -80,8 +83,20 @@ class DocTranslatorAI4Bharat:
 
         self.output_dir = Path(output_dir)
 
+        self.write_output = write_output
+        self.src_lang = src_lang
+        self.tgt_lang = tgt_lang
+        self.model = None
+
+        # sentence translations are stored in memory_file, older translations
+        # in translations_file are imported when the memory is created.
         self.translations_file = self.conf_dir / translations_file
-        self.indic2en_trans = self.load_translations()
+        self.memory_file = self.conf_dir / memory_file
+        is_new_memory = not self.memory_file.exists()
+        self.memory = TranslationMemory(self.memory_file, self.src_lang, self.tgt_lang)
+        if is_new_memory:
+            self.memory.import_json(self.translations_file)
+        self.doc_trans = {}
 
         self.translations_todo_file = self.output_dir / translations_todo_file
         if is_readable_nonempty(self.translations_todo_file):
@@ -92,11 +107,6 @@ class DocTranslatorAI4Bharat:
         self.para_todos = set(translations_todo["paras"])
         self.cell_todos = set(translations_todo["cells"])
 
-        self.write_output = write_output
-        self.src_lang = src_lang
-        self.tgt_lang = tgt_lang
-        self.model = None
-
     def load_model(self):
         from ..models.indictrans.engine import Model
 
@@ -105,43 +115,33 @@ class DocTranslatorAI4Bharat:
         print(trans_model_dir)
         return Model(str(trans_model_dir), device="cpu")
 
-    def load_translations(self):
-        indic2en_trans = {}
-        if is_readable_nonempty(self.translations_file):
-            json_list = json.loads(self.translations_file.read_text())
-            for trans_dict in json_list:
-                m, e = trans_dict["mr"], trans_dict["en"]
-                indic2en_trans[m] = e
-        return indic2en_trans
-
-    def save_translations(self):
-        save_trans = sorted(
-            [{"mr": k, "en": v} for (k, v) in self.indic2en_trans.items()],
-            key=lambda d: d["mr"],
-        )
-        self.translations_file.write_text(json.dumps(save_trans, indent=2, ensure_ascii=False))
-
     def save_todos(self):
         if self.para_todos or self.cell_todos:
             todo = {"paras": sorted(self.para_todos), "cells": sorted(self.cell_todos)}
             self.translations_todo_file.write_text(json.dumps(todo, indent=2, ensure_ascii=False))
 
-    def para_translate(self, para_texts):
-        para_trans = [
-            self.model.translate_paragraph(p, self.src_lang, self.tgt_lang) for p in para_texts
-        ]
-        for p, t in zip(para_texts, para_trans):
-            self.indic2en_trans[p] = t
-        self.save_translations()
+    def split_sentences(self, para_text):
+        from ..models.indictrans.engine import split_sentences
+
+        return split_sentences(para_text, self.src_lang)
 
     def sentences_translate(self, sents):
-        sents_trans = self.model.batch_translate(sents, self.src_lang, self.tgt_lang)
-        for s, t in zip(sents, sents_trans):
-            self.indic2en_trans[s] = t
-        self.save_translations()
+        """Translate sentences missing in the memory, in batches, and append
+        the translations to the memory after each batch."""
+        sents = self.memory.get_unseen(sents)
+        for idx in range(0, len(sents), BatchSize):
+            batch_sents = sents[idx : idx + BatchSize]
+            batch_trans = self.model.batch_translate(batch_sents, self.src_lang, self.tgt_lang)
+            self.memory.add_many(zip(batch_sents, batch_trans))
+        return len(sents)
 
     def get_text_trans(self, text):
-        return None if text.isascii() else self.indic2en_trans[text]
+        return None if text.isascii() else self.doc_trans[text]
+
+    def get_para_trans(self, para_text, para_sents):
+        if para_text.isascii():
+            return None
+        return " ".join(self.doc_trans[s] for s in para_sents[para_text])
 
     def get_table_trans(self, table):
         table_trans = []
@@ -166,22 +166,25 @@ class DocTranslatorAI4Bharat:
                     c for c in get_row_texts(row) if not c.isascii() and not is_number(c)
                 ]
 
+        # paragraphs are translated sentence by sentence, cells as a sentence
+        para_sents = dict((p, self.split_sentences(p)) for p in set(para_texts))
+        sents = list(flatten(para_sents.values()))
         print("Calculated para_texts, cell_texts")
-        para_texts = [p for p in para_texts if p not in self.indic2en_trans]
-        cell_texts = [c for c in cell_texts if c not in self.indic2en_trans]
 
-        para_texts, cell_texts = set(para_texts), set(cell_texts)
+        doc_texts = sents + cell_texts
+
+        unseen_sents = set(self.memory.get_unseen(sents))
+        para_texts = set(p for (p, ss) in para_sents.items() if any(s in unseen_sents for s in ss))
+        cell_texts = set(self.memory.get_unseen(cell_texts))
         fully_translated = False
 
         if self.mode == "translate":
-            if self.model is None:
-                self.model = self.load_model()
+            if unseen_sents or cell_texts:
+                if self.model is None:
+                    self.model = self.load_model()
 
-            self.para_translate(para_texts)
-            print("Translated para_texts")
-
-            self.sentences_translate(cell_texts)
-            print("Translated cell_texts")
+                num_sents = self.sentences_translate(sorted(unseen_sents | cell_texts))
+                print(f"Translated para_texts, cell_texts #sentences: {num_sents}")
             fully_translated = True
         elif self.mode == "todo":
             if para_texts or cell_texts:
@@ -201,10 +204,13 @@ class DocTranslatorAI4Bharat:
         else:
             print("Document FULLY TRANSLATED")
 
+        if fully_translated:
+            self.doc_trans = self.memory.get_many(doc_texts)
+
         for page in doc.pages:
             if fully_translated:
                 page.para_trans = [
-                    self.get_text_trans(p.text_with_break().strip()) for p in page.paras
+                    self.get_para_trans(p.text_with_break().strip(), para_sents) for p in page.paras
                 ]
                 page.table_trans = [self.get_table_trans(t) for t in page.tables]
             else:
@@ -1,3 +1,4 @@
+import asyncio
 import io
 import json
 import pathlib
@@ -400,3 +401,9 @@ class CloudVisionRecognizer:
             num_pdf_pages = len(pdf.pages)
             result = self.run_gcv(doc, num_pdf_pages)
             return self.build_pages(doc, result)
+
+    async def acall(self, doc):
+        """The recognizer keeps no doc state on self, the cloud requests of many
+        docs can wait at once, see AsyncRunner."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self, doc)
@@ -66,6 +66,17 @@ HTMLHeader = """
         "svg_stem": "svg",
         "color_dict": {"word": "blue"},
     },
+    requires=[
+        "words",
+        "page_image",
+        "num_markers",
+        "table_edges_list",
+        "edges",
+        "list_items",
+        "tables",
+        "order",
+        "table_boxes",
+    ],
 )
 class HtmlGenerator:
     def __init__(self, html_root, image_stem, svg_stem, color_dict):
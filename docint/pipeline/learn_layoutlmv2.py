@@ -1,14 +1,23 @@
 import logging
 from pathlib import Path
 
-from more_itertools import pairwise
-
+from ..dataset_cache import (
+    DatasetCache,
+    get_fold_ranges,
+    get_tokenizer_key,
+    hash_examples,
+    select_ranges,
+)
 from ..region import Region
-from ..util import get_full_path, is_repo_path, load_config
+from ..util import get_full_path, hash_file, is_repo_path, load_config
 from ..vision import Vision
 
 MAX_IMAGE_HEIGHT = 1000
 
+# bump when the preprocessing of the dataset changes, cached datasets are rebuilt
+DATASET_VERSION = 1
+PROCESSOR_KWARGS = {"padding": "max_length", "truncation": True}
+
 # TODO: 1. Model save options locally, huggingface cloud
 # TODO: 2 Save the results and verify the model is correct
 
@@ -58,7 +67,7 @@ def check_datset(data_dict):
     assert all(i.size[0] <= i.size[1] == max_val for i in data_dict["pil_images"])
 
 
-def generate_dataset(learn_pages, model_dir, model_name, has_labels=True):
+def generate_dataset(learn_pages, model_dir, model_name, has_labels=True, dataset_cache=None):
     class_labels = set()
 
     def get_ner_tags(page):
@@ -92,8 +101,7 @@ def generate_dataset(learn_pages, model_dir, model_name, has_labels=True):
             words,
             boxes=boxes,
             word_labels=word_labels,
-            padding="max_length",
-            truncation=True,
+            **PROCESSOR_KWARGS,
             # return_tensors="pt",
             # return_offsets_mapping=True, # TODO, how to add offsets_mapping to the Features
         )
@@ -105,28 +113,19 @@ def generate_dataset(learn_pages, model_dir, model_name, has_labels=True):
         return encoded_inputs
 
     img_size = (None, MAX_IMAGE_HEIGHT)  # All heights have to be fixed
-    data_dict = {"id": [], "texts": [], "bboxes": [], "ner_tags": [], "pil_images": []}
+    data_dict = {"id": [], "texts": [], "bboxes": [], "ner_tags": []}
     for page in learn_pages:
         data_dict["id"].append(f"{page.doc.pdf_name}-{page.page_idx}")
         data_dict["texts"].append([w.text for w in page.words])
         data_dict["bboxes"].append([get_bbox(page, w) for w in page.words])
         data_dict["ner_tags"].append(get_ner_tags(page))
-        data_dict["pil_images"].append(page.page_image.to_pil_image(img_size).convert("RGB"))
-
-        # data_dict["pil_images"].append(get_wand_array(page.page_image))
-
-    check_datset(data_dict)
 
     ner_tags = data_dict["ner_tags"]
+    sorted_class_labels = sorted(class_labels)
 
     from datasets import Array2D, Array3D, ClassLabel, Dataset, Features, Sequence, Value
     from transformers import LayoutLMv2Processor
 
-    hf_dataset = Dataset.from_dict(mapping=data_dict)
-
-    sorted_class_labels = sorted(class_labels)
-    hf_dataset = hf_dataset.cast_column("ner_tags", Sequence(ClassLabel(names=sorted_class_labels)))
-
     model_path = model_dir / Path(model_name).name
 
     if model_path.exists():
@@ -153,12 +152,43 @@ def generate_dataset(learn_pages, model_dir, model_name, has_labels=True):
             "labels": Sequence(ClassLabel(names=sorted_class_labels)),
         }
     )
-    pt_dataset = hf_dataset.map(
-        preprocess_data,
-        batched=True,
-        remove_columns=hf_dataset.column_names,
-        features=features,
-    )
+
+    def build_dataset():
+        # images are only read when the encoded dataset is not in the cache
+        data_dict["pil_images"] = [
+            p.page_image.to_pil_image(img_size).convert("RGB") for p in learn_pages
+        ]
+        # data_dict["pil_images"].append(get_wand_array(page.page_image))
+
+        check_datset(data_dict)
+        hf_dataset = Dataset.from_dict(mapping=data_dict)
+        hf_dataset = hf_dataset.cast_column(
+            "ner_tags", Sequence(ClassLabel(names=sorted_class_labels))
+        )
+
+        return hf_dataset.map(
+            preprocess_data,
+            batched=True,
+            remove_columns=hf_dataset.column_names,
+            features=features,
+        )
+
+    if dataset_cache is None:
+        pt_dataset = build_dataset()
+    else:
+        image_keys = [hash_file(p.page_image.get_image_path()).hexdigest() for p in learn_pages]
+        examples_key = hash_examples(data_dict, sorted_class_labels, image_keys)
+        tokenizer_key = get_tokenizer_key(processor)
+        preprocess_key = {
+            "version": DATASET_VERSION,
+            "img_size": img_size,
+            "processor_kwargs": PROCESSOR_KWARGS,
+            "features": features.to_dict(),
+        }
+        pt_dataset = dataset_cache.load_or_build(
+            "layoutlmv2", tokenizer_key, examples_key, build_dataset, preprocess_key
+        )
+
     pt_dataset.set_format(type="torch")
     return pt_dataset, sorted_class_labels, ner_tags
 
@@ -181,16 +211,27 @@ def generate_dataset(learn_pages, model_dir, model_name, has_labels=True):
         "model_dir": ".model",
         "orig_model_name": "huggingface:microsoft/layoutlmv2-base-uncased",
         "save_model_name": "huggingface:orgpedia-foundation/cabsec-layoutlmv2",
+        "dataset_cache_dir": ".model/datasets",
     },
 )
 class LearnLayout:
-    def __init__(self, num_folds, max_steps, warmup_ratio, publish_name, conf_stub, model_name):
+    def __init__(
+        self,
+        num_folds,
+        max_steps,
+        warmup_ratio,
+        publish_name,
+        conf_stub,
+        model_name,
+        dataset_cache_dir,
+    ):
         self.num_folds = num_folds
         self.max_steps = max_steps
         self.warmup_ratio = warmup_ratio
         self.publish_name = publish_name
         self.conf_stub = conf_stub
         self.model_name = model_name
+        self.dataset_cache = DatasetCache(dataset_cache_dir)
 
         self.conf_dir = Path("conf")
         self.model_dir = Path(".model")
@@ -234,24 +275,6 @@ class LearnLayout:
             print(f'{label}: {"|".join(r.raw_text() for r in regions)}')
         print("")
 
-    def get_folds(self, num_examples):
-        assert (
-            num_examples >= self.num_folds and self.num_folds >= 1
-        ), f"num_examples: {num_examples} folds: {self.num_folds}"
-        assert isinstance(num_examples, int)
-
-        if self.num_folds == 1:
-            yield list(range(num_examples)), []
-            return
-
-        fold_size = num_examples / self.num_folds
-        fold_idxs = [int(i * fold_size) for i in range(self.num_folds)] + [num_examples]
-
-        for start_idx, end_idx in pairwise(fold_idxs):
-            test_idxs = list(range(start_idx, end_idx))
-            train_idxs = list(range(0, start_idx)) + list(range(end_idx, num_examples))
-            yield train_idxs, test_idxs
-
     def print_results(self, test_idxs, actuals, predictions):
         for page_idx, page_actuals, page_predicts in zip(test_idxs, actuals, predictions):
             page_correct = len([(a, t) for (a, t) in zip(page_actuals, page_predicts)])
@@ -330,12 +353,13 @@ class LearnLayout:
         id2label = {v: k for v, k in enumerate(class_labels)}
         label2id = {k: v for v, k in enumerate(class_labels)}
 
-        for fold_idx, (train_idxs, test_idxs) in enumerate(self.get_folds(len(dataset))):
-            print(f"Test[{fold_idx}]: {test_idxs}")
-            print(f"Train[{fold_idx}]: {train_idxs}")
+        fold_ranges = get_fold_ranges(len(dataset), self.num_folds)
+        for fold_idx, (train_ranges, test_range) in enumerate(fold_ranges):
+            print(f"Test[{fold_idx}]: {test_range}")
+            print(f"Train[{fold_idx}]: {train_ranges}")
 
-            train_dataset = dataset.select(train_idxs)
-            test_dataset = dataset.select(test_idxs)
+            train_dataset = select_ranges(dataset, train_ranges)
+            test_dataset = select_ranges(dataset, test_range)
 
             # Metrics - used in compute_metrics
             metric = load_metric("seqeval")
@@ -361,12 +385,12 @@ class LearnLayout:
                     [id2label[p] for (p, l) in zip(prediction, label) if l != -100]  # noqa E741
                     for prediction, label in zip(predictions, class_labels)
                 ]
-                doc_labels = [ner_tags[idx] for idx in test_idxs]
-                self.print_results(test_idxs, doc_labels, labeled_predictions)
+                doc_labels = [ner_tags[idx] for idx in test_range]
+                self.print_results(test_range, doc_labels, labeled_predictions)
             else:
                 predictions, labels, metrics = trainer.predict(train_dataset)
                 print(metrics)
-                assert not test_idxs
+                assert not test_range
                 trainer.save_model(self.model_dir)
             print(f"DONE fold:{fold_idx}")
 
@@ -382,7 +406,7 @@ class LearnLayout:
         print(f"LEARN PAGES: {len(learn_pages)}")
 
         hf_dataset, class_labels, ner_tags = generate_dataset(
-            learn_pages, self.model_dir, self.model_name
+            learn_pages, self.model_dir, self.model_name, dataset_cache=self.dataset_cache
         )
 
         self.run_cross_validation(hf_dataset, class_labels, ner_tags)
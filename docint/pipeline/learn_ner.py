@@ -1,14 +1,24 @@
 import logging
 from pathlib import Path
 
-from more_itertools import pairwise
-
+from docint.dataset_cache import (
+    DatasetCache,
+    get_fold_ranges,
+    get_tokenizer_key,
+    hash_examples,
+    select_ranges,
+)
 from docint.span import Span
 
 # from more_itertools import pairwise
 from docint.util import get_full_path, get_model_path, load_config
 from docint.vision import Vision
 
+# bump when the preprocessing of the dataset changes, cached datasets are rebuilt
+DATASET_VERSION = 1
+LABEL_ALL_TOKENS = True
+TOKENIZER_KWARGS = {"truncation": True, "is_split_into_words": True}
+
 # TODO: 1. Model save options locally, huggingface cloud
 # TODO: 2 Save the results and verify the model is correct
 
@@ -72,6 +82,7 @@ def get_ner_tags(labels):
         "model_dir": ".model",
         "orig_model_name": "huggingface:distilbert-base-uncased",
         "save_model_name": "orgpedia:orgpedia-foundation/rajpol-dept-ner",
+        "dataset_cache_dir": ".model/datasets",
     },
 )
 class LearnNER:
@@ -85,6 +96,7 @@ class LearnNER:
         model_dir,
         orig_model_name,
         save_model_name,
+        dataset_cache_dir,
     ):
         self.num_folds = num_folds
         self.max_steps = max_steps
@@ -104,6 +116,7 @@ class LearnNER:
         self.tokenizer = AutoTokenizer.from_pretrained(self.ner_model_dir)
 
         self.save_model_dir = get_model_path(self.save_model_name, self.model_dir)
+        self.dataset_cache = DatasetCache(dataset_cache_dir)
 
         print(f"num_folds: {self.num_folds}")
 
@@ -111,24 +124,6 @@ class LearnNER:
         self.lgr.setLevel(logging.INFO)
         self.lgr.addHandler(logging.StreamHandler())
 
-    def get_folds(self, num_examples):
-        assert (
-            num_examples >= self.num_folds and self.num_folds >= 1
-        ), f"num_examples: {num_examples} folds: {self.num_folds}"
-        assert isinstance(num_examples, int)
-
-        if self.num_folds == 1:
-            yield list(range(num_examples)), []
-            return
-
-        fold_size = num_examples / self.num_folds
-        fold_idxs = [int(i * fold_size) for i in range(self.num_folds)] + [num_examples]
-
-        for start_idx, end_idx in pairwise(fold_idxs):
-            test_idxs = list(range(start_idx, end_idx))
-            train_idxs = list(range(0, start_idx)) + list(range(end_idx, num_examples))
-            yield train_idxs, test_idxs
-
     def add_para_spans(self, doc):
         doc_config = load_config(self.conf_dir, doc.pdf_name, self.conf_stub)
 
@@ -153,10 +148,8 @@ class LearnNER:
 
     # https://github.com/huggingface/notebooks/blob/main/examples/token_classification.ipynb
     def tokenize_and_align_labels(self, examples):
-        tokenized_inputs = self.tokenizer(
-            examples["tokens"], truncation=True, is_split_into_words=True
-        )
-        label_all_tokens = True
+        tokenized_inputs = self.tokenizer(examples["tokens"], **TOKENIZER_KWARGS)
+        label_all_tokens = LABEL_ALL_TOKENS
         labels = []
         for i, label in enumerate(examples["ner_tags"]):
             word_ids = tokenized_inputs.word_ids(batch_index=i)
@@ -205,26 +198,40 @@ class LearnNER:
         sorted_class_labels = sorted(class_labels)  # + ["B-LOC", "I-LOC", "B-MISC", "I-MISC"]
         class_labels = sorted_class_labels
 
-        from datasets import ClassLabel, Dataset, Features, Sequence, Value
+        def build_dataset():
+            from datasets import ClassLabel, Dataset, Features, Sequence, Value
 
-        features = Features(
-            {
-                "id": Value("string"),
-                "tokens": Sequence(Value("string")),
-                "ner_tags": Sequence(ClassLabel(names=class_labels)),
-            }
-        )
-
-        # dataset = Dataset.from_dict(mapping=data_dict, features)
-        dataset = Dataset.from_dict(data_dict, features)
+            features = Features(
+                {
+                    "id": Value("string"),
+                    "tokens": Sequence(Value("string")),
+                    "ner_tags": Sequence(ClassLabel(names=class_labels)),
+                }
+            )
 
-        print(sorted_class_labels)
-        # dataset = dataset.cast_column("ner_tags", Sequence(ClassLabel(names=sorted_class_labels)))
+            # dataset = Dataset.from_dict(mapping=data_dict, features)
+            dataset = Dataset.from_dict(data_dict, features)
 
-        print("DATASET GENERATED")
+            print(sorted_class_labels)
+            # dataset = dataset.cast_column("ner_tags", Sequence(ClassLabel(names=sorted_class_labels)))
 
-        tokenized_dataset = dataset.map(self.tokenize_and_align_labels, batched=True)
+            print("DATASET GENERATED")
+            return dataset.map(self.tokenize_and_align_labels, batched=True)
 
+        # tokenized examples are cached on disk, keyed by tokenizer, content and
+        # the preprocessing settings, the features are covered by DATASET_VERSION
+        preprocess_key = {
+            "version": DATASET_VERSION,
+            "label_all_tokens": LABEL_ALL_TOKENS,
+            "tokenizer_kwargs": TOKENIZER_KWARGS,
+        }
+        tokenized_dataset = self.dataset_cache.load_or_build(
+            "ner",
+            get_tokenizer_key(self.tokenizer),
+            hash_examples(data_dict, class_labels),
+            build_dataset,
+            preprocess_key,
+        )
         return tokenized_dataset, sorted_class_labels
 
     def run_cross_validation(self, dataset, class_labels):
@@ -295,12 +302,13 @@ class LearnNER:
         )
 
         data_collator = DataCollatorForTokenClassification(self.tokenizer)
-        for fold_idx, (train_idxs, test_idxs) in enumerate(self.get_folds(len(dataset))):
-            print(f"Test[{fold_idx}]: {test_idxs}")
-            print(f"Train[{fold_idx}]: {train_idxs}")
+        fold_ranges = get_fold_ranges(len(dataset), self.num_folds)
+        for fold_idx, (train_ranges, test_range) in enumerate(fold_ranges):
+            print(f"Test[{fold_idx}]: {test_range}")
+            print(f"Train[{fold_idx}]: {train_ranges}")
 
-            train_dataset = dataset.select(train_idxs)
-            test_dataset = dataset.select(test_idxs)
+            train_dataset = select_ranges(dataset, train_ranges)
+            test_dataset = select_ranges(dataset, test_range)
 
             metric = load_metric("seqeval")
 
@@ -330,7 +338,7 @@ class LearnNER:
             else:
                 predictions, labels, metrics = trainer.predict(train_dataset)
                 print(metrics)
-                assert not test_idxs
+                assert not test_range
                 trainer.save_model(self.save_model_dir)
             print(f"DONE fold:{fold_idx}")
 
@@ -3,11 +3,12 @@ import logging
 import sys
 from pathlib import Path
 
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..page import Page
 from ..region import Region
 from ..util import load_config
 from ..vision import Vision
-from ..word_line import words_in_lines, words_in_lines_short
+from ..word_line import words_in_lines, words_in_lines_short, words_in_lines_sweep
 
 
 @Vision.factory(
@@ -26,6 +27,7 @@ from ..word_line import words_in_lines, words_in_lines_short
         "keep_empty_lines": False,
         "output_dir": "output",
         "quick": False,
+        "line_engine": "lineword",
     },
 )
 class LineFinder:
@@ -39,6 +41,7 @@ class LineFinder:
         keep_empty_lines,
         output_dir,
         quick,
+        line_engine,
     ):
         self.doc_confdir = doc_confdir
         self.pre_edit = pre_edit
@@ -48,28 +51,25 @@ class LineFinder:
         self.keep_empty_lines = keep_empty_lines
         self.output_dir = Path(output_dir)
         self.quick = quick
+        self.line_engine = line_engine
 
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
+        if self.line_engine not in ("lineword", "sweep"):
+            raise ValueError(f"Unknown line_engine: {self.line_engine}")
 
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-        self.file_handler = None
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
+        add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
         # self.lgr.info(f"adding handler {log_path}")
 
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
-
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
+
+    def words_in_lines(self, region, **kwargs):
+        if self.line_engine == "sweep":
+            return words_in_lines_sweep(region, **kwargs)
+        else:
+            return words_in_lines(region, **kwargs)
 
     def get_word_lines(self, page, angle, newline_height_multiple):
         if not page.words:
@@ -80,7 +80,7 @@ class LineFinder:
         # )
         if angle:
             rota_page = Page.build_rotated(page, angle)
-            word_lines = words_in_lines(
+            word_lines = self.words_in_lines(
                 rota_page, newline_height_multiple=newline_height_multiple, is_page=True
             )
             page_word_lines = [[page.words[w.word_idx] for w in wl] for wl in word_lines]
@@ -94,7 +94,7 @@ class LineFinder:
                     page.words, newline_height_multiple=newline_height_multiple
                 )
             else:
-                return words_in_lines(page, newline_height_multiple=newline_height_multiple)
+                return self.words_in_lines(page, newline_height_multiple=newline_height_multiple)
 
     def load_config(self, doc):
         doc_config = load_config(self.doc_confdir, doc.pdf_name, self.conf_stub)
@@ -4,6 +4,7 @@ import sys
 from pathlib import Path
 from typing import List, Union
 
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..para import Para
 from ..util import load_config
 from ..vision import Vision
@@ -108,27 +109,14 @@ class ListFinder2:
         self.footer_height_multiple = footer_height_multiple
         self.conf_stub = conf_stub
 
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
-
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-        self.file_handler = None
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
+        log_path = add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
         self.lgr.info(f"adding handler {log_path}")
 
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
-
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def remove_footer(self, word_lines):
         def to_str(word_lines):
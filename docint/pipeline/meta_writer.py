@@ -6,6 +6,7 @@ from pathlib import Path
 
 from pydantic import BaseModel
 
+from docint.log_service import add_doc_log, get_logger, remove_doc_log
 from docint.vision import Vision
 
 # b /Users/mukund/Software/docInt/docint/pipeline/id_assigner.py:34
@@ -49,26 +50,14 @@ class MetaWriter:
         self.meta_dict = json.loads(self.meta_file.read_text())
         self.conf_stub = "metawriter"
 
-        self.lgr = logging.getLogger(__name__)
-        self.lgr.setLevel(logging.DEBUG)
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(stream_handler)
-        self.file_handler = None
+        self.lgr = get_logger(__name__, console_level=logging.DEBUG)
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
+        log_path = add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
         self.lgr.info(f"adding handler {log_path}")
 
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
-
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def __call__(self, doc):
         self.add_log_handler(doc)
@@ -3,6 +3,7 @@ import statistics
 import sys
 from pathlib import Path
 
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..page import Page
 from ..util import load_config
 from ..vision import Vision
@@ -66,27 +67,14 @@ class NonumberListFinder:
         self.rotation_config = rotation_config
         self.conf_stub = conf_stub
 
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
-
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-        self.file_handler = None
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
+        log_path = add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
         self.lgr.info(f"adding handler {log_path}")
 
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
-
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def remove_footer(self, word_lines):
         def to_str(word_lines):
@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Union
 
 from ..data_error import DataError
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..region import Region
 from ..shape import Box, Coord
 from ..util import load_config
@@ -152,14 +153,7 @@ class FindNumMarker:
 
         self.valid_num_types = self.get_valid_types()
 
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
-
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-
-        self.file_handler = None
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
         self.info_dict = {}
 
     def get_valid_types(self):
@@ -173,16 +167,10 @@ class FindNumMarker:
         return num_types
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
+        add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
 
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def build_roman_dict(self):
         rS = (
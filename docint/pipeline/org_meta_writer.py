@@ -7,7 +7,7 @@ from pydantic import BaseModel
 
 from docint.org_meta import OrgMeta
 from docint.pdfwrapper import open as pdf_open
-from docint.unicode_utils import get_script
+from docint.unicode_utils import script_histogram
 from docint.vision import Vision
 
 
@@ -71,7 +71,7 @@ def is_multi_order(doc, page_languages):
 def get_language(doc):
     languages = []
     for page in doc.pages:
-        counter = Counter(get_script(c) for w in page.words for c in w.text)
+        counter = script_histogram("".join(w.text for w in page.words))
         languages.append(max(counter, key=counter.get, default="Basic Latin"))
     language = languages[0] if len(set(languages)) == 1 else "mixed"
     return language, languages
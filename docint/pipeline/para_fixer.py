@@ -5,9 +5,10 @@ import sys
 from pathlib import Path
 
 from ..data_error import DataError
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..para import TextConfig
 from ..span import Span
-from ..util import get_full_path, get_model_path, load_config
+from ..util import get_full_path, get_shared_model, load_config, load_ner_pipeline
 from ..vision import Vision
 from ..vocab import Vocab
 
@@ -35,6 +36,7 @@ class OfficerMultipleError(DataError):
         "unicode_file": "conf/unicode.txt",
         "model_dir": "/import/models",
         "ner_model_name": "huggingface:dslim/bert-base-NER",
+        "ner_batch_size": 32,
         "officer_at_start": True,
     },
 )
@@ -51,6 +53,7 @@ class ParaFixer:
         unicode_file,
         model_dir,
         ner_model_name,
+        ner_batch_size,
         officer_at_start,
     ):
         ignore_puncts = string.punctuation
@@ -65,6 +68,7 @@ class ParaFixer:
         self.unicode_file = unicode_file
         self.model_dir = get_full_path(model_dir)
         self.ner_model_name = ner_model_name
+        self.ner_batch_size = ner_batch_size
         self.officer_at_start = officer_at_start
 
         self.vocab = Vocab(self.dict_file.read_text().split("\n"))
@@ -91,44 +95,26 @@ class ParaFixer:
         ]
         self.unicode_dict = dict((u, a if a != "<ignore>" else "") for u, a in u_lines)
 
-        # TODO PLEASE MOVE THIS TO OPTIONS
-        from transformers import AutoModelForTokenClassification, AutoTokenizer, pipeline
-
-        # tokenizer = AutoTokenizer.from_pretrained("/Users/mukund/Github/huggingface/bert-base-NER")
-        # model = AutoModelForTokenClassification.from_pretrained("/Users/mukund/Github/huggingface/bert-base-NER")
-
-        ner_model_dir = get_model_path(self.ner_model_name, self.model_dir)
-        tokenizer = AutoTokenizer.from_pretrained(ner_model_dir)
-        model = AutoModelForTokenClassification.from_pretrained(ner_model_dir)
-
-        self.nlp = pipeline("ner", model=model, tokenizer=tokenizer)
-        # self.nlp = pipeline("ner")
+        self._nlp = None  # loaded lazily and shared across instances
 
         self.test_doc = True
 
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
 
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-        self.file_handler = None
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self._nlp = get_shared_model(self.ner_model_name, self.model_dir, load_ner_pipeline)
+        return self._nlp
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
+        log_path = add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
         self.lgr.info(f"adding handler {log_path}")
 
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
-
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
-    def mark_names(self, list_item):
+    def mark_names(self, list_item, ner_results=None):
         def expand_span(s):
             last_char = line_text[s.end].strip(string.punctuation).strip()
             if last_char:
@@ -147,7 +133,8 @@ class ParaFixer:
         ignore_config = TextConfig(rm_labels=["ignore"], rm_nl=True)
         line_text = list_item.line_text(ignore_config)
 
-        ner_results = self.nlp(line_text)
+        if ner_results is None:
+            ner_results = self.nlp(line_text)
 
         officer_spans = [to_span(r) for r in ner_results if r["entity"].endswith("-PER")]
         officer_spans = Span.accumulate(officer_spans, text=line_text, ignore_chars=" .,")
@@ -238,7 +225,7 @@ class ParaFixer:
                 else:
                     sys.stderr.write(f"NOTFOUND: {u_text}\n")
 
-    def fix_list(self, list_item):
+    def prepare_list(self, list_item):
         print(f">{list_item.text}<")
         print("Blocking Paren")
         paren_count = self.blank_paren_words(list_item)  # noqa: F841
@@ -246,8 +233,20 @@ class ParaFixer:
         print("Marking Unicode")
         unicode_count = self.fix_unicode(list_item)  # noqa: F841
 
+    def find_names(self, list_items):
+        """Run NER on all the list_items in batches, instead of one at a time."""
+        ignore_config = TextConfig(rm_labels=["ignore"], rm_nl=True)
+        line_texts = [list_item.line_text(ignore_config) for list_item in list_items]
+        if not line_texts:
+            return []
+        return self.nlp(line_texts, batch_size=self.ner_batch_size)
+
+    def fix_list(self, list_item, ner_results=None):
+        if ner_results is None:
+            self.prepare_list(list_item)
+
         print("Marking Names")
-        name_count = self.mark_names(list_item)  # noqa: F841
+        name_count = self.mark_names(list_item, ner_results)  # noqa: F841
 
         print("Merging Words")
         text_config = TextConfig(rm_labels=["ignore", "person"])
@@ -306,6 +305,14 @@ class ParaFixer:
                 print(f"Edited document: {doc.pdf_name}")
                 doc.edit(edits)
 
+        # names are marked after paren words are blanked, prepare all the list_items
+        # of the doc first, so that NER runs in batches across pages.
+        all_items = [i for page in doc.pages for i in getattr(page, self.item_name, [])]
+        for list_item in all_items:
+            list_item.t = None
+            self.prepare_list(list_item)
+        all_ner_results = iter(self.find_names(all_items))
+
         NL = "\n"
         for page_idx, page in enumerate(doc.pages):
             # access what to fix through path
@@ -313,11 +320,10 @@ class ParaFixer:
             for list_idx, list_item in enumerate(items):
                 item_path = f"pa{page.page_idx}.{self.item_name[:2]}{list_idx}"  # noqa
                 indent_str = f"{doc.pdf_name}:{page_idx}>{list_idx}"  # noqa: F841
-                list_item.t = None
 
                 self.lgr.debug(f'\n***{list_item.line_text().replace(NL, " ")}<')
 
-                self.fix_list(list_item)
+                self.fix_list(list_item, next(all_ner_results))
                 list_item_errors = []  # self.test(list_item, item_path)  # noqa: F841
 
                 # list_item.errors += list_item_errors
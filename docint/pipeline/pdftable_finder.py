@@ -6,6 +6,7 @@ from pathlib import Path
 from pydantic.json import pydantic_encoder
 
 from ..data_error import DataError
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..region import Region
 from ..shape import Box, Coord, Edge
 from ..table import Cell, Row, Table, TableEdges
@@ -66,27 +67,14 @@ class PDFTableFinder:
         self.output_dir = Path(output_dir)
         self.skip_completely = skip_completely
 
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
-
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-        self.file_handler = None
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
+        add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
         # self.lgr.info(f"adding handler {log_path}")
 
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
-
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def words_inxyrange(self, words, box, overlap_percent=70):
         words = [w for w in words if w.box.overlaps(box, overlap_percent)]
@@ -5,6 +5,7 @@ from collections import Counter
 from pathlib import Path
 from statistics import mean
 
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..shape import Poly
 from ..vision import Vision
 
@@ -24,24 +25,13 @@ class RotationDetector:
         self.min_num_markers = min_num_markers
         self.conf_stub = conf_stub
 
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-        self.file_handler = None
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
+        add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
 
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def get_num_markers_angle(self, page):
         num_markers = getattr(page, "num_markers", [])
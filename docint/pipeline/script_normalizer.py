@@ -1,11 +1,13 @@
 import logging
 import string
 import sys
+from collections import defaultdict
 from pathlib import Path
 
 import yaml
 
 from ..data_error import DataError
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..unicode_utils import get_script, scripts
 from ..vision import Vision
 
@@ -47,55 +49,54 @@ class ScriptNormalizer:
             yaml_str = Path(script_mapping).read_text()
             self.script_mapping = yaml.load(yaml_str, Loader=yaml.FullLoader)
 
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-        self.file_handler = None
+        # single characters are translated inside words, longer texts replace the word
+        char_mapping = {k: v for (k, v) in self.script_mapping.items() if len(k) == 1}
+        self.char_table = str.maketrans(char_mapping)
+        self.punct_chars = frozenset(string.punctuation)
+
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
+        add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
 
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def is_script(self, text):
         if self.script == "ascii":
             return text.isascii()
 
-        script_found = None
-        for ch in text:
-            if ch in string.punctuation:
-                continue
+        text_scripts = set(get_script(ch) for ch in set(text) - self.punct_chars)
+        return len(text_scripts) <= 1
+
+    def normalize_text(self, text):
+        """Return the text the word should be replaced with, text if it is
+        already in the script and None if it can't be normalized."""
+        if self.is_script(text):
+            return text
+
+        script_text = self.script_mapping.get(text, None)
+        if script_text is not None:
+            return script_text
 
-            ch_script = get_script(ch)
-            if script_found and ch_script == script_found:
-                continue
-            elif not script_found:
-                script_found = ch_script
-            else:
-                return False
-        return True
+        script_text = text.translate(self.char_table)
+        return script_text if self.is_script(script_text) else None
 
     def __call__(self, doc):
         print(f"script_normalizer: {doc.pdf_name}")
 
-        # TODO allow replacement of single character as well
-        errors = []
+        # each distinct text is normalized once, and its words are rewritten together
+        text_words = defaultdict(list)
         for word in (w for p in doc.pages for w in p.words):
-            if not self.is_script(word.text):
-                script_text = self.script_mapping.get(word.text, None)
-                if script_text is None:
-                    errors.append(MismatchedScriptError.build(doc, word.text, word.path))
-                else:
-                    word.replaceStr("<all>", script_text)
+            text_words[word.text].append(word)
+
+        errors = []
+        for text, words in text_words.items():
+            script_text = self.normalize_text(text)
+            if script_text is None:
+                errors.extend(MismatchedScriptError.build(doc, text, w.path) for w in words)
+            elif script_text != text:
+                [w.replaceStr("<all>", script_text) for w in words]
 
         print(f"== Errors Found: {len(errors)}")
         return doc
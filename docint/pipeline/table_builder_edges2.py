@@ -10,6 +10,7 @@ from more_itertools import pairwise, partition
 from pydantic.json import pydantic_encoder
 
 from ..data_error import DataError
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..shape import Box, Coord, Edge
 from ..table import (
     Cell,
@@ -37,6 +38,131 @@ def build_polygon(coords, page, sort_coords=True):
     # return Polygon(img_coords)
 
 
+def to_img_coords(coords, page):
+    return {(int(c.x * page.width), int(c.y * page.height)) for c in coords}
+
+
+def build_img_rect(coords, page):
+    """Return (x0, y0, x1, y1) if the convex hull of coords in image coordinates
+    is an axis aligned rectangle (or a line or a point), else None."""
+    img_coords = to_img_coords(coords, page)
+    xs, ys = sorted({x for (x, _) in img_coords}), sorted({y for (_, y) in img_coords})
+    if len(xs) > 2 or len(ys) > 2:
+        return None
+
+    (x0, x1), (y0, y1) = (xs[0], xs[-1]), (ys[0], ys[-1])
+    if img_coords != {(x0, y0), (x1, y0), (x0, y1), (x1, y1)}:
+        return None
+    return (x0, y0, x1, y1)
+
+
+def build_img_word(coords, page):
+    """Return (is_area, (x0, y0, x1, y1)) for a word whose convex hull in image
+    coordinates is an axis aligned rectangle with an area, or a line segment
+    from (x0, y0) to (x1, y1), boxes have two coords and are segments."""
+    img_coords = sorted(to_img_coords(coords, page))
+    if len(img_coords) <= 2:
+        (x0, y0), (x1, y1) = img_coords[0], img_coords[-1]
+        return (False, (x0, y0, x1, y1))
+
+    rect = build_img_rect(coords, page)
+    if rect is None:
+        return None
+
+    (x0, y0, x1, y1) = rect
+    return ((x0 != x1 and y0 != y1), rect)
+
+
+class ImageRects:
+    """Row and cell membership of table words, when rows and cells are axis
+    aligned rectangles in image coordinates. Gives the same results as
+    in_polygon with shapely, but is computed for all words at once."""
+
+    def __init__(self, word_idxs, in_rows, in_cells):
+        self.word_pos = {word_idx: pos for (pos, word_idx) in enumerate(word_idxs)}
+        self.in_rows = in_rows
+        self.in_cells = in_cells
+
+    @staticmethod
+    def in_rects(is_areas, word_coords, rects):
+        """Return a [num_words x num_rects] bool array, true if more than half of
+        the word's area (or length for words that are lines) is inside rect."""
+        import numpy as np
+
+        is_areas = is_areas[:, None]
+        wx0, wy0, wx1, wy1 = (word_coords[:, idx, None] for idx in range(4))
+        rx0, ry0, rx1, ry1 = (rects[None, :, idx] for idx in range(4))
+
+        # area words, more than half of the area is inside
+        ix = np.minimum(wx1, rx1) - np.maximum(wx0, rx0)
+        iy = np.minimum(wy1, ry1) - np.maximum(wy0, ry0)
+        in_area = ix.clip(0) * iy.clip(0) * 2 > (wx1 - wx0) * (wy1 - wy0)
+
+        # line words, more than half of the segment (0 <= t <= 1) is inside
+        def t_range(w0, w1, r0, r1):
+            d = (w1 - w0).astype(float)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t0, t1 = (r0 - w0) / d, (r1 - w0) / d
+            inside = (r0 <= w0) & (w0 <= r1)  # when the segment is parallel
+            t_lo = np.where(d == 0, np.where(inside, -np.inf, np.inf), np.minimum(t0, t1))
+            t_hi = np.where(d == 0, np.where(inside, np.inf, -np.inf), np.maximum(t0, t1))
+            return t_lo, t_hi
+
+        (tx_lo, tx_hi), (ty_lo, ty_hi) = t_range(wx0, wx1, rx0, rx1), t_range(wy0, wy1, ry0, ry1)
+        t_lo = np.maximum(np.maximum(tx_lo, ty_lo), 0.0)
+        t_hi = np.minimum(np.minimum(tx_hi, ty_hi), 1.0)
+
+        # points are always inside
+        is_point = (wx0 == wx1) & (wy0 == wy1)
+        in_line = is_point | ((t_hi - t_lo) > 0.5)
+        return np.where(is_areas, in_area, in_line)
+
+    @classmethod
+    def build(cls, page, words, row_edges, col_edges):
+        import numpy as np
+
+        row_rects = [
+            build_img_rect(r1.coords + r2.coords, page) for (r1, r2) in pairwise(row_edges)
+        ]
+        if None in row_rects:
+            return None  # skewed edges, use polygons
+
+        cell_rects = []
+        for row1, row2 in pairwise(row_edges):
+            for col1, col2 in pairwise(col_edges):
+                cell_coords = [
+                    row1.cross(col1),
+                    row1.cross(col2),
+                    row2.cross(col1),
+                    row2.cross(col2),
+                ]
+                cell_rects.append(build_img_rect(cell_coords, page))
+        if None in cell_rects:
+            return None
+
+        img_words = [build_img_word(w.shape.coords, page) for w in words]
+        if None in img_words:
+            return None  # skewed words
+
+        is_areas = np.array([is_area for (is_area, _) in img_words], dtype=bool)
+        word_coords = np.array([c for (_, c) in img_words], dtype=np.int64).reshape(-1, 4)
+
+        def to_array(rects):
+            return np.array(rects, dtype=np.int64).reshape(-1, 4)
+
+        num_rows, num_cols = len(row_edges) - 1, max(len(col_edges) - 1, 0)
+        in_rows = cls.in_rects(is_areas, word_coords, to_array(row_rects))
+        in_cells = cls.in_rects(is_areas, word_coords, to_array(cell_rects))
+        in_cells = in_cells.reshape(len(words), num_rows, num_cols)
+        return ImageRects([w.word_idx for w in words], in_rows, in_cells)
+
+    def in_row(self, word, row_idx):
+        return bool(self.in_rows[self.word_pos[word.word_idx], row_idx])
+
+    def in_cell(self, word, row_idx, col_idx):
+        return bool(self.in_cells[self.word_pos[word.word_idx], row_idx, col_idx])
+
+
 @Vision.factory(
     "table_builder_on_edges2",
     default_config={
@@ -46,6 +172,7 @@ def build_polygon(coords, page, sort_coords=True):
         "heading_offset": 0,
         "add_top_row": True,
         "add_bot_row": True,
+        "cell_assignment": "rects",
     },
 )
 class TableBuilderOnEdges2:
@@ -57,6 +184,7 @@ class TableBuilderOnEdges2:
         heading_offset,
         add_top_row,
         add_bot_row,
+        cell_assignment,
     ):
         self.doc_confdir = doc_confdir
         self.conf_stub = conf_stub
@@ -65,29 +193,20 @@ class TableBuilderOnEdges2:
         self.heading_offset = heading_offset
         self.add_top_row = add_top_row
         self.add_bot_row = add_bot_row
+        self.cell_assignment = cell_assignment
 
-        self.punc_tbl = str.maketrans(string.punctuation, " " * len(string.punctuation))
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
+        if self.cell_assignment not in ("rects", "polygons"):
+            raise ValueError(f"Unknown cell_assignment: {self.cell_assignment}")
 
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-        self.file_handler = None
+        self.punc_tbl = str.maketrans(string.punctuation, " " * len(string.punctuation))
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
+        log_path = add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
         self.lgr.info(f"adding handler {log_path}")
 
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
-
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def test(self, page_idx, table_idx, table):
         def get_num(text):
@@ -177,9 +296,9 @@ class TableBuilderOnEdges2:
     #     return row, remain_words
 
     def build_table(self, page, table_edges, table_idx):
-        from shapely.geometry import MultiPoint, Polygon
-
         def in_polygon(word, polygon):
+            from shapely.geometry import Polygon
+
             w_polygon = build_polygon(word.shape.coords, word.page)
             # print(polygon, polygon.is_valid)
             # print(w_polygon, w_polygon.is_valid)
@@ -243,11 +362,17 @@ class TableBuilderOnEdges2:
         ymin, ymax = row_edges[0].ymin, row_edges[-1].ymax
         table_words = page.words_in_yrange((ymin, ymax), partial=True)
 
+        img_rects = None
+        if self.cell_assignment == "rects":
+            img_rects = ImageRects.build(page, table_words, row_edges, table_edges.col_edges)
+
         remain_table_words, body_rows, header_rows, page_idx = table_words, [], [], page.page_idx
         for row_idx, (row1, row2) in enumerate(pairwise(row_edges)):
-            row_polygon = build_polygon(row1.coords + row2.coords, page, sort_coords=True)
-
-            in_row_polygon = functools.partial(in_polygon, polygon=row_polygon)
+            if img_rects:
+                in_row_polygon = functools.partial(img_rects.in_row, row_idx=row_idx)
+            else:
+                row_polygon = build_polygon(row1.coords + row2.coords, page, sort_coords=True)
+                in_row_polygon = functools.partial(in_polygon, polygon=row_polygon)
 
             remain_table_words, row_words = partition(in_row_polygon, remain_table_words)
             remain_table_words, row_words = list(remain_table_words), list(row_words)
@@ -259,13 +384,17 @@ class TableBuilderOnEdges2:
                 # if table_idx == 0 and row_idx == 3 and col_idx == 3:
                 #     print('Found It')
 
-                top_lt, top_rt = row1.cross(col1), row1.cross(col2)
-                bot_lt, bot_rt = row2.cross(col1), row2.cross(col2)
+                if img_rects:
+                    in_col_polygon = functools.partial(
+                        img_rects.in_cell, row_idx=row_idx, col_idx=col_idx
+                    )
+                else:
+                    top_lt, top_rt = row1.cross(col1), row1.cross(col2)
+                    bot_lt, bot_rt = row2.cross(col1), row2.cross(col2)
 
-                cell_polygon = build_polygon([top_lt, top_rt, bot_lt, bot_rt], page)
-                # print(len(remain_row_words))
+                    cell_polygon = build_polygon([top_lt, top_rt, bot_lt, bot_rt], page)
+                    in_col_polygon = functools.partial(in_polygon, polygon=cell_polygon)
 
-                in_col_polygon = functools.partial(in_polygon, polygon=cell_polygon)
                 remain_row_words, cell_words = partition(in_col_polygon, remain_row_words)
                 remain_row_words, cell_words = list(remain_row_words), list(cell_words)
 
@@ -402,8 +531,6 @@ class TableBuilderOnEdges2:
         return tables
 
     def __call__(self, doc):
-        from shapely.geometry import MultiPoint, Polygon
-
         self.add_log_handler(doc)
         self.lgr.info(f"table_builder_on_edges: {doc.pdf_name}")
 
@@ -4,6 +4,7 @@ from itertools import chain, groupby
 from operator import attrgetter, itemgetter
 from pathlib import Path
 
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..region import Region
 
 # from ..table import Table, Row, Cell
@@ -34,27 +35,14 @@ class TableBuilderOnWords:
         self.edge_min_length = 0.2
         self.word_threshold = 3
 
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
-
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-        self.file_handler = None
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
+        log_path = add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
         self.lgr.info(f"adding handler {log_path}")
 
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
-
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def cluster_words(self, words, attr, tolerance):
         cluster_attr = attrgetter(attr)
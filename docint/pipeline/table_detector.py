@@ -1,12 +1,15 @@
 import json
 import logging
 import sys
+import time
 from pathlib import Path
 
 from pydantic.json import pydantic_encoder
 
+from ..log_service import add_doc_log, get_logger, remove_doc_log
+from ..object_detector import load_table_detector
 from ..shape import Box, Shape
-from ..util import get_full_path, get_model_path
+from ..util import get_full_path, get_shared_model
 from ..vision import Vision
 
 
@@ -16,47 +19,40 @@ from ..vision import Vision
         "model_name": "huggingface:TahaDouaji/detr-doc-table-detection",
         "model_dir": "/import/models",
         "output_dir": "output",
+        "batch_size": 4,
+        "runtime": "torch",
     },
 )
 class TableDetector:
-    def __init__(self, model_name, model_dir, output_dir):
+    def __init__(self, model_name, model_dir, output_dir, batch_size, runtime):
         self.model_dir = get_full_path(model_dir)
         self.model_name = model_name
         self.output_dir = Path(output_dir)
+        self.batch_size = batch_size
+        self.runtime = runtime
         self.conf_stub = "tabledetector"
+        self._detector = None
 
-        from transformers import DetrForObjectDetection, DetrImageProcessor
-
-        table_model_dir = get_model_path(self.model_name, self.model_dir)
-        self.processor = DetrImageProcessor.from_pretrained(table_model_dir)
-        self.model = DetrForObjectDetection.from_pretrained(table_model_dir)
-
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
-
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-
-        self.file_handler = None
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
         self.info_dict = {}
 
+    @property
+    def detector(self):
+        if self._detector is None:
+            self._detector = get_shared_model(
+                self.model_name, self.model_dir, load_table_detector, runtime=self.runtime
+            )
+        return self._detector
+
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
+        add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
 
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def __call__(self, doc):
         self.add_log_handler(doc)
         self.lgr.info(f"table_detector: {doc.pdf_name}")
-        import torch
 
         doc.add_extra_page_field("table_boxes", ("list", "docint.shape", "Box"))
         doc.add_extra_page_field("table_boxes_confidence", ("noparse", "", ""))
@@ -72,26 +68,19 @@ class TableDetector:
             return doc
 
         print(f"Number of pages: {len(doc.pages)}")
-        table_infos = []
+        start = time.perf_counter()
         for page in doc.pages:
-            image = page.page_image.to_pil_image()
-            image = image.convert("RGB")
+            page.table_boxes, page.table_boxes_confidence = [], []
 
-            (width, height) = image.size
-            print(f"page_image size: {width}, {height}")
-
-            inputs = self.processor(images=image, return_tensors="pt")
-            outputs = self.model(**inputs)
+        # skip the pages that table_page_filter ruled out
+        pages = [p for p in doc.pages if getattr(p, "table_candidate", True)]
+        images = (page.page_image.to_pil_image() for page in pages)
 
-            # convert outputs (bounding boxes and class logits) to COCO API
-            # let's only keep detections with score > 0.9
-            target_sizes = torch.tensor([image.size[::-1]])
-            results = self.processor.post_process_object_detection(
-                outputs, target_sizes=target_sizes, threshold=0.9
-            )[0]
+        # let's only keep detections with score > 0.9
+        image_results = self.detector.detect(images, threshold=0.9, batch_size=self.batch_size)
+        for page, ((width, height), results) in zip(pages, image_results):
+            print(f"page_image size: {width}, {height}")
 
-            page.table_boxes = []
-            page.table_boxes_confidence = []
             for score, label, box in zip(results["scores"], results["labels"], results["boxes"]):
                 box = [round(i, 2) for i in box.tolist()]
                 coord_box = Shape.build_box(
@@ -101,17 +90,18 @@ class TableDetector:
                 page.table_boxes_confidence.append(score.item())
 
                 print(
-                    f"Page: [{page.page_idx}] Detected *{self.model.config.id2label[label.item()]}* confidence "
+                    f"Page: [{page.page_idx}] Detected *{self.detector.id2label[label.item()]}* confidence "
                     f"{round(score.item(), 3)} at location {box}"
                 )
-            table_infos.append(
-                {
-                    "table_boxes": page.table_boxes,
-                    "table_boxes_confidence": page.table_boxes_confidence,
-                }
-            )
 
+        table_infos = [
+            {"table_boxes": p.table_boxes, "table_boxes_confidence": p.table_boxes_confidence}
+            for p in doc.pages
+        ]
         json_path.write_text(json.dumps({"table_box_infos": table_infos}, default=pydantic_encoder))
 
+        pages_per_sec = len(pages) / (time.perf_counter() - start)
+        self.lgr.info(f"table_detector: {len(pages)} pages {pages_per_sec:.2f} pages/sec")
+
         self.remove_log_handler(doc)
         return doc
@@ -12,6 +12,7 @@ from more_itertools import pairwise
 from PIL import Image
 
 from ..data_error import DataError
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..page import Page
 from ..page_image import ImageContext
 from ..shape import Coord, Edge
@@ -76,27 +77,14 @@ class TableEdgeFinder:
         self.crop_gutter = 0.05
         self.prev_row_ht = None
 
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
-
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(stream_handler)
-        self.file_handler = None
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}", console_level=logging.DEBUG)
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
+        log_path = add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
         self.lgr.info(f"adding handler {log_path}")
 
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
-
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def get_image_path(self, page):
         # TODO this should be moved to page_image
@@ -340,6 +328,10 @@ class TableEdgeFinder:
         if not page.num_markers:
             return []
 
+        # skip the image processing on pages that table_page_filter ruled out
+        if not getattr(page, "table_candidate", True):
+            return []
+
         table_edges_list = []
         table_markers_list = split_markers_in_tables(page.num_markers)
         for row_markers in table_markers_list:
@@ -3,6 +3,7 @@ import sys
 from itertools import groupby
 from pathlib import Path
 
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..region import Region
 from ..table import Cell, Row, Table
 from ..util import load_config, read_config_from_disk
@@ -43,31 +44,18 @@ class TableFinder:
         self.x_range_slice = self.compute_x_range_slice(self.x_range, self.num_slots)
         self.unicode_dict = read_config_from_disk(self.unicode_file)
 
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
-
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-        self.file_handler = None
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
 
     def compute_x_range_slice(self, x_range, num_slots):
         s, e = int(x_range[0] * self.num_slots), int(x_range[1] * self.num_slots)
         return slice(s, e)
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
+        log_path = add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
         self.lgr.info(f"adding handler {log_path}")
 
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
-
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def find_cell_boundary(self, list_item, path):
         def fill_slots(slots, word):
@@ -0,0 +1,210 @@
+import json
+import logging
+import statistics
+import sys
+from collections import Counter
+from pathlib import Path
+
+from ..log_service import add_doc_log, get_logger, remove_doc_log
+from ..util import load_config
+from ..vision import Vision
+
+
+def build_rows(words, median_height):
+    """Group words in rows, words whose ymid is within half a word height of
+    the first word of the row belong to the same row."""
+    words = sorted(words, key=lambda w: w.box.ymid)
+    rows, row = [], [words[0]]
+    for word in words[1:]:
+        if word.box.ymid - row[0].box.ymid <= median_height * 0.5:
+            row.append(word)
+        else:
+            rows.append(row)
+            row = [word]
+    rows.append(row)
+    return rows
+
+
+def build_segments(row, min_gap):
+    """Split row into segments of words, separated by gaps wider than min_gap,
+    returns (xmin, xmax) of each segment."""
+    row = sorted(row, key=lambda w: w.box.xmin)
+    segments = [[row[0]]]
+    for prev_word, word in zip(row, row[1:]):
+        if word.box.xmin - prev_word.box.xmax > min_gap:
+            segments.append([word])
+        else:
+            segments[-1].append(word)
+    return [(s[0].box.xmin, s[-1].box.xmax) for s in segments]
+
+
+@Vision.factory(
+    "table_page_filter",
+    default_config={
+        "doc_confdir": "conf",
+        "conf_stub": "tablepagefilter",
+        "output_dir": "output",
+        "min_table_rows": 3,
+        "min_table_columns": 3,
+        "min_row_regularity": 0.25,
+        "column_tolerance": 0.01,
+        "gap_char_multiple": 3.0,
+        "use_ruling_lines": True,
+        "min_ruling_lines": 2,
+    },
+)
+class TablePageFilter:
+    """Marks the pages likely to have a table in page.table_candidate, using
+    the layout of words and ruling lines in the pdf, image based table stages
+    skip the pages that are not candidates."""
+
+    def __init__(
+        self,
+        doc_confdir,
+        conf_stub,
+        output_dir,
+        min_table_rows,
+        min_table_columns,
+        min_row_regularity,
+        column_tolerance,
+        gap_char_multiple,
+        use_ruling_lines,
+        min_ruling_lines,
+    ):
+        self.doc_confdir = doc_confdir
+        self.conf_stub = conf_stub
+        self.output_dir = Path(output_dir)
+        self.min_table_rows = min_table_rows
+        self.min_table_columns = min_table_columns
+        self.min_row_regularity = min_row_regularity
+        self.column_tolerance = column_tolerance
+        self.gap_char_multiple = gap_char_multiple
+        self.use_ruling_lines = use_ruling_lines
+        self.min_ruling_lines = min_ruling_lines
+
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
+
+    def add_log_handler(self, doc):
+        add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
+
+    def remove_log_handler(self, doc):
+        remove_doc_log(self.lgr)
+
+    def get_layout_info(self, page):
+        """Count the rows with min_table_columns segments aligned with segments in
+        other rows (on xmin or xmax), and the regularity of the gaps between them."""
+        words = [w for w in page.words if w.text.strip()]
+        if not words:
+            return {"num_rows": 0, "num_table_rows": 0, "row_regularity": 0.0}
+
+        median_height = statistics.median(w.box.height for w in words)
+        char_width = statistics.median(w.box.width / len(w.text) for w in words)
+        min_gap = char_width * self.gap_char_multiple
+
+        rows = build_rows(words, median_height)
+        rows_segments = [build_segments(row, min_gap) for row in rows]
+
+        def to_bin(x):
+            return int(x / self.column_tolerance)
+
+        bin_counts = Counter()
+        for segments in rows_segments:
+            bin_counts.update({("l", to_bin(x0)) for (x0, _) in segments})
+            bin_counts.update({("r", to_bin(x1)) for (_, x1) in segments})
+
+        def is_aligned(side, x):
+            x_bin = to_bin(x)
+            num_rows = sum(bin_counts[(side, x_bin + d)] for d in (-1, 0, 1))
+            return num_rows >= self.min_table_rows
+
+        table_row_ys = []
+        for row, segments in zip(rows, rows_segments):
+            num_aligned = sum(
+                1 for (x0, x1) in segments if is_aligned("l", x0) or is_aligned("r", x1)
+            )
+            if num_aligned >= self.min_table_columns:
+                table_row_ys.append(row[0].box.ymid)
+
+        row_regularity = 0.0
+        if len(table_row_ys) > 2:
+            row_gaps = [y2 - y1 for (y1, y2) in zip(table_row_ys, table_row_ys[1:])]
+            mean_gap = statistics.mean(row_gaps)
+            gap_cv = statistics.pstdev(row_gaps) / mean_gap if mean_gap else 1.0
+            row_regularity = round(1.0 - min(gap_cv, 1.0), 3)
+
+        return {
+            "num_rows": len(rows),
+            "num_table_rows": len(table_row_ys),
+            "row_regularity": row_regularity,
+        }
+
+    def get_ruling_info(self, pdf_page):
+        min_width, min_height = pdf_page.width * 0.05, pdf_page.height * 0.05
+        lines = pdf_page.lines
+        h_lines = [ln for ln in lines if ln.is_horizontal() and ln.width >= min_width]
+        v_lines = [ln for ln in lines if ln.is_vertical() and ln.height >= min_height]
+        return {"num_hlines": len(h_lines), "num_vlines": len(v_lines)}
+
+    def get_feature_config(self):
+        """Config the page_infos depend on, saved with them in the json file."""
+        return {
+            "min_table_rows": self.min_table_rows,
+            "min_table_columns": self.min_table_columns,
+            "column_tolerance": self.column_tolerance,
+            "gap_char_multiple": self.gap_char_multiple,
+            "use_ruling_lines": self.use_ruling_lines,
+        }
+
+    def get_page_infos(self, doc):
+        page_infos = [self.get_layout_info(page) for page in doc.pages]
+        if self.use_ruling_lines:
+            from ..pdfwrapper import pypdfium2_wrapper2
+
+            with pypdfium2_wrapper2.open(doc.pdf_path) as pdf:
+                for page_info, pdf_page in zip(page_infos, pdf.pages):
+                    page_info.update(self.get_ruling_info(pdf_page))
+        return page_infos
+
+    def is_table_candidate(self, page_info):
+        if page_info["num_rows"] == 0:
+            return True  # no text layer, can't rule out a table
+
+        min_lines = self.min_ruling_lines
+        if (
+            page_info.get("num_hlines", 0) >= min_lines
+            and page_info.get("num_vlines", 0) >= min_lines
+        ):
+            return True
+
+        has_table_rows = page_info["num_table_rows"] >= self.min_table_rows
+        return has_table_rows and page_info["row_regularity"] >= self.min_row_regularity
+
+    def __call__(self, doc):
+        self.add_log_handler(doc)
+        self.lgr.info(f"table_page_filter: {doc.pdf_name}")
+
+        doc.add_extra_page_field("table_candidate", ("noparse", "", ""))
+        doc_config = load_config(self.doc_confdir, doc.pdf_name, self.conf_stub)
+        table_page_idxs = doc_config.get("table_page_idxs", [])
+
+        # page_infos are reused only if they were computed with the same config
+        feature_config = self.get_feature_config()
+        json_path = self.output_dir / f"{doc.pdf_name}.{self.conf_stub}.json"
+        json_dict = json.loads(json_path.read_text()) if json_path.exists() else {}
+        if json_dict.get("feature_config", None) == feature_config:
+            page_infos = json_dict["page_infos"]
+        else:
+            page_infos = self.get_page_infos(doc)
+            json_dict = {"feature_config": feature_config, "page_infos": page_infos}
+            json_path.write_text(json.dumps(json_dict))
+
+        for page, page_info in zip(doc.pages, page_infos):
+            page.table_candidate = self.is_table_candidate(page_info)
+            page.table_candidate |= page.page_idx in table_page_idxs
+            self.lgr.debug(f"{page.page_idx}: {page.table_candidate} {page_info}")
+
+        num_candidates = sum(1 for page in doc.pages if page.table_candidate)
+        self.lgr.info(f"table_page_filter: {num_candidates}/{len(doc.pages)} candidate pages")
+
+        self.remove_log_handler(doc)
+        return doc
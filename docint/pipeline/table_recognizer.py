@@ -1,14 +1,17 @@
 import logging
 import sys
+import time
 from functools import partial, reduce
 from itertools import chain
 from pathlib import Path
 
 from more_itertools import first, flatten
 
+from ..log_service import add_doc_log, get_logger, remove_doc_log
+from ..object_detector import load_table_recognizer
 from ..shape import Coord, Edge
 from ..table import TableEdges
-from ..util import get_full_path, get_model_path
+from ..util import get_full_path, get_shared_model
 from ..vision import Vision
 
 
@@ -18,45 +21,40 @@ from ..vision import Vision
         "model_name": "huggingface:microsoft/table-transformer-structure-recognition",
         "model_dir": "/import/models",
         "merge_threshold_percent": 5,
+        "batch_size": 4,
+        "runtime": "torch",
     },
 )
 class TableRecognizer:
-    def __init__(self, model_name, model_dir, merge_threshold_percent):
+    def __init__(self, model_name, model_dir, merge_threshold_percent, batch_size, runtime):
         self.model_dir = get_full_path(model_dir)
         self.model_name = model_name
         self.merge_threshold_percent = merge_threshold_percent
+        self.batch_size = batch_size
+        self.runtime = runtime
         self.conf_stub = "tablerecognizer"
+        self._detector = None
 
-        table_model_dir = get_model_path(self.model_name, self.model_dir)
-
-        from transformers import DetrFeatureExtractor, TableTransformerForObjectDetection
-
-        self.feature_extractor = DetrFeatureExtractor()
-        self.model = TableTransformerForObjectDetection.from_pretrained(table_model_dir)
-
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
-
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-
-        self.file_handler = None
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
         self.info_dict = {}
 
+    @property
+    def detector(self):
+        if self._detector is None:
+            self._detector = get_shared_model(
+                self.model_name, self.model_dir, load_table_recognizer, runtime=self.runtime
+            )
+        return self._detector
+
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
+        add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
 
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
+
+    def build_table_edges(self, image_size, scores, labels, boxes, id2label):
+        (width, height) = image_size
 
-    def build_table_edges(self, img, scores, labels, boxes, id2label):
         def merge_coord(coords, coord, cutoff=0.0):
             coord = float(coord)
             if not coords:
@@ -71,11 +69,11 @@ class TableRecognizer:
 
         def build_edge(val, o):
             if o == "h":
-                y = val / img.height
+                y = val / height
                 c1, c2 = Coord(x=0.0, y=y), Coord(x=1.0, y=y)
                 return Edge(coord1=c1, coord2=c2, orientation="h")
             else:
-                x = val / img.width
+                x = val / width
                 c1, c2 = Coord(x=x, y=0.0), Coord(x=x, y=1.0)
                 return Edge(coord1=c1, coord2=c2, orientation="v")
 
@@ -90,8 +88,8 @@ class TableRecognizer:
         col_xs = sorted(flatten([b[0], b[2]] for b in col_boxes))
         row_ys = sorted(flatten([b[1], b[3]] for b in row_boxes))
 
-        x_cutoff = (img.width * self.merge_threshold_percent) / 100.0
-        y_cutoff = (img.height * self.merge_threshold_percent) / 100.0
+        x_cutoff = (width * self.merge_threshold_percent) / 100.0
+        y_cutoff = (height * self.merge_threshold_percent) / 100.0
 
         col_merged_xs = reduce(partial(merge_coord, cutoff=x_cutoff), col_xs, [])
         row_merged_ys = reduce(partial(merge_coord, cutoff=y_cutoff), row_ys, [])
@@ -105,40 +103,36 @@ class TableRecognizer:
     def __call__(self, doc):
         self.add_log_handler(doc)
         self.lgr.info(f"table_recognizer: {doc.pdf_name}")
-        import torch
 
         doc.add_extra_page_field("table_edges_list", ("list", __name__, "TableEdges"))
         doc.add_extra_page_field("edges", ("list", "docint.shape", "Edge"))
 
         print(f"Number of pages: {len(doc.pages)}")
 
+        start = time.perf_counter()
         for page in doc.pages:
-            image = page.page_image.to_pil_image()
-            image = image.convert("RGB")
-
-            (width, height) = image.size
-
-            encoding = self.feature_extractor(image, return_tensors="pt")
-            with torch.no_grad():
-                outputs = self.model(**encoding)
-
-            target_sizes = [image.size[::-1]]
-            results = self.feature_extractor.post_process_object_detection(
-                outputs, threshold=0.6, target_sizes=target_sizes
-            )[0]
+            page.table_edges_list, page.edges = [], []
 
+        # skip the pages that table_page_filter ruled out
+        pages = [p for p in doc.pages if getattr(p, "table_candidate", True)]
+        images = (page.page_image.to_pil_image() for page in pages)
+        image_results = self.detector.detect(images, threshold=0.6, batch_size=self.batch_size)
+        for page, (image_size, results) in zip(pages, image_results):
             table_edges = self.build_table_edges(
-                image,
+                image_size,
                 results["scores"],
                 results["labels"],
                 results["boxes"],
-                self.model.config.id2label,
+                self.detector.id2label,
             )
             page.table_edges_list = [table_edges]
 
             page.edges = list(chain(*(t.row_edges for t in page.table_edges_list)))
             page.edges += list(chain(*(t.col_edges for t in page.table_edges_list)))
 
+        pages_per_sec = len(pages) / (time.perf_counter() - start)
+        self.lgr.info(f"table_recognizer: {len(pages)} pages {pages_per_sec:.2f} pages/sec")
+
         self.remove_log_handler(doc)
         return doc
 
@@ -14,6 +14,7 @@ from ..vision import Vision
         "wordfreq_dir": "output",
         "min_count": 4,
     },
+    requires=["list_items"],
 )
 class WordfreqWriter:
     def __init__(self, doc_confdir, pre_edit, wordfreq_dir, min_count):
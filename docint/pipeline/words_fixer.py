@@ -1,4 +1,5 @@
 import itertools as it
+import json
 import logging
 import re
 import string
@@ -8,9 +9,17 @@ from pathlib import Path
 from enchant import request_pwl_dict
 from enchant.utils import levenshtein
 
+from ..log_service import add_doc_log, get_logger, remove_doc_log
 from ..region import DataError, TextConfig
 from ..span import Span
-from ..util import load_config
+from ..util import (
+    get_full_path,
+    get_shared_model,
+    hash_file,
+    is_readable_nonempty,
+    load_config,
+    load_ner_pipeline,
+)
 from ..vision import Vision
 
 # b ../docint/pipeline/sents_fixer.py:87
@@ -32,9 +41,13 @@ class OfficerMultipleError(DataError):
         "conf_stub": "wordfix",
         "pre_edit": True,
         "dict_file": "output/pwl_words.txt",
+        "suggestions_file": "output/pwl_suggestions.json",
         "lv_dist_cutoff": 1,
         "ignore_paren_len": 7,
         "unicode_file": "conf/unicode.txt",
+        "model_dir": "/import/models",
+        "ner_model_name": "huggingface:dslim/bert-base-NER",
+        "ner_batch_size": 32,
         "officer_at_start": True,
     },
 )
@@ -46,9 +59,13 @@ class WordsFixer:
         conf_stub,
         pre_edit,
         dict_file,
+        suggestions_file,
         lv_dist_cutoff,
         ignore_paren_len,
         unicode_file,
+        model_dir,
+        ner_model_name,
+        ner_batch_size,
         officer_at_start,
     ):
         ignore_puncts = string.punctuation
@@ -58,9 +75,13 @@ class WordsFixer:
         self.conf_stub = conf_stub
         self.pre_edit = pre_edit
         self.dict_file = Path(dict_file)
+        self.suggestions_file = Path(suggestions_file) if suggestions_file else None
         self.lv_dist_cutoff = lv_dist_cutoff
         self.ignore_paren_len = ignore_paren_len
         self.unicode_file = unicode_file
+        self.model_dir = get_full_path(model_dir)
+        self.ner_model_name = ner_model_name
+        self.ner_batch_size = ner_batch_size
         self.officer_at_start = officer_at_start
 
         self.ignore_parent_strs = [
@@ -83,42 +104,33 @@ class WordsFixer:
         ]
         self.unicode_dict = dict((u, a if a != "<ignore>" else "") for u, a in u_lines)
 
-        # TODO PLEASE MOVE THIS TO OPTIONS
-        from transformers import AutoModelForTokenClassification, AutoTokenizer, pipeline
-
-        tokenizer = AutoTokenizer.from_pretrained("/Users/mukund/Github/huggingface/bert-base-NER")
-        model = AutoModelForTokenClassification.from_pretrained(
-            "/Users/mukund/Github/huggingface/bert-base-NER"
-        )
-
-        self.nlp = pipeline("ner", model=model, tokenizer=tokenizer)
-        # self.nlp = pipeline("ner")
+        self._nlp = None  # loaded lazily and shared across instances
 
         self.dictionary = request_pwl_dict(str(self.dict_file))
 
+        # suggestions are the slowest step and tokens recur across docs, cache
+        # them for the run and across runs in suggestions_file, the cache is
+        # dropped when dict_file changes
+        self.dict_hash = hash_file(self.dict_file).hexdigest()[:16]
+        self.suggestions_cache = self.load_suggestions()
+        self.num_new_suggestions = 0
+
         self.test_doc = True
 
-        self.lgr = logging.getLogger(f"docint.pipeline.{self.conf_stub}")
-        self.lgr.setLevel(logging.DEBUG)
+        self.lgr = get_logger(f"docint.pipeline.{self.conf_stub}")
 
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
-        self.lgr.addHandler(stream_handler)
-        self.file_handler = None
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self._nlp = get_shared_model(self.ner_model_name, self.model_dir, load_ner_pipeline)
+        return self._nlp
 
     def add_log_handler(self, doc):
-        handler_name = f"{doc.pdf_name}.{self.conf_stub}.log"
-        log_path = Path("logs") / handler_name
-        self.file_handler = logging.FileHandler(log_path, mode="w")
+        log_path = add_doc_log(self.lgr, f"{doc.pdf_name}.{self.conf_stub}.log")
         self.lgr.info(f"adding handler {log_path}")
 
-        self.file_handler.setLevel(logging.DEBUG)
-        self.lgr.addHandler(self.file_handler)
-
     def remove_log_handler(self, doc):
-        self.file_handler.flush()
-        self.lgr.removeHandler(self.file_handler)
-        self.file_handler = None
+        remove_doc_log(self.lgr)
 
     def _fix_text(self, text):
         if not text.isascii():
@@ -127,8 +139,34 @@ class WordsFixer:
         text = text.translate(self.punct_tbl).strip()
         return text
 
+    def load_suggestions(self):
+        if self.suggestions_file and is_readable_nonempty(self.suggestions_file):
+            json_dict = json.loads(self.suggestions_file.read_text(encoding="utf-8"))
+            if json_dict.get("dict_hash", None) == self.dict_hash:
+                return json_dict["suggestions"]
+        return {}
+
+    def save_suggestions(self):
+        if not self.suggestions_file or self.num_new_suggestions == 0:
+            return
+
+        suggestions_cache = dict(sorted(self.suggestions_cache.items()))
+        json_dict = {"dict_hash": self.dict_hash, "suggestions": suggestions_cache}
+        self.suggestions_file.write_text(
+            json.dumps(json_dict, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+        self.num_new_suggestions = 0
+
+    def get_suggestions(self, text):
+        suggestions = self.suggestions_cache.get(text, None)
+        if suggestions is None:
+            suggestions = self.dictionary.suggest(text)
+            self.suggestions_cache[text] = suggestions
+            self.num_new_suggestions += 1
+        return suggestions
+
     def is_correctable(self, text):
-        suggestions = self.dictionary.suggest(text)
+        suggestions = self.get_suggestions(text)
         if not suggestions:
             return False
 
@@ -218,7 +256,7 @@ class WordsFixer:
                 else:
                     pass
             elif self.is_correctable(text):
-                suggestions = self.dictionary.suggest(text)
+                suggestions = self.get_suggestions(text)
                 self.lgr.debug(f"SpellCorrected {text} -> {suggestions[0]}")
                 replace_words.append((word, suggestions[0]))
                 correct_count += 1
@@ -240,7 +278,7 @@ class WordsFixer:
 
         list_item.add_spans(officer_spans, "officer", ignore_config)
 
-    def mark_names(self, list_item):
+    def mark_names(self, list_item, ner_results=None):
         def get_person_spans(ner_results, line_text):
             def is_mergeable(last_end, new_start):
                 if last_end == new_start:
@@ -277,7 +315,8 @@ class WordsFixer:
         ignore_config = TextConfig(rm_labels=["ignore"], rm_nl=True)
         line_text = list_item.line_text(ignore_config)
 
-        ner_results = self.nlp(line_text)
+        if ner_results is None:
+            ner_results = self.nlp(line_text)
         # self.lgr.debug(ner_results)
 
         # per_names = [r["word"] for r in ner_results if r["entity"].endswith("-PER")]
@@ -376,12 +415,24 @@ class WordsFixer:
 
         return punct_count
 
-    def fix_list(self, list_item):
+    def prepare_list(self, list_item):
         paren_count = self.blank_paren_words(list_item)  # noqa: F841
 
         unicode_count = self.fix_unicode(list_item)  # noqa: F841
 
-        name_count = self.mark_names(list_item)  # noqa: F841
+    def find_names(self, list_items):
+        """Run NER on all the list_items in batches, instead of one at a time."""
+        ignore_config = TextConfig(rm_labels=["ignore"], rm_nl=True)
+        line_texts = [list_item.line_text(ignore_config) for list_item in list_items]
+        if not line_texts:
+            return []
+        return self.nlp(line_texts, batch_size=self.ner_batch_size)
+
+    def fix_list(self, list_item, ner_results=None):
+        if ner_results is None:
+            self.prepare_list(list_item)
+
+        name_count = self.mark_names(list_item, ner_results)  # noqa: F841
 
         merge_count = self.merge_words(list_item)  # noqa: F841
 
@@ -436,6 +487,12 @@ class WordsFixer:
                 print(f"Edited document: {doc.pdf_name}")
                 doc.edit(edits)
 
+        # names are marked after paren words are blanked, prepare all the list_items
+        # of the doc first, so that NER runs in batches across pages.
+        all_items = [i for page in doc.pages for i in getattr(page, self.item_name, [])]
+        [self.prepare_list(list_item) for list_item in all_items]
+        all_ner_results = iter(self.find_names(all_items))
+
         NL = "\n"
         for page_idx, page in enumerate(doc.pages):
             # access what to fix through path
@@ -445,7 +502,7 @@ class WordsFixer:
                 indent_str = f"{doc.pdf_name}:{page_idx}>{list_idx}"  # noqa: F841
 
                 self.lgr.debug(f'\n{list_item.line_text().replace(NL, " ")}<')
-                self.fix_list(list_item)
+                self.fix_list(list_item, next(all_ner_results))
                 list_item_errors = self.test(list_item, item_path)
 
                 list_item.errors += list_item_errors
@@ -461,5 +518,6 @@ class WordsFixer:
 
         # self.revert_config(old_config)
         self.officer_at_start = old_officer_at_start
+        self.save_suggestions()
         self.remove_log_handler(doc)
         return doc
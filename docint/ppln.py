@@ -2,6 +2,7 @@ import logging
 import os
 from collections import ChainMap
 from dataclasses import dataclass
+from importlib import import_module
 from itertools import chain, groupby
 from operator import itemgetter
 from pathlib import Path
@@ -12,6 +13,7 @@ from pydantic import BaseModel, DirectoryPath, Field, create_model
 from pydantic.fields import FieldInfo
 
 from .audio import Audio
+from .components import ComponentModules
 from .doc import Doc
 from .file import File
 from .util import load_config, read_config_from_disk
@@ -249,7 +251,7 @@ class Pipeline:
         return config_model
 
     def add_pipe(self, pipe_name, component_name, component_configs, pipeline_configs):
-        if component_name not in Pipeline.components:
+        if not Pipeline.has_component(component_name):
             raise ValueError(f"Unknown component name {component_name}")
 
         if pipe_name in [n for (n, c) in self._pipes]:
@@ -269,6 +271,14 @@ class Pipeline:
         print(pipe)
         self._pipes.append((pipe_name, pipe))
 
+    @classmethod
+    def has_component(cls, component_name):
+        """Check if the component is registered, importing its module from the
+        ComponentModules registry if needed."""
+        if component_name not in cls.components and component_name in ComponentModules:
+            import_module(ComponentModules[component_name])
+        return component_name in cls.components
+
     @classmethod
     def check_component_definition(cls, component_cls):
         # print("\t check_component_definition")
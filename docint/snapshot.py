@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from .doc import Doc
+from .util import hash_file
+
+# Snapshots are doc.to_disk files stored as
+# {snapshot_dir}/{doc_name}/{component_idx:02d}.{component_name}.{key}.json.gz
+
+
+class SnapshotStore:
+    """Snapshots of a doc after each component of the pipeline.
+
+    The key of a snapshot chains the key of the previous component with the
+    config of the component (pipeline config and the per-doc config file), so
+    if the config of component K changes, the keys of K and of all components
+    after it change and the doc is resumed from the snapshot of K-1. Old
+    snapshots are deleted when the directory grows beyond budget_bytes.
+    """
+
+    def __init__(self, snapshot_dir, budget_bytes=1024 * 1024 * 1024):
+        self.snapshot_dir = Path(snapshot_dir)
+        self.budget_bytes = budget_bytes
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+    def input_key(self, input_path):
+        """Key of the input file, changes when the contents of the file change."""
+        input_path = Path(input_path)
+        hasher = hashlib.sha256(input_path.name.encode("utf-8"))
+        return hash_file(input_path, hasher).hexdigest()[:16]
+
+    def component_key(self, prev_key, name, pipe_config, config_paths):
+        hasher = hashlib.sha256(prev_key.encode("utf-8"))
+        hasher.update(name.encode("utf-8"))
+        hasher.update(json.dumps(pipe_config, sort_keys=True, default=str).encode("utf-8"))
+        for config_path in config_paths:
+            if Path(config_path).exists():
+                hasher.update(str(config_path).encode("utf-8"))
+                hash_file(config_path, hasher)
+        return hasher.hexdigest()[:16]
+
+    def get_path(self, doc_name, idx, name, key):
+        return self.snapshot_dir / doc_name / f"{idx:02d}.{name}.{key}.json.gz"
+
+    def load(self, snapshot_path):
+        doc = Doc.from_disk(snapshot_path)
+        os.utime(snapshot_path)  # recently used snapshots are deleted last
+        return doc
+
+    def save(self, doc, doc_name, idx, name, key):
+        snapshot_path = self.get_path(doc_name, idx, name, key)
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # remove stale snapshots of this component, they can't be resumed from
+        for old_path in snapshot_path.parent.glob(f"{idx:02d}.{name}.*.json.gz"):
+            old_path.unlink()
+
+        # write to a temporary file first, so a partial snapshot is never loaded
+        tmp_path = snapshot_path.with_name(f"tmp.{snapshot_path.name}")
+        doc.to_disk(tmp_path)
+        tmp_path.rename(snapshot_path)
+        return snapshot_path
+
+    def collect_garbage(self, keep_paths=()):
+        """Delete the least recently used snapshots until the total size of the
+        snapshots is within the budget, snapshots in keep_paths are not deleted."""
+        keep_paths = set(Path(p) for p in keep_paths)
+        snapshot_stats = [(p, p.stat()) for p in self.snapshot_dir.glob("*/*.json.gz")]
+
+        total_bytes = sum(s.st_size for (_, s) in snapshot_stats)
+        snapshot_stats.sort(key=lambda ps: ps[1].st_mtime)
+
+        num_deleted = 0
+        for snapshot_path, stat in snapshot_stats:
+            if total_bytes <= self.budget_bytes:
+                break
+            if snapshot_path in keep_paths:
+                continue
+            snapshot_path.unlink()
+            total_bytes -= stat.st_size
+            num_deleted += 1
+        return num_deleted
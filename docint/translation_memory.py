@@ -0,0 +1,91 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+from .util import is_readable_nonempty
+
+# SQLite limits the number of host parameters in a single statement
+MaxVariables = 900
+
+
+class TranslationMemory:
+    """Persistent, append-only store of sentence translations.
+
+    Translations are kept in an indexed SQLite table keyed on the source text
+    and the language pair. Writes only append the new translations, and the
+    database runs in WAL mode so that other processes can read it while a
+    translator is writing to it.
+    """
+
+    def __init__(self, db_path, src_lang, tgt_lang):
+        self.db_path = Path(db_path)
+        self.src_lang = src_lang
+        self.tgt_lang = tgt_lang
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=60, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS translations (
+                 src_lang TEXT NOT NULL,
+                 tgt_lang TEXT NOT NULL,
+                 src_text TEXT NOT NULL,
+                 tgt_text TEXT NOT NULL,
+                 PRIMARY KEY (src_lang, tgt_lang, src_text)
+               )"""
+        )
+        self._conn.commit()
+
+    def __len__(self):
+        sql = "SELECT COUNT(*) FROM translations WHERE src_lang = ? AND tgt_lang = ?"
+        with self._lock:
+            return self._conn.execute(sql, (self.src_lang, self.tgt_lang)).fetchone()[0]
+
+    def __contains__(self, text):
+        return text in self.get_many([text])
+
+    def get(self, text, default=None):
+        return self.get_many([text]).get(text, default)
+
+    def get_many(self, texts):
+        """Return a dict of translations of texts that are present in the memory."""
+        texts = list(dict.fromkeys(texts))
+        result = {}
+        with self._lock:
+            for idx in range(0, len(texts), MaxVariables):
+                batch = texts[idx : idx + MaxVariables]
+                sql = (
+                    "SELECT src_text, tgt_text FROM translations"
+                    " WHERE src_lang = ? AND tgt_lang = ?"
+                    f' AND src_text IN ({",".join("?" * len(batch))})'
+                )
+                rows = self._conn.execute(sql, [self.src_lang, self.tgt_lang] + batch)
+                result.update(rows)
+        return result
+
+    def get_unseen(self, texts):
+        found = self.get_many(texts)
+        return [t for t in dict.fromkeys(texts) if t not in found]
+
+    def add_many(self, text_trans_pairs):
+        """Append translations, existing translations are not overwritten."""
+        rows = [(self.src_lang, self.tgt_lang, s, t) for (s, t) in text_trans_pairs]
+        sql = "INSERT OR IGNORE INTO translations VALUES (?, ?, ?, ?)"
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(sql, rows)
+
+    def import_json(self, json_path, src_key="mr", tgt_key="en"):
+        """Load translations from the older json list of {src_key:, tgt_key:} dicts."""
+        json_path = Path(json_path)
+        if not is_readable_nonempty(json_path):
+            return 0
+
+        json_list = json.loads(json_path.read_text(encoding="utf-8"))
+        self.add_many((d[src_key], d[tgt_key]) for d in json_list)
+        return len(json_list)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,24 +1,44 @@
+from bisect import bisect_right
+from collections import Counter
+
 scripts = []
 script_ranges = {}
 
+# blocks sorted by start, get_script bisects the starts instead of scanning all blocks
+_block_starts, _block_ends = [], []
+
 
 def get_script(ch):
     """
     Return the Unicode block name for ch, or None if ch has no block.
 
-    >>> block(u'a')
+    >>> get_script('a')
     'Basic Latin'
-    >>> block(unichr(0x0b80))
+    >>> get_script(chr(0x0b80))
     'Tamil'
-    >>> block(unichr(0xe0080))
+    >>> get_script(chr(0xe0080))
 
     """
-
-    assert isinstance(ch, str) and len(ch) == 1, repr(ch)
     cp = ord(ch)
-    for start, end, name in _blocks:
-        if start <= cp <= end:
-            return name
+    idx = bisect_right(_block_starts, cp) - 1
+    if idx >= 0 and cp <= _block_ends[idx]:
+        return scripts[idx]
+    return None
+
+
+def script_histogram(text):
+    """
+    Return a Counter of the Unicode block names of the characters in text,
+    characters without a block are counted under None. Each distinct
+    character is looked up once, so a whole page can be classified at once.
+
+    >>> script_histogram('ab क')
+    Counter({'Basic Latin': 3, 'Devanagari': 1})
+    """
+    histogram = Counter()
+    for ch, count in Counter(text).items():
+        histogram[get_script(ch)] += count
+    return histogram
 
 
 def _initBlocks(text):
@@ -35,6 +55,11 @@ def _initBlocks(text):
             scripts.append(name)
             script_ranges[name] = (int(start, 16), int(end, 16))
 
+    _blocks.sort()
+    scripts[:] = [name for (_, _, name) in _blocks]
+    _block_starts[:] = [start for (start, _, _) in _blocks]
+    _block_ends[:] = [end for (_, end, _) in _blocks]
+
 
 # retrieved from http://unicode.org/Public/UNIDATA/Blocks.txt
 _initBlocks(
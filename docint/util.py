@@ -1,8 +1,10 @@
+import hashlib
 import inspect
 import os
 import random
 import statistics
 import string
+import threading
 import time
 from pathlib import Path
 from subprocess import run
@@ -137,6 +139,14 @@ def is_readable_nonempty(path):
     return is_readable(path) and path.stat().st_size > 0
 
 
+def hash_file(file_path, hasher=None):
+    hasher = hashlib.sha256() if hasher is None else hasher
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher
+
+
 def read_config_from_disk(path):
     path = Path(path)
     if not path.exists():
@@ -373,6 +383,36 @@ def get_model_path(model_name, model_root_dir):
     raise ValueError(f"Unable to find {model_name} in {model_dot_path} or {model_repo_path}")
 
 
+# Models are loaded once per process and shared by all the component instances,
+# keyed by model name, the function used to load them and its arguments.
+_shared_models = {}
+_shared_models_lock = threading.Lock()
+
+
+def get_shared_model(model_name, model_root_dir, load_func, **load_kwargs):
+    """Return the model loaded by load_func(model_path, **load_kwargs), loading it on first use."""
+    func_name = f"{load_func.__module__}.{load_func.__qualname__}"
+    model_key = (model_name, func_name, tuple(sorted(load_kwargs.items())))
+    with _shared_models_lock:
+        if model_key not in _shared_models:
+            model_path = get_model_path(model_name, model_root_dir)
+            _shared_models[model_key] = load_func(model_path, **load_kwargs)
+        return _shared_models[model_key]
+
+
+def clear_shared_models():
+    with _shared_models_lock:
+        _shared_models.clear()
+
+
+def load_ner_pipeline(model_path):
+    from transformers import AutoModelForTokenClassification, AutoTokenizer, pipeline
+
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = AutoModelForTokenClassification.from_pretrained(model_path)
+    return pipeline("ner", model=model, tokenizer=tokenizer)
+
+
 def add_model(model_name, model_root_dir):
     model_src, model_repo = model_name.split(":", 1)
     models_dict = read_config_from_disk(Path(model_root_dir) / "models.yml")
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict
 
@@ -87,26 +88,98 @@ class Video(File):
         return self.metadata["width"] * self.metadata["height"]
 
     def get_frame(self, time_str):
-        import cv2
+        """Read a single frame, use frame_reader() to read many frames."""
+        with self.frame_reader(cache_size=0) as frame_reader:
+            return frame_reader.get_frame(time_str)
+
+    def frame_reader(self, cache_size=32, max_skip_frames=300):
+        return FrameReader(self, cache_size, max_skip_frames)
+
+
+class FrameReader:
+    """Reads frames of a video with a single open capture.
+
+    Frames requested in increasing time order are decoded forward from the
+    current position instead of seeking, a seek is done only when going back
+    in time or skipping more than max_skip_frames. The last cache_size frames
+    read are kept in an LRU cache, so frames read again are not decoded again.
+    """
+
+    def __init__(self, video, cache_size=32, max_skip_frames=300):
+        self.video = video
+        self.cache_size = cache_size
+        self.max_skip_frames = max_skip_frames
+
+        self.cap, self.next_idx = None, 0
+        self.frame_cache = OrderedDict()
+        self.num_decoded, self.num_seeks, self.num_cache_hits = 0, 0, 0
+
+    def __enter__(self):
+        return self
 
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        self.frame_cache.clear()
+
+    def get_frame_idx(self, time_str):
         if not isinstance(time_str, (str, int, float)):
             raise ValueError(f"Time needs to be either str, float or int {type(time_str)}")
 
-        secs = get_seconds(get_milli=True) if isinstance(time_str, str) else time_str
+        secs = get_seconds(time_str, get_milli=True)
+        return int(self.video.frame_rate * secs)
 
-        frame_idx = int(self.frame_rate * secs)
-        cap = cv2.VideoCapture(str(self.file_path))
+    def read_frame_idx(self, frame_idx):
+        import cv2
 
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        success, frame = cap.read()
+        if frame_idx in self.frame_cache:
+            self.frame_cache.move_to_end(frame_idx)
+            self.num_cache_hits += 1
+            return self.frame_cache[frame_idx]
+
+        if self.cap is None:
+            self.cap = cv2.VideoCapture(str(self.video.file_path))
+            if not self.cap.isOpened():
+                raise IOError(f"Could not open file: {self.video.file_path}")
+            self.next_idx = 0
+
+        num_skip_frames = frame_idx - self.next_idx
+        if num_skip_frames < 0 or num_skip_frames > self.max_skip_frames:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            self.num_seeks += 1
+        else:
+            # grab() skips a frame without converting it
+            for _ in range(num_skip_frames):
+                self.cap.grab()
+        self.next_idx = frame_idx
+
+        success, frame = self.cap.read()
+        if not success:
+            # the position of the capture is unknown, reopen it on the next read
+            self.cap.release()
+            self.cap = None
+            raise IOError(f"Error: Could not read the frame[{frame_idx}] {self.video.file_path}")
+
+        self.next_idx = frame_idx + 1
+        self.num_decoded += 1
+
+        # Convert the color from BGR to RGB and to PIL Image
+        pil_image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if self.cache_size > 0:
+            self.frame_cache[frame_idx] = pil_image
+            if len(self.frame_cache) > self.cache_size:
+                self.frame_cache.popitem(last=False)
+        return pil_image
 
-        # Check if frame was successfully read
-        if success:
-            # Convert the color from BGR to RGB
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def get_frame(self, time_str):
+        return self.read_frame_idx(self.get_frame_idx(time_str))
 
-            # Convert to PIL Image
-            pil_image = Image.fromarray(frame)
-            return pil_image
-        else:
-            raise IOError(f"Error: Could not read the frame[{frame_idx}] {self.file_path}")
+    def iter_frames(self, times):
+        """Yield (time, frame) for times, times in increasing order are read
+        without seeking."""
+        for time_str in times:
+            yield time_str, self.get_frame(time_str)
@@ -1,5 +1,6 @@
 import functools
 from dataclasses import dataclass
+from importlib import import_module
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
@@ -8,6 +9,10 @@ from more_itertools import first, flatten
 from .doc import Doc
 from .docker_runner import DockerRunner
 from .errors import Errors
+from .flow_control import FlowControl
+from .pipe_graph import PipeGraph
+from .pipeline import FactoryModules
+from .snapshot import SnapshotStore
 from .util import (
     SimpleFrozenDict,
     SimpleFrozenList,
@@ -58,6 +63,15 @@ class Vision:
         self.total_docs = 0
         self.unprocessed_docs = 0
 
+        self.snapshot_store = None
+        self.config_dir = None
+
+        self.scheduler = "sequential"
+        self.max_workers = 4
+        self.async_max_docs = 8
+        self.async_concurrency = {}
+        self.flow_control = FlowControl()
+
     @classmethod
     def from_config(cls, config: Dict[str, Any]):
         viz = Vision()
@@ -76,6 +90,20 @@ class Vision:
         viz.pipeline_file = config.get("pipeline_file", None)
         viz.read_cache = config.get("read_cache", True)
 
+        viz.scheduler = config.get("scheduler", viz.scheduler)
+        viz.max_workers = config.get("max_workers", viz.max_workers)
+        viz.async_max_docs = config.get("async_max_docs", viz.async_max_docs)
+        viz.async_concurrency = config.get("async_concurrency", viz.async_concurrency)
+        viz.flow_control = FlowControl(
+            config.get("max_in_flight", None), config.get("memory_watermark_mb", None)
+        )
+        if viz.scheduler not in ("sequential", "dag"):
+            raise ValueError(f"Unknown scheduler: {viz.scheduler}, should be sequential or dag")
+
+        if config.get("snapshot_dir", None):
+            budget_bytes = int(config.get("snapshot_budget_mb", 1024) * 1024 * 1024)
+            viz.snapshot_store = SnapshotStore(config["snapshot_dir"], budget_bytes)
+
         viz.output_dir = Path(viz.output_dir) if viz.output_dir else viz.output_dir
         viz.config_dir = Path(viz.config_dir) if viz.config_dir else viz.config_dir
         viz.pipeline_file = Path(viz.pipeline_file) if viz.pipeline_file else viz.pipeline_file
@@ -90,6 +118,13 @@ class Vision:
     def build_doc(self, pdf_path):
         return Doc.build_doc(pdf_path)
 
+    def read_doc(self, path):
+        path = Path(path)
+        if path.suffix.lower() in (".json", ".msgpack", ".jsn"):
+            return Doc.from_disk(path)
+        else:
+            return self.build_doc(path)
+
     def add_pipe(
         self,
         factory_name: str,
@@ -105,10 +140,8 @@ class Vision:
         if name in self.component_names:
             raise ValueError(Errors.E004.format(name=name, opts=self.component_names))
 
-        if factory_name not in self.factories:
-            raise ValueError(
-                Errors.E005.format(factory_name=factory_name, opts=self.factories.keys())
-            )
+        if not self.has_factory(factory_name):
+            raise ValueError(Errors.E005.format(factory_name=factory_name, opts=self.factory_names))
 
         factory_meta = self.factories_meta[factory_name]
         default_config = factory_meta.default_config
@@ -196,15 +229,20 @@ class Vision:
         self,
         path: Path,
         component_cfg: Optional[Dict[str, Dict[str, Any]]] = None,
+        targets: Optional[Iterable[str]] = None,
     ) -> Doc:
+        use_graph = self.scheduler == "dag" or targets is not None
+        snapshot_keys, snapshot_paths, start_idx, doc = [], [], 0, None
         if isinstance(path, Doc):
             doc = path
         elif isinstance(path, str) or isinstance(path, Path):
             path = Path(path)
-            if path.suffix.lower() in (".json", ".msgpack", ".jsn"):
-                doc = Doc.from_disk(path)
-            else:
-                doc = self.build_doc(path)
+            if self.snapshot_store and not use_graph:
+                snapshot_keys = self.get_snapshot_keys(path)
+                doc, start_idx = self.load_snapshot(path, snapshot_keys)
+
+            if doc is None:
+                doc = self.read_doc(path)
         else:
             raise NotImplementedError(f"unknown path: {type(path)}")
 
@@ -212,7 +250,13 @@ class Vision:
             component_cfg = {}
 
         print(f"Processing: {doc.pdf_name}")
-        for name, proc in self.pipeline:
+        if use_graph:
+            return self.run_pipe_graph(doc, targets)
+
+        for idx, (name, proc) in enumerate(self.pipeline):
+            if idx < start_idx:
+                continue
+
             if not (hasattr(proc, "__call__") or hasattr(proc, "pipe")):
                 print(f"ERROR: {type(proc)} name={name}")
                 raise ValueError(Errors.E003.format(component=type(proc), name=name))
@@ -229,8 +273,68 @@ class Vision:
                 # error_handler(name, proc, [doc], e)
             if doc is None:
                 raise ValueError("Errors.E005.format(name=name)")
+
+            if snapshot_keys:
+                snapshot_path = self.snapshot_store.save(
+                    doc, path.name, idx, name, snapshot_keys[idx]
+                )
+                snapshot_paths.append(snapshot_path)
+
+        if snapshot_paths:
+            self.snapshot_store.collect_garbage(keep_paths=snapshot_paths)
         return doc
 
+    @property
+    def pipe_graph(self) -> PipeGraph:
+        pipe_fields = []
+        for name in self.pipe_names:
+            factory_meta = self.factories_meta.get(name, FactoryMeta(factory=name))
+            pipe_fields.append((name, factory_meta.assigns, factory_meta.requires))
+        return PipeGraph(pipe_fields)
+
+    def run_pipe_graph(self, doc, targets=None):
+        """Run the components in the order of the pipe_graph, independent
+        components run concurrently and only the components needed for
+        targets are run."""
+        procs = dict(self.pipeline)
+
+        def run_pipe(name, doc):
+            return self.exec_task(name, doc, procs[name])
+
+        return self.pipe_graph.run(doc, run_pipe, targets, self.max_workers)
+
+    def get_doc_config_paths(self, name, doc_name):
+        pipe_config = self.all_pipe_config.get(name, {})
+        stub = first((v for (k, v) in pipe_config.items() if k.endswith("_stub")), name)
+        # components read their per-doc config from conf_dir or doc_confdir
+        config_dirs = [pipe_config[k] for k in ("conf_dir", "doc_confdir") if k in pipe_config]
+        config_dirs = config_dirs if config_dirs else [self.config_dir or "conf"]
+        return [Path(d) / f"{doc_name}.{stub}.yml" for d in dict.fromkeys(map(str, config_dirs))]
+
+    def get_snapshot_keys(self, input_path):
+        """Keys of the snapshots after each component, a key changes when the
+        input or the config of the component or of any earlier component changes."""
+        key = self.snapshot_store.input_key(input_path)
+        doc_name, snapshot_keys = input_path.name, []
+        for name, _ in self.pipeline:
+            pipe_config = self.all_pipe_config.get(name, {})
+            config_paths = self.get_doc_config_paths(name, doc_name)
+            key = self.snapshot_store.component_key(key, name, pipe_config, config_paths)
+            snapshot_keys.append(key)
+        return snapshot_keys
+
+    def load_snapshot(self, input_path, snapshot_keys):
+        """Return the doc in the latest valid snapshot and the index of the
+        component to resume from, (None, 0) if there is no valid snapshot."""
+        pipe_names = self.pipe_names
+        for idx in reversed(range(len(snapshot_keys))):
+            name, key = pipe_names[idx], snapshot_keys[idx]
+            snapshot_path = self.snapshot_store.get_path(input_path.name, idx, name, key)
+            if snapshot_path.exists():
+                print(f"Resuming: {input_path.name} after {name}")
+                return self.snapshot_store.load(snapshot_path), idx + 1
+        return None, 0
+
     def get_files_in_config(self, pipe_config):
         def rec_items(cfg):
             dict_items = []
@@ -363,6 +467,7 @@ class Vision:
         return False
 
     def pipe_all(self, paths):
+        self.flow_control.metrics = {}
         pipes = []
         for name, proc in self.pipeline:
             kwargs = {}
@@ -394,7 +499,19 @@ class Vision:
         for pipe in pipes:
             docs = pipe(docs)
 
-        return docs
+        return self.report_flow(docs)
+
+    def report_flow(self, docs):
+        yield from docs
+        print(f"Flow metrics:\n{self.flow_control.summary()}")
+
+    def apipe_all(self, paths):
+        """Async generator of the processed docs, runs many docs concurrently,
+        see AsyncRunner."""
+        from .async_runner import AsyncRunner
+
+        runner = AsyncRunner(self, self.async_max_docs, self.async_concurrency, self.max_workers)
+        return runner.pipe_all(paths)
 
     def pipe_partial(
         self,
@@ -404,9 +521,13 @@ class Vision:
         default_error_handler,
         kwargs: Mapping[str, Any],
     ):
+        flow_control = self.flow_control
         if hasattr(proc, "pipe"):
             print("Pipe_partial->pipe")
-            yield from self.exec_task(name, docs, proc, kwargs)
+            for batch_docs in flow_control.batches(name, docs):
+                yield from flow_control.count_out(
+                    name, self.exec_task(name, batch_docs, proc, kwargs)
+                )
 
             # if name in self.docker_pipes:
             #     depends = self.factories_meta[name].depends
@@ -437,18 +558,19 @@ class Vision:
                 depends = self.factories_meta[name].depends
                 is_recognizer = self.factories_meta[name].is_recognizer
                 pipe_config = self.all_pipe_config[name]
-                result_docs = self.docker.pipe(
-                    name,
-                    docs,
-                    depends,
-                    is_recognizer,
-                    pipe_config,
-                    docker_config=self.docker_config,
-                )
-                for rdoc in result_docs:
-                    yield rdoc
-
-            for doc in docs:
+                for batch_docs in flow_control.batches(name, docs):
+                    result_docs = self.docker.pipe(
+                        name,
+                        batch_docs,
+                        depends,
+                        is_recognizer,
+                        pipe_config,
+                        docker_config=self.docker_config,
+                    )
+                    yield from flow_control.count_out(name, result_docs)
+                return
+
+            for doc in flow_control.count_in(name, docs):
                 try:
                     # if name in self.docker_pipes:
                     #     depends = self.factories_meta[name].depends
@@ -467,8 +589,11 @@ class Vision:
                     #     doc = proc(doc, **kwargs)  # type: ignore[call-arg]
                     # yield doc
 
-                    yield self.exec_task(name, doc, proc, kwargs)
+                    result_doc = self.exec_task(name, doc, proc, kwargs)
+                    flow_control.get_metrics(name).num_out += 1
+                    yield result_doc
                 except Exception as e:
+                    flow_control.get_metrics(name).num_out += 1
                     error_handler(name, proc, [doc], e)
 
     @property
@@ -478,6 +603,7 @@ class Vision:
         RETURNS (List[str]): The factory names.
         """
         names = list(self.factories.keys())
+        names += [n for n in FactoryModules if n not in self.factories]
         return SimpleFrozenList(names)
 
     @property
@@ -528,6 +654,14 @@ class Vision:
             factories[pipe_name] = self.get_pipe_meta(pipe_name).factory
         return SimpleFrozenDict(factories)
 
+    @classmethod
+    def has_factory(cls, factory_name: str) -> bool:
+        """Check if the factory is registered, the module of a factory in the
+        FactoryModules registry is imported to register it."""
+        if factory_name not in cls.factories and factory_name in FactoryModules:
+            import_module(FactoryModules[factory_name])
+        return factory_name in cls.factories
+
     @classmethod
     def factory(
         cls,
@@ -1,28 +1,87 @@
 from operator import itemgetter
 
 
+def iter_deletes(text, max_dist):
+    """Yield text and all the strings formed by deleting upto max_dist chars."""
+    texts = {text}
+    yield text
+    for _ in range(max_dist):
+        texts = {t[:idx] + t[idx + 1 :] for t in texts for idx in range(len(t))}
+        yield from texts
+
+
+class EditDistanceIndex:
+    """Index for finding texts within a bounded levenshtein distance.
+
+    For distances upto max_delete_dist the index stores deletes of every text
+    (symspell), if two texts are within distance k they share a delete of at
+    most k chars, so only a handful of candidates need to be verified. Larger
+    distances fall back to scanning texts bucketed by length, as texts whose
+    lengths differ by more than k cannot be within distance k.
+    """
+
+    def __init__(self, texts=(), max_delete_dist=1):
+        self.max_delete_dist = max_delete_dist
+        self._deletes = {}
+        self._len_buckets = {}
+        for text in texts:
+            self.add(text)
+
+    def add(self, text):
+        for del_text in iter_deletes(text, self.max_delete_dist):
+            self._deletes.setdefault(del_text, []).append(text)
+        self._len_buckets.setdefault(len(text), []).append(text)
+
+    def iter_candidates(self, text, dist_cutoff):
+        if dist_cutoff <= self.max_delete_dist:
+            seen = set()
+            for del_text in iter_deletes(text, dist_cutoff):
+                for cand in self._deletes.get(del_text, []):
+                    if cand not in seen:
+                        seen.add(cand)
+                        yield cand
+        else:
+            text_len = len(text)
+            for bucket_len in range(text_len - dist_cutoff, text_len + dist_cutoff + 1):
+                yield from self._len_buckets.get(bucket_len, [])
+
+    def iter_texts(self, text, dist_cutoff):
+        """Yield (text, dist) for all the texts within dist_cutoff of text."""
+        from polyleven import levenshtein
+
+        for cand in self.iter_candidates(text, dist_cutoff):
+            dist = levenshtein(text, cand, dist_cutoff)
+            if dist <= dist_cutoff:
+                yield (cand, dist)
+
+
 class Vocab:
     def __init__(self, texts, *, case_sensitive=False):
-        from polyleven import levenshtein
+        from polyleven import levenshtein  # noqa
 
         self.case_sensitive = case_sensitive
 
-        # order of words is important, hence storing in dict (py >=3.7)
+        # order of words is important, hence storing in dict (py >=3.7), the
+        # value is the position of the text and used for ordering fuzzy results
         if self.case_sensitive:
             self._texts = dict((t, None) for t in texts)
         else:
             self._texts = dict((t.lower(), None) for t in texts)
+        self._texts = dict((t, idx) for (idx, t) in enumerate(self._texts))
+
+        self._index = None  # built lazily on the first fuzzy lookup
 
     def __contains__(self, text):
         text = text if self.case_sensitive else text.lower()
         return text in self._texts
 
-    def has_text(self, text, dist_cutoff=0):
-        from polyleven import levenshtein  # noqa
-
-        def similar(t1, t2):
-            return levenshtein(t1, t2, dist_cutoff) <= dist_cutoff  # noqa
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = EditDistanceIndex(self._texts.keys())
+        return self._index
 
+    def has_text(self, text, dist_cutoff=0):
         text = text if self.case_sensitive else text.lower()
         if dist_cutoff == 0:
             return text in self._texts
@@ -30,11 +89,9 @@ class Vocab:
             if text in self._texts:
                 return True
 
-            return any(t for t in self._texts if similar(text, t))
+            return any(True for _ in self.index.iter_texts(text, dist_cutoff))
 
     def find_texts(self, text, dist_cutoff=0):
-        from polyleven import levenshtein  # noqa
-
         text = text if self.case_sensitive else text.lower()
 
         if dist_cutoff == 0:
@@ -43,15 +100,13 @@ class Vocab:
             # if text in self._texts:
             #    return [(text, 0)]
 
-            result = []
-            for t in self._texts.keys():
-                dist = levenshtein(text, t)  # noqa
-                # if dist < 5:
-                #     print(f"\t{text} == {t} {dist}")
-                if dist <= dist_cutoff:
-                    result.append((t, dist))
+            # order by distance and then by the order in the vocabulary
+            result = list(self.index.iter_texts(text, dist_cutoff))
+            result.sort(key=lambda tup: self._texts[tup[0]])
             return sorted(result, key=itemgetter(1))
 
     def add_text(self, text):
         assert text not in self._texts
-        self._texts[text] = None
+        self._texts[text] = len(self._texts)
+        if self._index is not None:
+            self._index.add(text)
@@ -6,6 +6,7 @@ from operator import attrgetter
 from typing import List, Union
 
 from .region import Region
+from .shape import Coord
 from .util import avg
 
 lgr = logging.getLogger(__name__)
@@ -277,6 +278,310 @@ def words_in_lines(
     return word_lines
 
 
+def get_overlap_percent(box, big_box):
+    """Same as Box.get_overlap_percent, but on (xmin, ymin, xmax, ymax) tuples."""
+    (wx0, wy0, wx1, wy1), (cx0, cy0, cx1, cy1) = box, big_box
+
+    wArea = (wx1 - wx0) * (wy1 - wy0)
+
+    (ox0, oy0) = (max(cx0, wx0), max(cy0, wy0))
+    (ox1, oy1) = (min(cx1, wx1), min(cy1, wy1))
+
+    if (ox1 < ox0) or (oy1 < oy0):
+        return 0
+
+    if wArea == 0.0:
+        return 100
+
+    oArea = (ox1 - ox0) * (oy1 - oy0)
+    return int((oArea / wArea) * 100)
+
+
+class SweepLine:
+    """Plain (non pydantic) equivalent of LineWord used by words_in_lines_sweep,
+    the box is cached as a (xmin, ymin, xmax, ymax) tuple."""
+
+    __slots__ = (
+        "words",
+        "lt_lwords",
+        "rt_lwords",
+        "position",
+        "linenum",
+        "is_merged",
+        "is_selected",
+        "_box",
+        "_char_width",
+    )
+
+    def __init__(self, word):
+        self.words = [word]
+        self.lt_lwords, self.rt_lwords = [], []
+        self.position = "undef"
+        self.linenum = -1
+        self.is_merged, self.is_selected = False, False
+        self._box, self._char_width = None, None
+
+    @property
+    def box(self):
+        if self._box is None:
+            boxes = [w.box for w in self.words]
+            self._box = (
+                min(b.xmin for b in boxes),
+                min(b.ymin for b in boxes),
+                max(b.xmax for b in boxes),
+                max(b.ymax for b in boxes),
+            )
+        return self._box
+
+    @property
+    def xmin(self):
+        return self.box[0]
+
+    @property
+    def ymin(self):
+        return self.box[1]
+
+    @property
+    def xmax(self):
+        return self.box[2]
+
+    def text_len(self):
+        text_lens = [len(w.text) for w in self.words]
+        return sum(text_lens) + len(text_lens) - 1 if text_lens else 0
+
+    def is_short(self, config):
+        return self.text_len() < config.merge_word_len
+
+    @property
+    def char_width(self):
+        if self._char_width is None:
+            num_chars, wd = self.text_len(), self.box[2] - self.box[0]
+            self._char_width = 1.0 if num_chars == 0 else wd / num_chars
+        return self._char_width
+
+    def set_position(self):
+        if not self.lt_lwords and not self.rt_lwords:
+            self.position = "singleton"
+        elif not self.lt_lwords:
+            self.position = "first"
+        elif not self.rt_lwords:
+            self.position = "last"
+        else:
+            self.position = "middle"
+
+    def reduce_width_at(self, direction, ov_box):
+        assert len(self.words) == 1
+        xmin, ymin, xmax, ymax = self.box
+        inc = 0.001
+
+        if direction == "left":
+            assert xmin <= ov_box[2]
+            coords = [Coord(x=ov_box[2] + inc, y=ymin), Coord(x=xmax, y=ymax)]
+        else:
+            assert xmax >= ov_box[0]
+            coords = [Coord(x=xmin, y=ymin), Coord(x=ov_box[0] - inc, y=ymax)]
+        self.words[0].shape.box.update_coords(coords)
+        self._box = None
+
+    def remove_side_overlap(self):
+        sbox = self.box
+        lt_ov_words = [lw for lw in self.lt_lwords if get_overlap_percent(sbox, lw.box) > 0.5]
+        rt_ov_words = [lw for lw in self.rt_lwords if get_overlap_percent(sbox, lw.box) > 0.5]
+
+        scw = self.char_width
+        if lt_ov_words:
+            [lw.reduce_width_at("right", sbox) for lw in lt_ov_words if lw.char_width > scw]
+        elif rt_ov_words:
+            [lw.reduce_width_at("left", sbox) for lw in rt_ov_words if lw.char_width > scw]
+
+    def add_at(self, direction, lword):
+        if direction == "left":
+            self.words = lword.words + self.words
+        else:
+            self.words = self.words + lword.words
+        lword.is_merged = True
+        self._box = None
+
+    def merge_side_words(self, conf):
+        text_len = self.text_len()
+        if text_len > conf.merge_word_len or text_len == 0:
+            return
+
+        if self.lt_lwords:
+            rt_most_lword = max(self.lt_lwords, key=lambda lw: lw.xmax)
+            gap = self.xmin - rt_most_lword.xmax
+            if not rt_most_lword.is_merged and rt_most_lword.is_selected and gap < 0.05:
+                rt_most_lword.add_at("right", self)
+                return True
+
+        if self.rt_lwords:
+            lt_most_lword = min(self.rt_lwords, key=lambda lw: lw.xmin)
+            gap = lt_most_lword.xmin - self.xmax
+            if not lt_most_lword.is_merged and lt_most_lword.is_selected and gap < 0.05:
+                lt_most_lword.add_at("left", self)
+                return True
+        return False
+
+    def set_linenum(self, slots, conf):
+        nslots = len(slots)
+        xmin, ymin, xmax, _ = self.box
+        y_change = ymin - conf.prev_ymin
+        y_max = conf.avg_height * conf.newline_height_multiple
+
+        if conf.prev_ymin != -1.0 and y_change > y_max:
+            blank_linenum = max(slots) + 1
+            slots[:nslots] = [blank_linenum] * nslots
+
+        conf.prev_ymin = ymin
+        min_sidx, max_sidx = int(abs(xmin * nslots)), int(xmax * nslots)
+
+        if not " ".join(w.text for w in self.words):
+            self.linenum = max(slots[min_sidx:max_sidx])
+        elif min_sidx != max_sidx:
+            self.linenum = max(slots[min_sidx:max_sidx]) + 1
+        else:
+            self.linenum = slots[min_sidx] + 1
+
+        min_sidx = 0 if self.position in ("first", "singleton") else min_sidx
+        max_sidx = nslots if self.position in ("last", "singleton") else max_sidx
+
+        slots[min_sidx:max_sidx] = [self.linenum] * (max_sidx - min_sidx)
+        return self.linenum
+
+
+def find_side_words(region_words, page_words, avg_height, overlap_percent=40):
+    """Find the words to the left and right of each word in region_words.
+
+    Equivalent to calling page.words_to('left'/'right') for every word, instead
+    of two full page scans per word, the page words are sorted by ymin once and
+    only the words in the vertical window of a word are tested for overlap.
+    """
+    import numpy as np
+
+    boxes = [w.box for w in page_words]
+    X0 = np.array([b.xmin for b in boxes], dtype=float)
+    Y0 = np.array([b.ymin for b in boxes], dtype=float)
+    X1 = np.array([b.xmax for b in boxes], dtype=float)
+    Y1 = np.array([b.ymax for b in boxes], dtype=float)
+    areas = (X1 - X0) * (Y1 - Y0)
+
+    y_order = np.argsort(Y0, kind="stable")
+    sorted_Y0 = Y0[y_order]
+    max_height = float((Y1 - Y0).max()) if len(page_words) else 0.0
+
+    def overlapping_idxs(idxs, cx0, cy0, cx1, cy1):
+        ox0, oy0 = np.maximum(cx0, X0[idxs]), np.maximum(cy0, Y0[idxs])
+        ox1, oy1 = np.minimum(cx1, X1[idxs]), np.minimum(cy1, Y1[idxs])
+        w_areas = areas[idxs]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percents = np.trunc(((ox1 - ox0) * (oy1 - oy0) / w_areas) * 100)
+        percents = np.where(w_areas == 0.0, 100, percents)
+        percents = np.where((ox1 < ox0) | (oy1 < oy0), 0, percents)
+        return idxs[percents > overlap_percent]
+
+    side_idxs = []
+    for word in region_words:
+        box = word.box
+        if avg_height and box.height < avg_height:
+            height_inc = (avg_height - box.height) / 2.0
+            top, bot = (box.ymin - height_inc, box.ymax + height_inc)
+        else:
+            top, bot = (box.ymin, box.ymax)
+
+        # words partially in yrange (Box.in_yrange), their ymin is within
+        # max_height of top, the slack allows for rounding errors
+        start = np.searchsorted(sorted_Y0, top - max_height - 1e-9, side="left")
+        end = np.searchsorted(sorted_Y0, bot, side="right")
+        idxs = np.sort(y_order[start:end])
+
+        wy0, wy1 = Y0[idxs], Y1[idxs]
+        in_yrange = ((top <= wy0) & (wy0 <= bot)) | ((top <= wy1) & (wy1 <= bot))
+        in_yrange |= (wy0 < top) & (top < bot) & (bot < wy1)
+        idxs = idxs[in_yrange]
+
+        lt_idxs = overlapping_idxs(idxs, max(0.0, box.xmin - 1.0), top, box.xmin, bot)
+        rt_idxs = overlapping_idxs(idxs, box.xmax, top, min(1.0, box.xmax + 1.0), bot)
+        side_idxs.append((lt_idxs.tolist(), rt_idxs.tolist()))
+    return side_idxs
+
+
+def words_in_lines_sweep(
+    region,
+    *,
+    merge_word_len=3,
+    num_slots=1000,
+    newline_height_multiple=1.0,
+    para_indent=True,
+    is_page=False,
+):
+    """Sort and sweep version of words_in_lines, returns the same word_lines.
+
+    Side words are found with find_side_words and lines are plain SweepLine
+    objects, built only for the region words and their side words.
+    """
+    if not region or not region.words:
+        return []
+    first_word = region.words[0]
+    avg_height = statistics.mean([w.box.height for w in region.words])
+    conf = Config(merge_word_len, newline_height_multiple, avg_height)
+
+    page_words = first_word.page.words if not is_page else region.words
+
+    # like LineWord.set_side_words, the side words are searched in the page of the word
+    side_page_words = first_word.page.words
+
+    page_lWords = {}
+
+    def get_lword(word_idx):
+        lword = page_lWords.get(word_idx, None)
+        if lword is None:
+            lword = page_lWords[word_idx] = SweepLine(page_words[word_idx])
+        return lword
+
+    lWords = [get_lword(w.word_idx) for w in region.words]
+    [setattr(lw, "is_selected", True) for lw in lWords]
+
+    side_idxs = find_side_words(region.words, side_page_words, avg_height)
+    for lw, (lt_idxs, rt_idxs) in zip(lWords, side_idxs):
+        lt_word_idxs = [side_page_words[idx].word_idx for idx in lt_idxs]
+        rt_word_idxs = [side_page_words[idx].word_idx for idx in rt_idxs]
+        lw.lt_lwords = [get_lword(idx) for idx in lt_word_idxs]
+        lw.rt_lwords = [get_lword(idx) for idx in rt_word_idxs]
+        lw.lt_lwords = [w for w in lw.lt_lwords if w is not lw]
+        lw.rt_lwords = [w for w in lw.rt_lwords if w is not lw]
+
+    [lw.set_position() for lw in lWords]
+
+    lWords.sort(key=lambda lw: lw.ymin)
+
+    slots = [0] * num_slots
+    if para_indent:
+        first_word = next(lw for lw in lWords if lw.position == "first")
+        first_slot_idx = int(first_word.xmin * num_slots) - 5  # TODO
+        first_slot_idx = max(first_slot_idx, 0)
+        slots[:first_slot_idx] = [1] * first_slot_idx
+
+    [lw.remove_side_overlap() for lw in lWords]
+
+    [lw.merge_side_words(conf) for lw in lWords if lw.is_short(conf)]
+    lWords = [lw for lw in lWords if not lw.is_merged]
+
+    [lw.set_position() for lw in lWords]
+
+    [lw.set_linenum(slots, conf) for lw in lWords]
+    lWords.sort(key=lambda lw: (lw.linenum, lw.xmin))
+
+    max_lines = max([lw.linenum for lw in lWords]) + 1
+    word_lines = [[] for _ in range(max_lines)]
+
+    for linenum, lw_group in it.groupby(lWords, key=lambda lw: lw.linenum):
+        word_lines[linenum].extend([w for lw in lw_group for w in lw.words])
+
+    num_words = sum([len(wl) for wl in word_lines])
+    assert len(region.words) == num_words
+    return word_lines
+
+
 # Simple words_in_lines, this big one should be moved to Page as it tries to find
 # left and right words which make sense only in a page, where all words need to be
 # processed. For smaller words they shoudl go to page and their ordering.
@@ -0,0 +1,74 @@
+import io
+import shutil
+import subprocess
+import wave
+
+import pytest
+
+from docint.audio import Audio
+
+
+def test_export_cmd():
+    audio = Audio.build("input/speech.mp3")
+    cmd = audio.get_export_cmd("out.mp3")
+    assert "-af" not in cmd
+    assert cmd[-3:] == ["-f", "mp3", "out.mp3"]
+
+    audio.rm_intervals = [(10, 20), (30, 45)]
+    cmd = audio.get_export_cmd("pipe:1", format="wav", frame_rate=16000, start_secs=5, end_secs=25)
+    trim_filter = cmd[cmd.index("-af") + 1]
+    assert trim_filter == "aselect='not(between(t,10,20)+between(t,30,45))',asetpts=N/SR/TB"
+    assert cmd[cmd.index("-ss") + 1] == "5"
+    assert cmd[cmd.index("-t") + 1] == "20"
+    assert cmd[cmd.index("-ar") + 1] == "16000"
+    assert cmd[-3:] == ["-f", "wav", "pipe:1"]
+
+    cmd = audio.get_export_cmd("out.mp3", rm_intervals=False)
+    assert "-af" not in cmd
+
+
+def test_split_file_name(tmp_path):
+    audio = Audio.build(tmp_path / "speech.wav")
+    untrimmed_file = tmp_path / "speech+0-10.wav"
+    untrimmed_file.write_bytes(b"")
+
+    # an untrimmed split is not reused for a trimmed audio
+    audio.rm_intervals = [(2, 5)]
+    trimmed_file = tmp_path / f"speech+0-10.rm-{audio.get_trim_key()}.wav"
+    trimmed_file.write_bytes(b"")
+    assert audio.split(0, 10, tmp_path).file_path == trimmed_file
+
+    audio.rm_intervals = []
+    assert audio.split(0, 10, tmp_path).file_path == untrimmed_file
+
+
+def get_wav_secs(wav_bytes):
+    # the wav header written to a pipe has no data size, count the samples
+    with wave.open(io.BytesIO(wav_bytes)) as wav_file:
+        sample_bytes = wav_file.getsampwidth() * wav_file.getnchannels()
+        return (len(wav_bytes) - 44) / (sample_bytes * wav_file.getframerate())
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_export_trimmed(tmp_path):
+    # 2 secs of tone, 3 secs of silence and 5 secs of tone
+    tone_path = tmp_path / "tone.wav"
+    tone, silence = "sine=frequency=440:sample_rate=16000", "anullsrc=r=16000:cl=mono"
+    lavfi = f"{tone}:d=2[a];{silence},atrim=0:3[b];{tone}:d=5[c];[a][b][c]concat=n=3:v=0:a=1"
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-filter_complex", lavfi, str(tone_path)]
+    subprocess.check_call(cmd)
+
+    audio = Audio.build(tone_path)
+    assert [(round(s), round(e)) for (s, e) in audio.detect_silences()] == [(2, 5)]
+
+    audio.rm_intervals = [(2, 5)]
+    assert audio.detect_silences() == []
+
+    wav_bytes = b"".join(audio.iter_bytes(format="wav", chunk_size=4096))
+    assert abs(get_wav_secs(wav_bytes) - 7.0) < 0.05
+
+    # start and end secs are on the trimmed timeline
+    split_audio = audio.split(1, 6, tmp_path)
+    assert ".rm-" in split_audio.file_name
+    assert abs(get_wav_secs(split_audio.file_path.read_bytes()) - 5.0) < 0.05
+    assert Audio.build(split_audio.file_path).detect_silences() == []
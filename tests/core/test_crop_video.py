@@ -0,0 +1,24 @@
+from docint.components.crop_video import get_crop_filter, get_tee_cmd
+from docint.video import Video
+
+
+def test_tee_cmd(small_video_path):
+    video = Video.build(small_video_path)
+    ticker_filter = get_crop_filter([0, 0.9, 1, 1], video.size)
+    assert ticker_filter == "crop=1920:107:0:972"
+
+    cmd = get_tee_cmd(video, [(ticker_filter, "ticker.mp4", True)])
+    assert cmd.count("-i") == 1
+    assert cmd[cmd.index("-filter_complex") + 1] == "[0:v]crop=1920:107:0:972[o0]"
+
+    outputs = [
+        (ticker_filter, "ticker.mp4", True),
+        (get_crop_filter([0, 0, 0.5, 0.1], video.size), "logo.mp4", True),
+        ("scale=320:-2", "proxy.mp4", False),
+    ]
+    cmd = get_tee_cmd(video, outputs)
+    assert cmd.count("-i") == 1
+    filter_graph = cmd[cmd.index("-filter_complex") + 1]
+    assert filter_graph.startswith("[0:v]split=3[v0][v1][v2];")
+    assert "[v2]scale=320:-2[o2]" in filter_graph
+    assert cmd[-4:] == ["-map", "[o2]", "-an", "proxy.mp4"]
@@ -0,0 +1,55 @@
+from docint.audio import Audio
+from docint.components.transcribe_audio import (
+    get_chunk_times,
+    get_join_secs,
+    transcribe_chunks,
+)
+
+
+def test_chunk_times():
+    silences = [(8, 10), (25, 27), (31, 31)]
+    chunk_times = get_chunk_times(50, silences, 20)
+    assert chunk_times == [(0, 9.0), (9.0, 26.0), (26.0, 31.0), (31.0, 50)]
+
+    assert get_chunk_times(15, silences, 20) == [(0, 15)]
+    assert get_join_secs([(10, 20), (30, 45)]) == [10, 20]
+
+
+def fake_backend(audio_chunk, bucket_name, cloud_dir_path):
+    # every chunk has two words, 1s and 2s into the chunk
+    chunk_name = audio_chunk.file_stem
+    words = [
+        {"word": f"{chunk_name}-a", "startTime": "1s", "endTime": "1.500s"},
+        {"word": f"{chunk_name}-b", "startTime": "2s", "endTime": "2.250s"},
+    ]
+    return {"results": [{"alternatives": [{"transcript": "", "words": words}]}]}
+
+
+def test_transcribe_chunks(monkeypatch, tmp_path):
+    def fake_split(self, start_secs, end_secs, input_dir):
+        return Audio.build(input_dir / f"{start_secs}-{end_secs}.mp3")
+
+    monkeypatch.setattr(Audio, "split", fake_split)
+
+    audio = Audio.build(tmp_path / "speech.mp3")
+    chunk_times = [(0, 9.0), (9.0, 26.0), (26.0, 40)]
+    results = transcribe_chunks(audio, chunk_times, fake_backend, None, None, 3, tmp_path)
+
+    words = [w for r in results for w in r["alternatives"][0]["words"]]
+    assert [w["word"] for w in words] == [
+        "0-9.0-a",
+        "0-9.0-b",
+        "9.0-26.0-a",
+        "9.0-26.0-b",
+        "26.0-40-a",
+        "26.0-40-b",
+    ]
+    assert [w["startTime"] for w in words] == [
+        "1.000s",
+        "2.000s",
+        "10.000s",
+        "11.000s",
+        "27.000s",
+        "28.000s",
+    ]
+    assert words[-1]["endTime"] == "28.250s"
@@ -19,3 +19,99 @@ def test_frame_image(small_video_path):
 
     frame_pil = video.get_frame(1)
     assert frame_pil.size == (1920, 1080)
+
+
+def test_frame_reader(small_video_path):
+    video = Video.build(small_video_path)
+    times = [0, 0.2, 0.5, 0.9, 1.4]
+
+    with video.frame_reader(cache_size=2) as frame_reader:
+        frames = [f for (_, f) in frame_reader.iter_frames(times)]
+        assert frame_reader.num_seeks == 0
+        assert frame_reader.num_decoded == len(times)
+
+        # recent frames are served from the cache, older ones need a seek
+        assert frame_reader.get_frame(1.4) is frames[-1]
+        assert frame_reader.num_cache_hits == 1
+        assert frame_reader.get_frame(0.2).tobytes() == frames[1].tobytes()
+        assert frame_reader.num_seeks == 1
+
+    for time_idx, frame in zip(times, frames):
+        assert video.get_frame(time_idx).tobytes() == frame.tobytes()
+
+
+class CountingOCR:
+    def __init__(self, scripts=None):
+        self.scripts = scripts if scripts else {}
+        self.num_script_calls, self.num_text_calls, self.text_langs = 0, 0, []
+
+    def get_script(self, img):
+        self.num_script_calls += 1
+        return self.scripts.get(img.tobytes(), "Latin")
+
+    def get_text(self, img, lang="eng"):
+        self.num_text_calls += 1
+        self.text_langs.append(lang)
+        return "Breaking News Headline"
+
+
+def test_frame_text_reader_scene(small_video_path):
+    from docint.components.extract_text import FrameTextReader, get_scene_text_two_pass
+
+    video = Video.build(small_video_path)
+    ocr = CountingOCR()
+    text_reader = FrameTextReader(ocr)
+
+    with video.frame_reader() as frame_reader:
+        bbox = [0, 900, 1920, 1080]
+        scene_text = get_scene_text_two_pass(
+            frame_reader, 0, 1.5, bbox, 0.1, text_reader=text_reader
+        )
+
+    assert scene_text == "Breaking News Headline"
+    assert ocr.num_script_calls == text_reader.num_osd == ocr.num_text_calls
+    assert 1 < ocr.num_text_calls < text_reader.num_frames
+
+
+def get_text_image(text):
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", (600, 80), "white")
+    ImageDraw.Draw(img).text((10, 30), text, fill="black")
+    return img
+
+
+def test_frame_text_reader_script_change():
+    import imagehash
+
+    from docint.components.extract_text import FrameTextReader
+
+    # the crops are close, but the text and its script changed
+    latin_img, hindi_img = (
+        get_text_image("Breaking News Headline"),
+        get_text_image("Sports News Update"),
+    )
+    assert 2 < imagehash.phash(latin_img) - imagehash.phash(hindi_img) <= 12
+
+    ocr = CountingOCR({hindi_img.tobytes(): "Devanagari"})
+    text_reader = FrameTextReader(ocr)
+    scripts = [text_reader.read_text(img)[0] for img in (latin_img, latin_img, hindi_img)]
+
+    assert scripts == ["Latin", "Latin", "Devanagari"]
+    assert ocr.text_langs == ["eng", "hin"]
+
+
+def test_frame_text_reader_skips_unchanged(small_video_path):
+    from docint.components.extract_text import FrameTextReader
+
+    video = Video.build(small_video_path)
+    ocr = CountingOCR()
+    text_reader = FrameTextReader(ocr)
+
+    frame_img = video.get_frame(0.5)
+    bbox = [0, 900, 1920, 1080]
+    texts = [text_reader.get_frame_text(frame_img, bbox) for _ in range(4)]
+
+    assert texts == ["Breaking News Headline"] * 4
+    assert ocr.num_text_calls == text_reader.num_ocr == 1
+    assert text_reader.ocr_summary() == "OCR calls: 1/4 frames, reduction: 75.0%"
@@ -0,0 +1,44 @@
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Cold start time of `import docint` and of `docint.load` of a small pipeline, each
+# run is a new python process, usage: python perf_import.py [num_runs]
+
+ImportSrc = """
+import sys, time
+start = time.perf_counter()
+import docint
+import_secs = time.perf_counter() - start
+viz = docint.load(sys.argv[1])
+load_secs = time.perf_counter() - start - import_secs
+num_modules = sum(1 for m in sys.modules if m.startswith("docint.pipeline."))
+print(import_secs, load_secs, num_modules)
+"""
+
+PipelineYml = """
+pipeline:
+  - name: pdf_reader
+  - name: num_marker
+  - name: line_finder
+"""
+
+num_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    pipeline_path = Path(tmp_dir) / "pipeline.yml"
+    pipeline_path.write_text(PipelineYml)
+
+    results = []
+    for _ in range(num_runs):
+        cmd = [sys.executable, "-c", ImportSrc, str(pipeline_path)]
+        output = subprocess.check_output(cmd, text=True, stderr=subprocess.DEVNULL)
+        import_secs, load_secs, num_modules = output.split()[-3:]
+        results.append((float(import_secs), float(load_secs), int(num_modules)))
+
+import_secs = statistics.median(r[0] for r in results)
+load_secs = statistics.median(r[1] for r in results)
+print(f"import docint: {import_secs:.3f}s")
+print(f"docint.load: {load_secs:.3f}s pipeline modules imported: {results[0][2]}")
@@ -0,0 +1,40 @@
+import sys
+import time
+
+from docint.util import get_shared_model, load_ner_pipeline
+
+# Compares NER items/sec on CPU when list items are run one at a time and in
+# batches, usage: python perf_ner.py <model_dir> [num_items] [batch_size]
+
+ITEM_TEXTS = [
+    "Shri Rajesh Kumar, Joint Secretary, Ministry of Finance, is appointed as Director.",
+    "Smt. Anita Sharma, IAS (MH:1998) to be Additional Secretary, Department of Revenue.",
+    "Dr. S. Jaishankar, Minister of External Affairs.",
+    "Shri Amit Verma, Deputy Secretary, Department of Expenditure, is transferred.",
+]
+
+model_dir = sys.argv[1]
+num_items = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+
+texts = [ITEM_TEXTS[idx % len(ITEM_TEXTS)] for idx in range(num_items)]
+
+start = time.perf_counter()
+nlp = get_shared_model("huggingface:dslim/bert-base-NER", model_dir, load_ner_pipeline)
+print(f"Model load: {time.perf_counter() - start:.2f}s")
+
+start = time.perf_counter()
+get_shared_model("huggingface:dslim/bert-base-NER", model_dir, load_ner_pipeline)
+print(f"Shared model load: {time.perf_counter() - start:.6f}s")
+
+start = time.perf_counter()
+single_results = [nlp(text) for text in texts]
+single_time = time.perf_counter() - start
+print(f"One at a time: {num_items / single_time:.1f} items/sec")
+
+start = time.perf_counter()
+batch_results = nlp(texts, batch_size=batch_size)
+batch_time = time.perf_counter() - start
+print(f"Batched [{batch_size}]: {num_items / batch_time:.1f} items/sec")
+
+assert [len(r) for r in single_results] == [len(r) for r in batch_results]
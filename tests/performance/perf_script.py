@@ -0,0 +1,40 @@
+import random
+import sys
+import time
+from collections import Counter
+
+from docint.unicode_utils import _blocks, get_script, script_histogram
+
+# Compares get_script and script_histogram with a linear scan of the unicode blocks,
+# usage: python perf_script.py [num_chars]
+
+
+def linear_get_script(ch):
+    cp = ord(ch)
+    for start, end, name in _blocks:
+        if start <= cp <= end:
+            return name
+
+
+num_chars = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+rng = random.Random(42)
+alphabet = [chr(cp) for cp in range(0x20, 0x7F)] + [chr(cp) for cp in range(0x900, 0x980)]
+text = "".join(rng.choice(alphabet) for _ in range(num_chars))
+
+start = time.perf_counter()
+linear_counter = Counter(linear_get_script(ch) for ch in text)
+linear_time = time.perf_counter() - start
+
+start = time.perf_counter()
+bisect_counter = Counter(get_script(ch) for ch in text)
+bisect_time = time.perf_counter() - start
+
+start = time.perf_counter()
+histogram = script_histogram(text)
+histogram_time = time.perf_counter() - start
+
+assert linear_counter == bisect_counter == histogram
+print(f"Linear: {num_chars} chars {linear_time:.3f}s")
+print(f"Bisect: {num_chars} chars {bisect_time:.3f}s")
+print(f"Histogram: {num_chars} chars {histogram_time:.3f}s")
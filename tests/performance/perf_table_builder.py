@@ -0,0 +1,83 @@
+import math
+import sys
+import time
+from pathlib import Path
+
+import docint
+from docint.pdfwrapper import pypdfium2_wrapper2
+from docint.pipeline.table_builder_edges2 import TableBuilderOnEdges2
+from docint.pipeline.table_page_filter import build_rows, build_segments
+from docint.shape import Coord, Edge
+from docint.table import TableEdges
+
+# Compares the time taken to assign words to cells with rects and with shapely
+# polygons, the table edges are built from the ruling lines in the pdf or from
+# the rows and columns of words. Usage: python perf_table_builder.py [num_iters]
+
+num_iters = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+
+def edges_from_lines(pdf_page):
+    width, height = pdf_page.width, pdf_page.height
+    h_ys = sorted(
+        {round(ln.bounding_box[1] / height, 3) for ln in pdf_page.lines if ln.is_horizontal()}
+    )
+    v_xs = sorted(
+        {round(ln.bounding_box[0] / width, 3) for ln in pdf_page.lines if ln.is_vertical()}
+    )
+    return h_ys, v_xs
+
+
+def edges_from_words(page):
+    words = [w for w in page.words if w.text.strip()]
+    rows = build_rows(words, min(w.box.height for w in words))
+    h_ys = [min(w.box.ymin for w in row) - 0.002 for row in rows] + [rows[-1][0].box.ymax + 0.002]
+    segments = max((build_segments(row, 0.02) for row in rows), key=len)
+    v_xs = [x0 - 0.005 for (x0, _) in segments] + [segments[-1][1] + 0.005]
+    return h_ys, v_xs
+
+
+def build_table_edges(h_ys, v_xs, angle=0.0):
+    slope = math.tan(math.radians(angle))
+    row_edges = [Edge.build_h(0.0, y, 1.0, y + slope) for y in h_ys]
+    col_edges = [Edge.build_v(x, 0.0, x - slope, 1.0) for x in v_xs]
+    return TableEdges(row_edges=row_edges, col_edges=col_edges)
+
+
+def table_word_idxs(table):
+    rows = table.header_rows + table.body_rows
+    return [[[w.word_idx for w in c.words] for c in row.cells] for row in rows]
+
+
+viz = docint.empty()
+viz.add_pipe("pdf_reader")
+
+builders = {
+    a: TableBuilderOnEdges2("conf", "table_builder_on_edges", False, 0, False, False, a)
+    for a in ("rects", "polygons")
+}
+
+for pdf_path in sorted(Path("tests").glob("table*.pdf")):
+    doc = viz(pdf_path)
+    pdf = pypdfium2_wrapper2.open(pdf_path)
+    for page, pdf_page in zip(doc.pages, pdf.pages):
+        if not page.words:
+            print(f"{pdf_path.name}: no words")
+            continue
+
+        h_ys, v_xs = edges_from_lines(pdf_page) if pdf_page.lines else edges_from_words(page)
+        for angle in (0.0, 0.5):
+            tables, times = {}, {}
+            for cell_assignment, builder in builders.items():
+                start = time.perf_counter()
+                for _ in range(num_iters):
+                    table_edges = build_table_edges(h_ys, v_xs, angle)
+                    tables[cell_assignment] = builder.build_table(page, table_edges, 0)
+                times[cell_assignment] = (time.perf_counter() - start) / num_iters
+
+            same = table_word_idxs(tables["rects"]) == table_word_idxs(tables["polygons"])
+            print(
+                f"{pdf_path.name} angle: {angle} rows: {len(h_ys) - 1} cols: {len(v_xs) - 1} "
+                f"rects: {times['rects'] * 1000:.1f}ms polygons: {times['polygons'] * 1000:.1f}ms "
+                f"speedup: {times['polygons'] / times['rects']:.1f}x same: {same}"
+            )
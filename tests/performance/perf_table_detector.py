@@ -0,0 +1,32 @@
+import sys
+
+import docint
+from docint.object_detector import load_table_detector, load_table_recognizer
+from docint.util import clear_shared_models, get_shared_model
+
+# Reports pages/sec on CPU of the table detector and recognizer models for each
+# runtime and batch size, usage: python perf_table_detector.py <model_dir> <pdf_path>
+
+model_dir, pdf_path = sys.argv[1], sys.argv[2]
+
+viz = docint.empty()
+viz.add_pipe("pdf_reader")
+doc = viz(pdf_path)
+images = [page.page_image.to_pil_image() for page in doc.pages]
+
+model_infos = [
+    ("huggingface:TahaDouaji/detr-doc-table-detection", load_table_detector, 0.9),
+    ("huggingface:microsoft/table-transformer-structure-recognition", load_table_recognizer, 0.6),
+]
+
+for model_name, load_func, threshold in model_infos:
+    for runtime in ("torch", "quantized", "onnx"):
+        detector = get_shared_model(model_name, model_dir, load_func, runtime=runtime)
+        for batch_size in (1, 4, 8):
+            detector.num_images, detector.inference_time = 0, 0.0
+            list(detector.detect(images, threshold=threshold, batch_size=batch_size))
+            print(
+                f"{load_func.__name__} {runtime:>9} batch_size: {batch_size} "
+                f"{detector.images_per_sec:.2f} pages/sec"
+            )
+        clear_shared_models()
@@ -0,0 +1,53 @@
+import random
+import string
+import sys
+import time
+
+from polyleven import levenshtein
+
+from docint.vocab import Vocab
+
+# Compares the edit distance index in Vocab with a linear scan of the vocabulary,
+# usage: python perf_vocab.py [num_texts] [num_queries]
+
+
+def random_text(rng):
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 12)))
+
+
+def linear_find_texts(texts, text, dist_cutoff):
+    result = [(t, levenshtein(text, t)) for t in texts]
+    return sorted([r for r in result if r[1] <= dist_cutoff], key=lambda r: r[1])
+
+
+def misspell(rng, text):
+    idx = rng.randrange(len(text))
+    return text[:idx] + rng.choice(string.ascii_lowercase) + text[idx + 1 :]
+
+
+num_texts = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+num_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+rng = random.Random(42)
+texts = list(dict.fromkeys(random_text(rng) for _ in range(num_texts)))
+queries = [misspell(rng, rng.choice(texts)) for _ in range(num_queries)]
+
+start = time.perf_counter()
+vocab = Vocab(texts)
+vocab.index
+print(f"Index build: {len(texts)} texts {time.perf_counter() - start:.3f}s")
+
+for dist_cutoff in (1, 2):
+    start = time.perf_counter()
+    linear_results = [linear_find_texts(texts, q, dist_cutoff) for q in queries]
+    linear_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index_results = [vocab.find_texts(q, dist_cutoff) for q in queries]
+    index_time = time.perf_counter() - start
+
+    assert linear_results == index_results
+    print(
+        f"dist_cutoff={dist_cutoff} linear: {linear_time:.3f}s index: {index_time:.3f}s"
+        f" speedup: {linear_time / index_time:.1f}x"
+    )
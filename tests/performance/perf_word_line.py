@@ -0,0 +1,37 @@
+import sys
+import time
+from pathlib import Path
+
+import docint
+from docint.word_line import words_in_lines, words_in_lines_sweep
+
+# Compares the time taken by the lineword and sweep engines to find lines,
+# usage: python perf_word_line.py [pdf_path ...]
+
+pdf_paths = [Path(p) for p in sys.argv[1:]] or sorted(Path("tests").glob("*.pdf"))
+
+viz = docint.empty()
+viz.add_pipe("pdf_reader")
+
+engine_times = {"lineword": 0.0, "sweep": 0.0}
+num_pages = num_words = 0
+for pdf_path in pdf_paths:
+    for engine, engine_func in (("lineword", words_in_lines), ("sweep", words_in_lines_sweep)):
+        # words get resized while finding lines, so each engine gets a fresh doc
+        doc = viz(pdf_path)
+        for page in doc.pages:
+            if not page.words:
+                continue
+            start = time.perf_counter()
+            try:
+                engine_func(page)
+            except StopIteration:
+                pass  # pages without a 'first' word
+            engine_times[engine] += time.perf_counter() - start
+            if engine == "sweep":
+                num_pages, num_words = num_pages + 1, num_words + len(page.words)
+
+print(f"{num_pages} pages {num_words} words")
+for engine, engine_time in engine_times.items():
+    print(f"{engine:>10}: {engine_time:.3f}s {num_words / engine_time:.0f} words/sec")
+print(f"Speedup: {engine_times['lineword'] / engine_times['sweep']:.1f}x")
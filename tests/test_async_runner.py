@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import docint
+from docint import log_service
+from docint.log_service import flush_logs
+from docint.vision import Vision
+
+
+@Vision.factory("async_test_waiter", default_config={"wait_secs": 0.3})
+class AsyncTestWaiter:
+    def __init__(self, wait_secs):
+        self.wait_secs = wait_secs
+        self.num_active, self.max_active = 0, 0
+
+    def __call__(self, doc):
+        time.sleep(self.wait_secs)
+        return doc
+
+    async def acall(self, doc):
+        self.num_active += 1
+        self.max_active = max(self.max_active, self.num_active)
+        await asyncio.sleep(self.wait_secs)
+        self.num_active -= 1
+        doc.waited = True
+        return doc
+
+
+async def collect_docs(viz, paths):
+    return [doc async for doc in viz.apipe_all(paths)]
+
+
+def build_viz(concurrency):
+    viz = docint.empty(config={"async_concurrency": {"async_test_waiter": concurrency}})
+    viz.add_pipe("pdf_reader")
+    viz.add_pipe("async_test_waiter")
+    return viz
+
+
+def test_overlapping_waits(layout_paths):
+    viz = build_viz(concurrency=len(layout_paths))
+
+    start = time.perf_counter()
+    docs = asyncio.run(collect_docs(viz, layout_paths))
+    elapsed = time.perf_counter() - start
+
+    assert sorted(d.pdf_name for d in docs) == sorted(p.name for p in layout_paths)
+    assert all(d.waited for d in docs)
+    assert viz.get_pipe("async_test_waiter").max_active > 1
+    assert elapsed < 0.3 * len(layout_paths)
+
+
+def test_bounded_concurrency(layout_paths):
+    viz = build_viz(concurrency=1)
+    docs = asyncio.run(collect_docs(viz, layout_paths))
+    assert len(docs) == len(layout_paths)
+    assert viz.get_pipe("async_test_waiter").max_active == 1
+
+
+def line_texts(doc):
+    return [[line.raw_text() for line in page.lines] for page in doc.pages]
+
+
+def read_doc_logs(log_dir):
+    flush_logs()
+    return {p.name: p.read_text() for p in log_dir.glob("*.log")}
+
+
+def test_stateful_pipes(layout_paths, tmp_path, monkeypatch):
+    def build_stateful_viz():
+        viz = docint.empty(config={"async_max_docs": len(layout_paths)})
+        viz.add_pipe("pdf_reader")
+        viz.add_pipe("num_marker")
+        viz.add_pipe("line_finder")
+        return viz
+
+    monkeypatch.setattr(log_service, "LogDir", tmp_path / "serial")
+    docs = build_stateful_viz().pipe_all(layout_paths)
+    expected_texts = {d.pdf_name: line_texts(d) for d in docs}
+    expected_logs = read_doc_logs(tmp_path / "serial")
+
+    # components without acall process one doc at a time, their doc state is not shared
+    monkeypatch.setattr(log_service, "LogDir", tmp_path / "async")
+    docs = asyncio.run(collect_docs(build_stateful_viz(), layout_paths))
+    assert {d.pdf_name: line_texts(d) for d in docs} == expected_texts
+    assert read_doc_logs(tmp_path / "async") == expected_logs
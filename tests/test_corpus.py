@@ -0,0 +1,41 @@
+import docint
+from docint.corpus import export_corpus, read_corpus_table
+
+
+def test_export_corpus(numbered_list_path, layout_paths, tmp_path):
+    viz = docint.empty()
+    viz.add_pipe("pdf_reader")
+    viz.add_pipe("num_marker")
+    viz.add_pipe("line_finder")
+    viz.add_pipe("list_finder")
+
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    docs = [viz(p) for p in [numbered_list_path] + layout_paths]
+    for doc in docs:
+        doc.to_disk(docs_dir / f"{doc.pdf_name}.doc.json")
+
+    corpus_dir = tmp_path / "corpus"
+    num_rows = export_corpus(docs_dir, corpus_dir, chunk_rows=100)
+
+    num_words = sum(len(p.words) for d in docs for p in d.pages)
+    assert num_rows["words"] == num_words
+    assert len(list((corpus_dir / "words").glob("*.parquet"))) == -(-num_words // 100)
+
+    words = read_corpus_table(corpus_dir, "words", columns=["doc_name", "page_idx", "text"])
+    assert words.column_names == ["doc_name", "page_idx", "text"]
+    doc = docs[0]
+    doc_texts = [
+        t
+        for (d, t) in zip(words["doc_name"].to_pylist(), words["text"].to_pylist())
+        if d == doc.pdf_name
+    ]
+    assert doc_texts == [w.text for w in doc.pages[0].words]
+
+    items = read_corpus_table(corpus_dir, "list_items", filters=[("doc_name", "=", doc.pdf_name)])
+    assert items.num_rows == len(doc.pages[0].list_items)
+    assert items["text"].to_pylist()[0] == " ".join(
+        w.text for w in doc.pages[0].list_items[0].words
+    )
+
+    assert read_corpus_table(corpus_dir, "table_cells").num_rows == 0
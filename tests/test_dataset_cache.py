@@ -0,0 +1,61 @@
+import os
+
+from docint.dataset_cache import DatasetCache, get_fold_ranges, get_tokenizer_key, hash_examples
+
+
+class FakeTokenizer:
+    name_or_path = "fake-tokenizer"
+
+    def __len__(self):
+        return 100
+
+
+class FakeProcessor:
+    tokenizer = FakeTokenizer()
+
+
+def test_fold_ranges():
+    folds = list(get_fold_ranges(10, 3))
+    assert [test for (_, test) in folds] == [range(0, 3), range(3, 6), range(6, 10)]
+    assert folds[1][0] == [range(0, 3), range(6, 10)]
+
+    for train_ranges, test_range in folds:
+        idxs = sorted([i for r in train_ranges for i in r] + list(test_range))
+        assert idxs == list(range(10))
+
+    assert list(get_fold_ranges(5, 1)) == [([range(0, 5)], range(0))]
+
+
+def test_cache_keys(tmp_path):
+    examples = {"tokens": [["a", "b"], ["c"]], "ner_tags": [["O", "B-OFF"], ["O"]]}
+    assert hash_examples(examples) == hash_examples(dict(reversed(examples.items())))
+    assert hash_examples(examples) != hash_examples({**examples, "tokens": [["a", "b"], ["d"]]})
+
+    tokenizer_key = get_tokenizer_key(FakeTokenizer())
+    assert tokenizer_key != get_tokenizer_key(FakeProcessor())
+
+    cache = DatasetCache(tmp_path)
+    path = cache.get_path("ner", tokenizer_key, hash_examples(examples))
+    assert path == cache.get_path("ner", tokenizer_key, hash_examples(examples))
+    assert path != cache.get_path("ner", "other:tokenizer:100", hash_examples(examples))
+
+    # preprocessing settings are part of the key
+    preprocess_key = {"version": 1, "label_all_tokens": True}
+    preprocess_path = cache.get_path("ner", tokenizer_key, hash_examples(examples), preprocess_key)
+    assert preprocess_path != path
+    other_key = {**preprocess_key, "label_all_tokens": False}
+    assert preprocess_path != cache.get_path(
+        "ner", tokenizer_key, hash_examples(examples), other_key
+    )
+
+
+def test_prune(tmp_path):
+    cache = DatasetCache(tmp_path, max_per_name=2)
+    for idx, key in enumerate(["k1", "k2", "k3"]):
+        dataset_path = tmp_path / f"ner.{key}"
+        dataset_path.mkdir()
+        os.utime(dataset_path, (idx, idx))
+    (tmp_path / "layoutlmv2.k1").mkdir()
+
+    cache.prune("ner")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["layoutlmv2.k1", "ner.k2", "ner.k3"]
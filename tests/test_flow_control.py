@@ -0,0 +1,48 @@
+import docint
+from docint.vision import Vision
+
+
+@Vision.factory("flow_test_batcher")
+class FlowTestBatcher:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def pipe(self, docs):
+        docs = list(docs)
+        self.batch_sizes.append(len(docs))
+        yield from docs
+
+
+def build_viz(config):
+    viz = docint.empty(config={"read_cache": False, **config})
+    viz.add_pipe("pdf_reader")
+    viz.add_pipe("flow_test_batcher")
+    return viz
+
+
+def test_unbounded(layout_paths):
+    viz = build_viz({})
+    docs = list(viz.pipe_all(layout_paths))
+    assert len(docs) == len(layout_paths)
+    assert viz.get_pipe("flow_test_batcher").batch_sizes == [len(layout_paths)]
+    assert viz.flow_control.metrics["flow_test_batcher"].max_depth == len(layout_paths)
+
+
+def test_max_in_flight(layout_paths):
+    viz = build_viz({"max_in_flight": {"flow_test_batcher": 2}})
+    docs = list(viz.pipe_all(layout_paths))
+    assert len(docs) == len(layout_paths)
+    assert viz.get_pipe("flow_test_batcher").batch_sizes == [2, 2, 1]
+
+    batcher_metrics = viz.flow_control.metrics["flow_test_batcher"]
+    assert batcher_metrics.max_depth == 2
+    assert batcher_metrics.num_out == len(layout_paths)
+    assert viz.flow_control.metrics["pdf_reader"].max_depth == 1
+
+
+def test_memory_watermark(layout_paths):
+    # the process is always above a 1MB watermark, every batch is flushed early
+    viz = build_viz({"memory_watermark_mb": 1})
+    list(viz.pipe_all(layout_paths))
+    assert viz.get_pipe("flow_test_batcher").batch_sizes == [1] * len(layout_paths)
+    assert viz.flow_control.metrics["flow_test_batcher"].num_early_flushes == len(layout_paths)
@@ -0,0 +1,49 @@
+from docint.hierarchy import Hierarchy, MatchOptions
+
+HIERARCHY_YML = """
+name: __root__
+ministries:
+  - name: Ministry of Finance
+    alias: [Finance Ministry]
+    departments:
+      - name: Department of Revenue
+      - name: Department of Expenditure
+  - name: Ministry of Home Affairs
+    alias: [Home Ministry]
+"""
+
+
+def build_hierarchy(tmp_path):
+    hier_path = tmp_path / "hierarchy.yml"
+    hier_path.write_text(HIERARCHY_YML)
+    return Hierarchy(hier_path)
+
+
+def test_find_match_cache(tmp_path):
+    hierarchy = build_hierarchy(tmp_path)
+    match_options = MatchOptions()
+
+    text = "Department of Revenue, Ministry of Finance"
+    first_sgs = hierarchy.find_match(text, match_options)
+    second_sgs = hierarchy.find_match(text, match_options)
+
+    assert [str(sg) for sg in first_sgs] == [str(sg) for sg in second_sgs]
+    assert hierarchy.cache_info().hits == 1 and hierarchy.cache_info().misses == 1
+
+    hierarchy.find_match(text, MatchOptions(select_strategy="sum_span_len"))
+    assert hierarchy.cache_info().misses == 2 and hierarchy.cache_info().currsize == 2
+
+
+def test_find_match_cache_invalidate(tmp_path):
+    hierarchy = build_hierarchy(tmp_path)
+    match_options = MatchOptions()
+
+    text = "Dept. of Revenue"
+    assert not hierarchy.find_match(text, match_options)
+
+    hierarchy.expand_names("department", "dept.")
+    assert hierarchy.cache_info().currsize == 0
+    assert len(hierarchy.find_match(text, match_options)) == 1
+
+    hierarchy.clear_names_cache()
+    assert hierarchy.cache_info().currsize == 0
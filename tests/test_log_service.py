@@ -0,0 +1,68 @@
+import logging
+import threading
+
+from docint import log_service
+from docint.log_service import add_doc_log, flush_logs, get_logger, lazy_str, remove_doc_log
+
+
+def test_doc_log(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(log_service, "LogDir", tmp_path)
+    lgr = get_logger("docint.pipeline.test_component")
+    assert not lgr.isEnabledFor(logging.DEBUG)
+
+    built = []
+
+    def build_str():
+        built.append(True)
+        return "spans"
+
+    lgr.debug("not built: %s", lazy_str(build_str))
+    assert not built
+
+    log_path = add_doc_log(lgr, "doc1.test_component.log")
+    assert log_path == tmp_path / "doc1.test_component.log"
+    lgr.debug("debug: %s", lazy_str(build_str))
+    lgr.info("info message")
+    remove_doc_log(lgr)
+    lgr.info("after remove")
+    flush_logs()
+
+    assert built == [True]
+    assert log_path.read_text().splitlines() == ["debug: spans", "info message"]
+    assert not lgr.isEnabledFor(logging.DEBUG)
+
+    stdout = capsys.readouterr().out
+    assert "info message" in stdout and "after remove" in stdout
+    assert "debug: spans" not in stdout
+
+    # adding the doc log again truncates the file
+    add_doc_log(lgr, "doc1.test_component.log")
+    lgr.info("second run")
+    remove_doc_log(lgr)
+    flush_logs()
+    assert log_path.read_text().splitlines() == ["second run"]
+
+
+def test_concurrent_doc_logs(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_service, "LogDir", tmp_path)
+    lgr = get_logger("docint.pipeline.test_concurrent")
+    barrier = threading.Barrier(2)
+
+    def process_doc(doc_name):
+        add_doc_log(lgr, f"{doc_name}.test_concurrent.log")
+        barrier.wait()
+        for idx in range(3):
+            lgr.debug("%s %d", doc_name, idx)
+            barrier.wait()
+        remove_doc_log(lgr)
+
+    # both docs are in the component at once, each logs to its own file
+    threads = [threading.Thread(target=process_doc, args=(n,)) for n in ("doc1", "doc2")]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+    flush_logs()
+
+    for doc_name in ("doc1", "doc2"):
+        log_text = (tmp_path / f"{doc_name}.test_concurrent.log").read_text()
+        assert log_text.splitlines() == [f"{doc_name} {idx}" for idx in range(3)]
+    assert not lgr.isEnabledFor(logging.DEBUG)
@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+import docint
+from docint.pipe_graph import PipeGraph
+from docint.vision import Vision
+
+# both sinks wait for each other, they only finish if they run concurrently
+sinks_barrier = threading.Barrier(2, timeout=10)
+
+
+@Vision.factory("graph_test_sink1", requires=["list_items"])
+class GraphTestSink1:
+    def __call__(self, doc):
+        sinks_barrier.wait()
+        doc.sink1_done = True
+        return doc
+
+
+@Vision.factory("graph_test_sink2", requires=["list_items"])
+class GraphTestSink2:
+    def __call__(self, doc):
+        sinks_barrier.wait()
+        doc.sink2_done = True
+        return doc
+
+
+def test_graph_edges():
+    graph = PipeGraph(
+        [
+            ("reader", "words", []),
+            ("lines", "lines", "words"),
+            ("markers", "num_markers", "words"),
+            ("lists", "list_items", ["lines", "num_markers"]),
+            ("fixer", [], []),
+            ("html", [], ["words", "list_items"]),
+            ("wordfreq", [], "list_items"),
+        ]
+    )
+    assert graph.preds["markers"] == {"reader"}
+    assert graph.preds["lists"] == {"lines", "markers"}
+    assert graph.preds["fixer"] == {"reader", "lines", "markers", "lists"}
+    assert graph.preds["wordfreq"] == {"lists", "fixer"}
+
+    assert graph.get_needed("num_markers") == {"reader", "markers"}
+    needed = {"reader", "lines", "markers", "lists", "fixer", "wordfreq"}
+    assert graph.get_needed(["wordfreq"]) == needed
+    with pytest.raises(ValueError):
+        graph.get_needed(["tables"])
+
+
+def test_concurrent_sinks(numbered_list_path):
+    viz = docint.empty()
+    viz.add_pipe("pdf_reader")
+    viz.add_pipe("num_marker")
+    viz.add_pipe("line_finder")
+    viz.add_pipe("list_finder")
+    viz.add_pipe("graph_test_sink1")
+    viz.add_pipe("graph_test_sink2")
+    viz.scheduler = "dag"
+
+    doc = viz(numbered_list_path)
+    assert doc.sink1_done and doc.sink2_done
+    assert len(doc.pages[0].list_items) > 0
+
+
+def test_targets(numbered_list_path):
+    viz = docint.empty()
+    viz.add_pipe("pdf_reader")
+    viz.add_pipe("num_marker")
+    viz.add_pipe("line_finder")
+    viz.add_pipe("graph_test_sink1")
+
+    doc = viz(numbered_list_path, targets=["num_marker"])
+    assert doc.pipe_names == ["pdf_reader", "num_marker"]
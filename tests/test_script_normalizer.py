@@ -37,3 +37,18 @@ def test_ascii_normalizer_errors(unicode_path):
     print(doc[0].text)
 
     # doc[0].text == 'A quick brown fox jumped over the lazy fox'
+
+
+def test_ascii_normalizer_char_mapping(unicode_path):
+    ppln = docint.empty()
+    pipe_config = {
+        "script": "ascii",
+        "script_mapping": {"Á": "A", "è": "e", "ó": "o"},
+    }
+
+    ppln.add_pipe("pdf_reader")
+    ppln.add_pipe("script_normalizer", pipe_config=pipe_config)
+    doc = ppln(unicode_path)
+
+    assert doc[0].text == "A quick brown fox jumped over the lazy fox."
+    assert [w.orig_text for w in doc[0].words if w.orig_text != w.text] == ["Á", "jumpèd", "fóx."]
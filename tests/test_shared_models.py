@@ -0,0 +1,80 @@
+import docint
+from docint.para import TextConfig
+from docint.pipeline.para_fixer import ParaFixer
+from docint.util import clear_shared_models, get_shared_model
+
+
+def test_shared_models(tmp_path):
+    model_path = tmp_path / "huggingface" / "fake-ner"
+    model_path.mkdir(parents=True)
+
+    loads = []
+
+    def load_fake(path, **kwargs):
+        loads.append((path, kwargs))
+        return object()
+
+    clear_shared_models()
+    model = get_shared_model("huggingface:fake-ner", tmp_path, load_fake)
+    assert get_shared_model("huggingface:fake-ner", tmp_path, load_fake) is model
+    assert loads == [(model_path, {})]
+
+    # each set of load arguments is a different model
+    quantized = get_shared_model("huggingface:fake-ner", tmp_path, load_fake, runtime="quantized")
+    assert quantized is not model
+    assert (
+        get_shared_model("huggingface:fake-ner", tmp_path, load_fake, runtime="quantized")
+        is quantized
+    )
+    assert len(loads) == 2
+
+    clear_shared_models()
+    assert get_shared_model("huggingface:fake-ner", tmp_path, load_fake) is not model
+    assert len(loads) == 3
+    clear_shared_models()
+
+
+class FakeNER:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, batch_size=None):
+        self.calls.append((len(texts), batch_size))
+        return [[{"entity": "B-PER", "word": t}] for t in texts]
+
+
+def test_find_names(numbered_list_path, tmp_path):
+    viz = docint.empty()
+    viz.add_pipe("pdf_reader")
+    viz.add_pipe("num_marker")
+    viz.add_pipe("line_finder")
+    viz.add_pipe("list_finder")
+    doc = viz(numbered_list_path)
+    list_items = [i for page in doc.pages for i in page.list_items]
+    assert len(list_items) > 1
+
+    dict_file, unicode_file = tmp_path / "pwl_words.txt", tmp_path / "unicode.txt"
+    dict_file.write_text("minister\n")
+    unicode_file.write_text("")
+    fixer = ParaFixer(
+        item_name="list_items",
+        conf_dir=str(tmp_path),
+        conf_stub="wordfix",
+        pre_edit=False,
+        dict_file=str(dict_file),
+        lv_dist_cutoff=1,
+        ignore_paren_len=7,
+        unicode_file=str(unicode_file),
+        model_dir="/import/models",
+        ner_model_name="huggingface:fake-ner",
+        ner_batch_size=2,
+        officer_at_start=True,
+    )
+    fixer._nlp = FakeNER()
+
+    # all the list items go to NER in one call, results are in item order
+    ner_results = fixer.find_names(list_items)
+    ignore_config = TextConfig(rm_labels=["ignore"], rm_nl=True)
+    assert [r[0]["word"] for r in ner_results] == [i.line_text(ignore_config) for i in list_items]
+    assert fixer._nlp.calls == [(len(list_items), 2)]
+    assert fixer.find_names([]) == []
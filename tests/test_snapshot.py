@@ -0,0 +1,62 @@
+import docint
+from docint.snapshot import SnapshotStore
+
+
+def build_viz(tmp_path, budget_mb=1024):
+    viz = docint.empty()
+    viz.add_pipe("pdf_reader")
+    viz.add_pipe("num_marker", pipe_config={"conf_dir": str(tmp_path)})
+    viz.add_pipe("line_finder", pipe_config={"doc_confdir": tmp_path})
+    viz.snapshot_store = SnapshotStore(tmp_path / "snapshots", int(budget_mb * 1024 * 1024))
+    return viz
+
+
+def count_calls(viz, monkeypatch):
+    names = []
+    exec_task = viz.exec_task
+
+    def counting_exec_task(name, doc, proc, kwargs={}):
+        names.append(name)
+        return exec_task(name, doc, proc, kwargs)
+
+    monkeypatch.setattr(viz, "exec_task", counting_exec_task)
+    return names
+
+
+def test_resume(numbered_list_path, tmp_path, monkeypatch):
+    viz = build_viz(tmp_path)
+    names = count_calls(viz, monkeypatch)
+
+    doc = viz(numbered_list_path)
+    assert names == ["pdf_reader", "num_marker", "line_finder"]
+
+    names.clear()
+    resumed_doc = viz(numbered_list_path)
+    assert names == []
+    assert resumed_doc.to_json() == doc.to_json()
+
+    # changing the per-doc config of line_finder only reruns line_finder
+    config_path = tmp_path / f"{numbered_list_path.name}.linefinder.yml"
+    config_path.write_text("edits: []\n")
+    names.clear()
+    viz(numbered_list_path)
+    assert names == ["line_finder"]
+
+    # num_marker reads its per-doc config from conf_dir
+    config_path = tmp_path / f"{numbered_list_path.name}.nummarker.yml"
+    config_path.write_text("edits: []\n")
+    names.clear()
+    viz(numbered_list_path)
+    assert names == ["num_marker", "line_finder"]
+
+
+def test_collect_garbage(numbered_list_path, tmp_path):
+    viz = build_viz(tmp_path, budget_mb=0)
+    viz(numbered_list_path)
+
+    # snapshots of the doc being processed are kept
+    snapshot_paths = list((tmp_path / "snapshots").glob("*/*.json.gz"))
+    assert len(snapshot_paths) == 3
+
+    assert viz.snapshot_store.collect_garbage() == 3
+    assert not list((tmp_path / "snapshots").glob("*/*.json.gz"))
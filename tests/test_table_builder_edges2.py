@@ -0,0 +1,52 @@
+import docint
+from docint.pdfwrapper import pypdfium2_wrapper2
+from docint.pipeline.table_builder_edges2 import ImageRects, TableBuilderOnEdges2
+from docint.shape import Edge
+from docint.table import TableEdges
+
+
+def build_table_edges(pdf_path, slope=0.0):
+    # table edges from the ruling lines in the pdf
+    pdf_page = pypdfium2_wrapper2.open(pdf_path).pages[0]
+    width, height = pdf_page.width, pdf_page.height
+
+    lines = pdf_page.lines
+    h_ys = sorted({round(ln.bounding_box[1] / height, 3) for ln in lines if ln.is_horizontal()})
+    v_xs = sorted({round(ln.bounding_box[0] / width, 3) for ln in lines if ln.is_vertical()})
+
+    row_edges = [Edge.build_h(0.0, y, 1.0, y + slope) for y in h_ys]
+    col_edges = [Edge.build_v(x, 0.0, x - slope, 1.0) for x in v_xs]
+    return TableEdges(row_edges=row_edges, col_edges=col_edges)
+
+
+def build_tables(pdf_path, slope=0.0):
+    viz = docint.empty()
+    viz.add_pipe("pdf_reader")
+    page = viz(pdf_path)[0]
+
+    tables = {}
+    for cell_assignment in ("rects", "polygons"):
+        builder = TableBuilderOnEdges2(
+            "conf", "tablebuilder", False, 0, False, False, cell_assignment
+        )
+        table = builder.build_table(page, build_table_edges(pdf_path, slope), 0)
+        rows = table.header_rows + table.body_rows
+        tables[cell_assignment] = [[[w.word_idx for w in c.words] for c in r.cells] for r in rows]
+    return page, tables
+
+
+def test_image_rects(table_path):
+    page, tables = build_tables(table_path)
+    table_edges = build_table_edges(table_path)
+    assert ImageRects.build(page, page.words, table_edges.row_edges, table_edges.col_edges)
+
+    assert len(tables["rects"]) == 10
+    assert tables["rects"] == tables["polygons"]
+
+
+def test_image_rects_skewed(table_path):
+    page, tables = build_tables(table_path, slope=0.01)
+    table_edges = build_table_edges(table_path, slope=0.01)
+    assert ImageRects.build(page, page.words, table_edges.row_edges, table_edges.col_edges) is None
+
+    assert tables["rects"] == tables["polygons"]
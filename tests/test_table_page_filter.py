@@ -0,0 +1,42 @@
+import json
+
+import docint
+
+
+def build_viz(output_dir, **pipe_config):
+    viz = docint.empty()
+    viz.add_pipe("pdf_reader")
+    viz.add_pipe("table_page_filter", pipe_config={"output_dir": output_dir, **pipe_config})
+    return viz
+
+
+def test_table_pages(table_path, table_nolines_path, tmp_path):
+    viz = build_viz(tmp_path)
+    assert viz(table_path)[0].table_candidate
+    assert viz(table_nolines_path)[0].table_candidate
+
+
+def test_text_pages(layout_paths, numbered_list_path, tmp_path):
+    viz = build_viz(tmp_path)
+    for doc_path in layout_paths + [numbered_list_path]:
+        assert not viz(doc_path)[0].table_candidate
+
+
+def test_no_text_page(table_rota_path, tmp_path):
+    viz = build_viz(tmp_path)
+    # scanned pages without words are always candidates
+    assert viz(table_rota_path)[0].table_candidate
+
+
+def test_config_change(table_path, tmp_path):
+    json_path = tmp_path / f"{table_path.name}.tablepagefilter.json"
+
+    build_viz(tmp_path, use_ruling_lines=False)(table_path)
+    page_info = json.loads(json_path.read_text())["page_infos"][0]
+    assert "num_hlines" not in page_info
+
+    # page_infos saved with a different config are not reused
+    assert build_viz(tmp_path, use_ruling_lines=True)(table_path)[0].table_candidate
+    json_dict = json.loads(json_path.read_text())
+    assert json_dict["feature_config"]["use_ruling_lines"]
+    assert json_dict["page_infos"][0]["num_hlines"] > 0
@@ -0,0 +1,33 @@
+import json
+
+from docint.translation_memory import TranslationMemory
+
+
+def test_translation_memory(tmp_path):
+    db_path = tmp_path / "translations.db"
+    memory = TranslationMemory(db_path, "mar_Deva", "eng_Latn")
+
+    memory.add_many([("नमस्कार", "Hello"), ("धन्यवाद", "Thank you")])
+    assert len(memory) == 2 and "नमस्कार" in memory
+    assert memory.get_unseen(["नमस्कार", "शुभ सकाळ", "शुभ सकाळ"]) == ["शुभ सकाळ"]
+
+    # append only, existing translations are not overwritten
+    memory.add_many([("नमस्कार", "Hi")])
+    assert memory.get("नमस्कार") == "Hello"
+
+    # language pairs are kept separate and translations persist
+    memory.close()
+    hindi_memory = TranslationMemory(db_path, "hin_Deva", "eng_Latn")
+    assert len(hindi_memory) == 0
+
+    reader = TranslationMemory(db_path, "mar_Deva", "eng_Latn")
+    assert reader.get_many(["धन्यवाद", "नमस्कार"]) == {"धन्यवाद": "Thank you", "नमस्कार": "Hello"}
+
+
+def test_translation_memory_import(tmp_path):
+    json_path = tmp_path / "translations.json"
+    json_path.write_text(json.dumps([{"mr": "धन्यवाद", "en": "Thank you"}], ensure_ascii=False))
+
+    memory = TranslationMemory(tmp_path / "translations.db", "mar_Deva", "eng_Latn")
+    assert memory.import_json(json_path) == 1
+    assert memory.get("धन्यवाद") == "Thank you"
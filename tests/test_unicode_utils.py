@@ -0,0 +1,29 @@
+from docint.unicode_utils import _blocks, get_script, script_histogram, scripts
+
+
+def linear_get_script(ch):
+    cp = ord(ch)
+    for start, end, name in _blocks:
+        if start <= cp <= end:
+            return name
+
+
+def test_get_script():
+    assert get_script("a") == "Basic Latin"
+    assert get_script("क") == "Devanagari"
+    assert get_script(chr(0x0B80)) == "Tamil"
+    assert get_script(chr(0xE0080)) is None
+
+    # block boundaries and gaps between blocks
+    for start, end, _ in _blocks:
+        for cp in (start - 1, start, end, end + 1):
+            if 0 <= cp < 0x110000:
+                assert get_script(chr(cp)) == linear_get_script(chr(cp)), hex(cp)
+    assert scripts == [name for (_, _, name) in _blocks]
+
+
+def test_script_histogram():
+    assert script_histogram("") == {}
+    histogram = script_histogram("abc कखग abc ¢")
+    assert histogram == {"Basic Latin": 9, "Devanagari": 3, "Latin-1 Supplement": 1}
+    assert script_histogram(chr(0xE0080)) == {None: 1}
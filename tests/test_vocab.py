@@ -1,3 +1,5 @@
+from docint.vocab import Vocab
+
 # Vocab is built from 'The quick brown fox jumped over the LAZY Fox.'
 
 
@@ -47,3 +49,20 @@ def test_find_texts(sensitive_vocab):
 
     assert len(vocab.find_texts("the", dist_cutoff=0)) == 1
     assert len(vocab.find_texts("the", dist_cutoff=1)) == 2
+
+
+def test_find_texts_index():
+    from polyleven import levenshtein
+
+    texts = ["order", "border", "orders", "ordered", "murder", "odder", "older", "bolder"]
+    vocab = Vocab(texts, case_sensitive=True)
+
+    for text in ["order", "oder", "bordr", "xyz", ""]:
+        for dist_cutoff in (1, 2, 3):
+            expected = [(t, levenshtein(text, t)) for t in texts]
+            expected = sorted([e for e in expected if e[1] <= dist_cutoff], key=lambda e: e[1])
+            assert vocab.find_texts(text, dist_cutoff) == expected
+            assert vocab.has_text(text, dist_cutoff) == bool(expected)
+
+    vocab.add_text("orderly")
+    assert ("orderly", 2) in vocab.find_texts("order", dist_cutoff=2)
@@ -0,0 +1,50 @@
+import docint
+from docint.page import Page
+from docint.word_line import words_in_lines, words_in_lines_sweep
+
+
+def build_docs(doc_path):
+    # words get resized while finding lines, so each engine gets a fresh doc
+    viz = docint.empty()
+    viz.add_pipe("pdf_reader")
+    return viz(doc_path), viz(doc_path)
+
+
+def word_idxs(word_lines):
+    return [[w.word_idx for w in wl] for wl in word_lines]
+
+
+def test_sweep_same_lines(layout_paths, table_path, numbered_list_path):
+    for doc_path in layout_paths + [table_path, numbered_list_path]:
+        lineword_doc, sweep_doc = build_docs(doc_path)
+        for lineword_page, sweep_page in zip(lineword_doc.pages, sweep_doc.pages):
+            expected = words_in_lines(lineword_page)
+            assert word_idxs(words_in_lines_sweep(sweep_page)) == word_idxs(expected)
+
+
+def test_sweep_same_lines_rotated(table_rota_path):
+    lineword_doc, sweep_doc = build_docs(table_rota_path)
+
+    lineword_page = Page.build_rotated(lineword_doc.pages[0], 3.0)
+    sweep_page = Page.build_rotated(sweep_doc.pages[0], 3.0)
+
+    expected = words_in_lines(lineword_page, newline_height_multiple=1.6, is_page=True)
+    actual = words_in_lines_sweep(sweep_page, newline_height_multiple=1.6, is_page=True)
+    assert word_idxs(actual) == word_idxs(expected)
+
+
+def test_line_finder_engine(layout_paths, tmp_path):
+    doc_lines = {}
+    for line_engine in ("lineword", "sweep"):
+        output_dir = tmp_path / line_engine
+        output_dir.mkdir()
+
+        viz = docint.empty()
+        viz.add_pipe("pdf_reader")
+        viz.add_pipe(
+            "line_finder", pipe_config={"output_dir": output_dir, "line_engine": line_engine}
+        )
+        doc = viz(layout_paths[0])
+        doc_lines[line_engine] = [[w.word_idx for w in ln.words] for ln in doc[0].lines]
+
+    assert doc_lines["sweep"] == doc_lines["lineword"]
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+import docint
+from docint.para import TextConfig
+
+pytest.importorskip("enchant")
+
+from docint.pipeline.words_fixer import WordsFixer  # noqa: E402
+
+
+def build_fixer(tmp_path):
+    unicode_file = tmp_path / "unicode.txt"
+    unicode_file.write_text("")
+    return WordsFixer(
+        item_name="list_items",
+        conf_dir=str(tmp_path),
+        conf_stub="wordfix",
+        pre_edit=False,
+        dict_file=str(tmp_path / "pwl_words.txt"),
+        suggestions_file=str(tmp_path / "pwl_suggestions.json"),
+        lv_dist_cutoff=1,
+        ignore_paren_len=7,
+        unicode_file=str(unicode_file),
+        model_dir="/import/models",
+        ner_model_name="huggingface:dslim/bert-base-NER",
+        ner_batch_size=32,
+        officer_at_start=True,
+    )
+
+
+def test_suggestions_cache(tmp_path):
+    dict_file = tmp_path / "pwl_words.txt"
+    dict_file.write_text("minister\nsecretary\n")
+
+    fixer = build_fixer(tmp_path)
+    assert fixer.get_suggestions("ministr")[0] == "minister"
+    assert fixer.num_new_suggestions == 1
+    fixer.get_suggestions("ministr")
+    assert fixer.num_new_suggestions == 1
+
+    fixer.save_suggestions()
+    json_dict = json.loads(fixer.suggestions_file.read_text())
+    assert json_dict["dict_hash"] == fixer.dict_hash
+    assert json_dict["suggestions"]["ministr"][0] == "minister"
+
+    # suggestions are loaded by the next run with the same dictionary
+    fixer = build_fixer(tmp_path)
+    assert fixer.suggestions_cache == json_dict["suggestions"]
+
+    # and dropped when the dictionary changes
+    dict_file.write_text("minister\nsecretary\nministry\n")
+    fixer = build_fixer(tmp_path)
+    assert fixer.suggestions_cache == {}
+    assert "ministry" in fixer.get_suggestions("ministr")
+
+
+class FakeNER:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, batch_size=None):
+        self.calls.append((len(texts), batch_size))
+        return [[{"entity": "B-PER", "word": t}] for t in texts]
+
+
+def test_find_names(numbered_list_path, tmp_path):
+    viz = docint.empty()
+    viz.add_pipe("pdf_reader")
+    viz.add_pipe("num_marker")
+    viz.add_pipe("line_finder")
+    viz.add_pipe("list_finder")
+    list_items = [i for page in viz(numbered_list_path).pages for i in page.list_items]
+
+    (tmp_path / "pwl_words.txt").write_text("minister\n")
+    fixer = build_fixer(tmp_path)
+    fixer._nlp = FakeNER()
+
+    ner_results = fixer.find_names(list_items)
+    ignore_config = TextConfig(rm_labels=["ignore"], rm_nl=True)
+    assert [r[0]["word"] for r in ner_results] == [i.line_text(ignore_config) for i in list_items]
+    assert fixer._nlp.calls == [(len(list_items), fixer.ner_batch_size)]